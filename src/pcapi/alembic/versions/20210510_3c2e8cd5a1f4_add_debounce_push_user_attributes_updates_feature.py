@@ -0,0 +1,26 @@
+"""Add DEBOUNCE_PUSH_USER_ATTRIBUTES_UPDATES feature
+
+Revision ID: 3c2e8cd5a1f4
+Revises: 8824ce692699
+Create Date: 2021-05-10 10:12:43.518264
+
+"""
+from pcapi.models import feature
+
+
+# revision identifiers, used by Alembic.
+revision = "3c2e8cd5a1f4"
+down_revision = "8824ce692699"
+branch_labels = None
+depends_on = None
+
+
+FLAG = feature.FeatureToggle.DEBOUNCE_PUSH_USER_ATTRIBUTES_UPDATES
+
+
+def upgrade():
+    feature.add_feature_to_database(FLAG)
+
+
+def downgrade():
+    feature.remove_feature_from_database(FLAG)
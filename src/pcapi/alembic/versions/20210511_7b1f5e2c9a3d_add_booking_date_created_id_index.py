@@ -0,0 +1,32 @@
+"""add_booking_date_created_id_index
+
+Revision ID: 7b1f5e2c9a3d
+Revises: 3c2e8cd5a1f4
+Create Date: 2021-05-11 09:42:17.204583
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "7b1f5e2c9a3d"
+down_revision = "3c2e8cd5a1f4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The booking table is large: build the index without locking it.
+    op.execute("COMMIT")
+    op.create_index(
+        "ix_booking_dateCreated_id",
+        "booking",
+        ["dateCreated", "id"],
+        unique=False,
+        postgresql_concurrently=True,
+    )
+
+
+def downgrade():
+    op.execute("COMMIT")
+    op.drop_index("ix_booking_dateCreated_id", table_name="booking", postgresql_concurrently=True)
@@ -11,9 +11,8 @@ from pcapi.algolia.infrastructure.api import delete_objects
 from pcapi.algolia.infrastructure.builder import build_object
 from pcapi.connectors.redis import add_offer_ids_in_error
 from pcapi.connectors.redis import add_to_indexed_offers
-from pcapi.connectors.redis import check_offer_exists
 from pcapi.connectors.redis import delete_indexed_offers
-from pcapi.connectors.redis import get_offer_details
+from pcapi.connectors.redis import get_offers_details
 from pcapi.models import Offer
 from pcapi.repository import offer_queries
 
@@ -26,13 +25,14 @@ def process_eligible_offers(client: Redis, offer_ids: list[int], from_provider_u
     offers_to_delete = []
     pipeline = client.pipeline()
 
-    offers = offer_queries.get_offers_by_ids(offer_ids)
+    offers = offer_queries.get_offers_for_indexing(offer_ids)
+    indexed_offers_details = get_offers_details(client=client, offer_ids=[offer.id for offer in offers])
     for offer in offers:
-        offer_exists = check_offer_exists(client=client, offer_id=offer.id)
+        offer_details = indexed_offers_details.get(offer.id)
+        offer_exists = offer_details is not None
 
         if offer and offer.isBookable:
             if from_provider_update and offer_exists:
-                offer_details = get_offer_details(client=client, offer_id=offer.id)
                 if offer_details and is_eligible_for_reindexing(offer, offer_details):
                     offers_to_add.append(build_object(offer=offer))
                     add_to_indexed_offers(
@@ -58,12 +58,8 @@ def process_eligible_offers(client: Redis, offer_ids: list[int], from_provider_u
 
 
 def delete_expired_offers(client: Redis, offer_ids: list[int]) -> None:
-    offer_ids_to_delete = []
-    for offer_id in offer_ids:
-        offer_exists = check_offer_exists(client=client, offer_id=offer_id)
-
-        if offer_exists:
-            offer_ids_to_delete.append(offer_id)
+    indexed_offers_details = get_offers_details(client=client, offer_ids=offer_ids)
+    offer_ids_to_delete = [offer_id for offer_id in offer_ids if offer_id in indexed_offers_details]
 
     if len(offer_ids_to_delete) > 0:
         _process_deleting(client=client, offer_ids_to_delete=offer_ids_to_delete)
@@ -1,6 +1,8 @@
 import ftplib
-from io import BytesIO
 import logging
+from tempfile import TemporaryFile
+import threading
+from typing import IO
 from typing import Pattern
 from zipfile import ZipFile
 
@@ -10,6 +12,11 @@ from pcapi.domain.titelive import put_today_file_at_end_of_list
 
 logger = logging.getLogger(__name__)
 
+# A sync downloads many files: keep the logged-in connection instead of
+# logging in again for each of them. ftplib connections cannot be shared
+# between threads, hence one connection per thread.
+_connections = threading.local()
+
 
 def get_titelive_ftp():
     if settings.TITELIVE_FTP_URI is None:
@@ -25,18 +32,46 @@ def connect_to_titelive_ftp():
     return ftp_titelive
 
 
-def get_zip_file_from_ftp(zip_file_name: str, folder_name: str) -> ZipFile:
-    data_file = BytesIO()
-    data_file.name = zip_file_name
-    file_path = "RETR " + folder_name + "/" + zip_file_name
+def get_titelive_ftp_connection() -> ftplib.FTP:
+    ftp_titelive = getattr(_connections, "ftp_titelive", None)
+    if ftp_titelive is not None:
+        try:
+            ftp_titelive.voidcmd("NOOP")
+            return ftp_titelive
+        except ftplib.all_errors:
+            logger.info("Titelive FTP connection has been lost, reconnecting")
+            ftp_titelive.close()
+    _connections.ftp_titelive = connect_to_titelive_ftp()
+    return _connections.ftp_titelive
+
+
+def download_file_from_ftp(file_name: str, folder_name: str) -> IO[bytes]:
+    """Download a file into a temporary file on disk rather than in
+    memory. The returned file is positioned at its beginning.
+    """
+    data_file = TemporaryFile()
+    file_path = "RETR " + folder_name + "/" + file_name
     logger.info("Downloading file %s", file_path)
-    connect_to_titelive_ftp().retrbinary(file_path, data_file.write)
+    try:
+        get_titelive_ftp_connection().retrbinary(file_path, data_file.write)
+    except Exception:
+        data_file.close()
+        raise
+    data_file.seek(0)
+    return data_file
+
+
+def get_zip_file_from_ftp(zip_file_name: str, folder_name: str) -> ZipFile:
+    data_file = download_file_from_ftp(zip_file_name, folder_name)
     # FIXME: this should be a with statement. Requires titelive sync to be rewritten
-    return ZipFile(data_file, "r")  # pylint: disable=consider-using-with
+    zip_file = ZipFile(data_file, "r")  # pylint: disable=consider-using-with
+    # `get_date_from_filename()` reads the date from the name of the zip file.
+    zip_file.filename = zip_file_name
+    return zip_file
 
 
 def get_files_to_process_from_titelive_ftp(titelive_folder_name: str, date_regexp: Pattern[str]) -> list[str]:
-    ftp_titelive = connect_to_titelive_ftp()
+    ftp_titelive = get_titelive_ftp_connection()
     files_list = ftp_titelive.nlst(titelive_folder_name)
 
     files_list_matching_regex = [file_name for file_name in files_list if date_regexp.search(str(file_name))]
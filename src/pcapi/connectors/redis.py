@@ -1,10 +1,16 @@
+from datetime import datetime
 from enum import Enum
 import json
 import logging
+import time
+from typing import Callable
+from typing import Iterable
+from typing import Optional
 
 import redis
 from redis import Redis
 from redis.client import Pipeline
+from redis.client import PubSubWorkerThread
 
 from pcapi import settings
 
@@ -13,17 +19,48 @@ logger = logging.getLogger(__name__)
 
 
 class RedisBucket(Enum):
-    REDIS_LIST_OFFER_IDS_NAME = "offer_ids"
+    REDIS_SORTED_SET_OFFER_IDS_NAME = "offer_ids_to_index"
+    REDIS_LIST_LEGACY_OFFER_IDS_NAME = "offer_ids"
+    REDIS_OFFER_IDS_DUPLICATES_COUNTER_NAME = "offer_ids_to_index_duplicates"
     REDIS_LIST_OFFER_IDS_IN_ERROR_NAME = "offer_ids_in_error"
     REDIS_LIST_VENUE_IDS_NAME = "venue_ids"
     REDIS_LIST_VENUE_PROVIDERS_NAME = "venue_providers"
     REDIS_HASHMAP_INDEXED_OFFERS_NAME = "indexed_offers"
     REDIS_HASHMAP_VENUE_PROVIDERS_IN_SYNC_NAME = "venue_providers_in_sync"
+    REDIS_CHANNEL_FEATURES_INVALIDATION_NAME = "features_invalidation"
+    REDIS_STOCK_CONSISTENCY_LAST_CHECK_NAME = "stock_consistency_last_check"
+    REDIS_SORTED_SET_PUSH_USER_IDS_NAME = "push_user_ids_to_update"
 
 
 def add_offer_id(client: Redis, offer_id: int) -> None:
+    # Offers to reindex are stored in a sorted set, scored by the time
+    # they were first enqueued. An offer that is already waiting in
+    # the queue is not added again (and keeps its position), which
+    # avoids reindexing popular offers many times in a row.
     try:
-        client.rpush(RedisBucket.REDIS_LIST_OFFER_IDS_NAME.value, offer_id)
+        added = client.zadd(RedisBucket.REDIS_SORTED_SET_OFFER_IDS_NAME.value, {offer_id: time.time()}, nx=True)
+        if not added:
+            client.incr(RedisBucket.REDIS_OFFER_IDS_DUPLICATES_COUNTER_NAME.value)
+    except redis.exceptions.RedisError as error:
+        logger.exception("[REDIS] %s", error)
+
+
+def add_offer_ids(client: Redis, offer_ids: Iterable[int]) -> None:
+    # Same as `add_offer_id`, for many offers at once with a single
+    # variadic `ZADD`.
+    offer_ids = set(offer_ids)
+    if not offer_ids:
+        return
+    enqueued_at = time.time()
+    try:
+        added = client.zadd(
+            RedisBucket.REDIS_SORTED_SET_OFFER_IDS_NAME.value,
+            {offer_id: enqueued_at for offer_id in offer_ids},
+            nx=True,
+        )
+        duplicates = len(offer_ids) - added
+        if duplicates:
+            client.incrby(RedisBucket.REDIS_OFFER_IDS_DUPLICATES_COUNTER_NAME.value, duplicates)
     except redis.exceptions.RedisError as error:
         logger.exception("[REDIS] %s", error)
 
@@ -53,44 +90,63 @@ def _add_venue_provider(client: Redis, venue_provider) -> None:
         logger.exception("[REDIS] %s", error)
 
 
-def get_offer_ids(client: Redis) -> list[int]:
+def pop_offer_ids(client: Redis) -> list[int]:
+    # `ZPOPMIN` is atomic, so concurrent cron jobs (or workers) never
+    # pop the same offers. Offers are popped in the order they were
+    # first enqueued.
+    #
+    # If the pop fails, the function returns an empty list. It's fine,
+    # the next run may have more chance and may work.
     try:
-        offer_ids = client.lrange(RedisBucket.REDIS_LIST_OFFER_IDS_NAME.value, 0, settings.REDIS_OFFER_IDS_CHUNK_SIZE)
-        return offer_ids
+        popped = client.zpopmin(RedisBucket.REDIS_SORTED_SET_OFFER_IDS_NAME.value, settings.REDIS_OFFER_IDS_CHUNK_SIZE)
     except redis.exceptions.RedisError as error:
-        logger.exception("[REDIS] %s", error)
+        logger.exception("Got Redis error in pop_offer_ids: %s", error)
         return []
+    return [offer_id for offer_id, _enqueued_at in popped]
 
 
-def pop_offer_ids(client: Redis) -> list[int]:
-    # FIXME (dbaty, 2021-04-30): Here we should use `LPOP` but its
-    # `count` argument has been added in Redis 6.2. GCP currently has
-    # an earlier version of Redis (5.0), where we can pop only one
-    # item at once. As a work around, we get and delete items within a
-    # pipeline, which should be atomic.
-    #
-    # The error handling is minimal:
-    # - if the get fails, the function returns an empty list. It's
-    #   fine, the next run may have more chance and may work;
-    # - if the delete fails, we'll process the same batch twice. It's
-    #   not optimal, but it's ok.
-    #
-    # Fun fact: if we stored offer ids in a set (and not a list), we
-    # could use `SPOP` (where the `count` argument has been added in
-    # Redis 3.2).
-    offer_ids = []
+# FIXME: remove once the legacy list is empty in all environments.
+def move_legacy_offer_ids(client: Redis) -> int:
+    """Move offer ids that are still queued in the legacy list (from
+    before offer ids were stored in a sorted set) into the sorted set,
+    and return how many have been moved.
+    """
+    moved = 0
+    try:
+        while True:
+            pipeline = client.pipeline(transaction=True)
+            pipeline.lrange(
+                RedisBucket.REDIS_LIST_LEGACY_OFFER_IDS_NAME.value, 0, settings.REDIS_OFFER_IDS_CHUNK_SIZE - 1
+            )
+            pipeline.ltrim(RedisBucket.REDIS_LIST_LEGACY_OFFER_IDS_NAME.value, settings.REDIS_OFFER_IDS_CHUNK_SIZE, -1)
+            offer_ids, _ = pipeline.execute()
+            if not offer_ids:
+                break
+            add_offer_ids(client, offer_ids)
+            moved += len(offer_ids)
+    except redis.exceptions.RedisError as error:
+        logger.exception("[REDIS] %s", error)
+    return moved
+
 
+def count_offer_ids(client: Redis) -> int:
     try:
-        pipeline = client.pipeline(transaction=True)
-        pipeline.lrange(RedisBucket.REDIS_LIST_OFFER_IDS_NAME.value, 0, settings.REDIS_OFFER_IDS_CHUNK_SIZE - 1)
-        pipeline.ltrim(RedisBucket.REDIS_LIST_OFFER_IDS_NAME.value, settings.REDIS_OFFER_IDS_CHUNK_SIZE, -1)
-        results = pipeline.execute()
-        offer_ids = results[0]
+        return client.zcard(RedisBucket.REDIS_SORTED_SET_OFFER_IDS_NAME.value)
     except redis.exceptions.RedisError as error:
-        logger.exception("Got Redis error in pop_offer_ids: %s", error)
-    finally:
-        pipeline.reset()
-    return offer_ids
+        logger.exception("[REDIS] %s", error)
+        return 0
+
+
+def pop_offer_ids_duplicates_count(client: Redis) -> int:
+    """Return the number of offer ids that were not enqueued because they
+    were already in the queue, and reset this counter.
+    """
+    try:
+        count = client.getset(RedisBucket.REDIS_OFFER_IDS_DUPLICATES_COUNTER_NAME.value, 0)
+    except redis.exceptions.RedisError as error:
+        logger.exception("[REDIS] %s", error)
+        return 0
+    return int(count or 0)
 
 
 def get_venue_ids(client: Redis) -> list[int]:
@@ -113,13 +169,6 @@ def get_venue_providers(client: Redis) -> list[dict]:
         return []
 
 
-def delete_offer_ids(client: Redis) -> None:
-    try:
-        client.ltrim(RedisBucket.REDIS_LIST_OFFER_IDS_NAME.value, settings.REDIS_OFFER_IDS_CHUNK_SIZE, -1)
-    except redis.exceptions.RedisError as error:
-        logger.exception("[REDIS] %s", error)
-
-
 def delete_venue_ids(client: Redis) -> None:
     try:
         client.ltrim(RedisBucket.REDIS_LIST_VENUE_IDS_NAME.value, settings.REDIS_VENUE_IDS_CHUNK_SIZE, -1)
@@ -170,6 +219,24 @@ def get_offer_details(client: Redis, offer_id: int) -> dict:
         return dict()
 
 
+def get_offers_details(client: Redis, offer_ids: list[int]) -> dict[int, dict]:
+    # Fetch the indexed details of many offers in a single `HMGET`
+    # call. Offers that are not indexed are missing from the returned
+    # dictionary, which makes it usable as a batch `check_offer_exists`.
+    if not offer_ids:
+        return {}
+    try:
+        offers_details = client.hmget(RedisBucket.REDIS_HASHMAP_INDEXED_OFFERS_NAME.value, offer_ids)
+    except redis.exceptions.RedisError as error:
+        logger.exception("[REDIS] %s", error)
+        return {}
+    return {
+        offer_id: json.loads(offer_details)
+        for offer_id, offer_details in zip(offer_ids, offers_details)
+        if offer_details is not None
+    }
+
+
 def delete_all_indexed_offers(client: Redis) -> None:
     try:
         client.delete(RedisBucket.REDIS_HASHMAP_INDEXED_OFFERS_NAME.value)
@@ -225,3 +292,72 @@ def delete_offer_ids_in_error(client: Redis) -> None:
         )
     except redis.exceptions.RedisError as error:
         logger.exception("[REDIS] %s", error)
+
+
+def add_push_user_ids(client: Redis, user_ids: Iterable[int]) -> None:
+    # Users whose attributes must be updated on Batch are stored in a
+    # sorted set, scored by the time of their last change: updates are
+    # debounced until the user has not changed for a while.
+    user_ids = set(user_ids)
+    if not user_ids:
+        return
+    changed_at = time.time()
+    try:
+        client.zadd(
+            RedisBucket.REDIS_SORTED_SET_PUSH_USER_IDS_NAME.value, {user_id: changed_at for user_id in user_ids}
+        )
+    except redis.exceptions.RedisError as error:
+        logger.exception("[REDIS] %s", error)
+
+
+def pop_push_user_ids(client: Redis, changed_before: float, count: int) -> list[int]:
+    # Reading and removing users is not atomic: a user that changes
+    # meanwhile is removed too. It's fine, the user has changed before
+    # their attributes are computed by the caller.
+    key = RedisBucket.REDIS_SORTED_SET_PUSH_USER_IDS_NAME.value
+    try:
+        user_ids = client.zrangebyscore(key, "-inf", changed_before, start=0, num=count)
+        if user_ids:
+            client.zrem(key, *user_ids)
+    except redis.exceptions.RedisError as error:
+        logger.exception("[REDIS] %s", error)
+        return []
+    return [int(user_id) for user_id in user_ids]
+
+
+def get_stock_consistency_last_check(client: Redis) -> Optional[datetime]:
+    # If the date cannot be read, the caller should check all stocks.
+    try:
+        last_check = client.get(RedisBucket.REDIS_STOCK_CONSISTENCY_LAST_CHECK_NAME.value)
+    except redis.exceptions.RedisError as error:
+        logger.exception("[REDIS] %s", error)
+        return None
+    return datetime.fromisoformat(last_check) if last_check else None
+
+
+def set_stock_consistency_last_check(client: Redis, checked_at: datetime) -> None:
+    try:
+        client.set(RedisBucket.REDIS_STOCK_CONSISTENCY_LAST_CHECK_NAME.value, checked_at.isoformat())
+    except redis.exceptions.RedisError as error:
+        logger.exception("[REDIS] %s", error)
+
+
+def publish_features_invalidation(client: Redis) -> None:
+    try:
+        client.publish(RedisBucket.REDIS_CHANNEL_FEATURES_INVALIDATION_NAME.value, 1)
+    except redis.exceptions.RedisError as error:
+        logger.exception("[REDIS] %s", error)
+
+
+def subscribe_to_features_invalidation(callback: Callable[[], None]) -> Optional[PubSubWorkerThread]:
+    # Pub/sub needs its own connection, hence a dedicated client. The
+    # returned thread is a daemon: it does not prevent the process
+    # from exiting.
+    redis_client = redis.from_url(url=settings.REDIS_URL, decode_responses=True)
+    try:
+        pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{RedisBucket.REDIS_CHANNEL_FEATURES_INVALIDATION_NAME.value: lambda message: callback()})
+        return pubsub.run_in_thread(sleep_time=1, daemon=True)
+    except redis.exceptions.RedisError as error:
+        logger.exception("[REDIS] %s", error)
+        return None
@@ -1,3 +1,5 @@
+from typing import Iterable
+
 from pcapi.core import object_storage
 from pcapi.models.db import Model
 from pcapi.utils.image_conversion import standardize_image
@@ -12,9 +14,27 @@ def create_thumb(
 ) -> None:
     image_as_bytes = standardize_image(image_as_bytes, crop_params)
 
+    store_thumb(model_with_thumb.get_thumb_storage_id(image_index), image_as_bytes, symlink_path)
+
+
+def create_thumbs(model_with_thumb: Model, image_as_bytes: bytes, image_indexes: Iterable[int]) -> None:
+    """Store the same image as the thumbs of `model_with_thumb` at each
+    of the given indexes. The image is only converted once and thumbs
+    are uploaded concurrently.
+    """
+    image_as_bytes = standardize_image(image_as_bytes)
+
+    object_storage.store_public_objects(
+        bucket="thumbs",
+        blobs_by_object_id={model_with_thumb.get_thumb_storage_id(index): image_as_bytes for index in image_indexes},
+        content_type="image/jpeg",
+    )
+
+
+def store_thumb(thumb_storage_id: str, image_as_bytes: bytes, symlink_path: str = None) -> None:
     object_storage.store_public_object(
         bucket="thumbs",
-        object_id=model_with_thumb.get_thumb_storage_id(image_index),
+        object_id=thumb_storage_id,
         blob=image_as_bytes,
         content_type="image/jpeg",
         symlink_path=symlink_path,
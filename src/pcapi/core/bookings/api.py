@@ -26,8 +26,8 @@ from pcapi.repository import feature_queries
 from pcapi.repository import repository
 from pcapi.repository import transaction
 from pcapi.utils.mailing import MailServiceException
+from pcapi.workers.push_notification_job import schedule_user_attributes_update
 from pcapi.workers.push_notification_job import send_cancel_booking_notification
-from pcapi.workers.push_notification_job import update_user_attributes_job
 from pcapi.workers.push_notification_job import update_user_bookings_attributes_job
 from pcapi.workers.user_emails_job import send_booking_cancellation_emails_to_user_and_offerer_job
 
@@ -130,7 +130,7 @@ def book_offer(
     if feature_queries.is_active(FeatureToggle.SYNCHRONIZE_ALGOLIA):
         redis.add_offer_id(client=app.redis_client, offer_id=stock.offerId)
 
-    update_user_bookings_attributes_job.delay(beneficiary.id)
+    schedule_user_attributes_update(beneficiary.id, update_user_bookings_attributes_job)
 
     return booking
 
@@ -160,7 +160,7 @@ def _cancel_booking(booking: Booking, reason: BookingCancellationReasons) -> Non
         },
     )
 
-    update_user_attributes_job.delay(booking.user.id)
+    schedule_user_attributes_update(booking.userId)
 
     if feature_queries.is_active(FeatureToggle.SYNCHRONIZE_ALGOLIA):
         redis.add_offer_id(client=app.redis_client, offer_id=booking.stock.offerId)
@@ -182,7 +182,7 @@ def _cancel_bookings_from_stock(stock: Stock, reason: BookingCancellationReasons
         repository.save(*deleted_bookings)
 
     for booking in deleted_bookings:
-        update_user_attributes_job.delay(booking.user.id)
+        schedule_user_attributes_update(booking.userId)
 
     if feature_queries.is_active(FeatureToggle.SYNCHRONIZE_ALGOLIA):
         redis.add_offer_id(client=app.redis_client, offer_id=stock.offerId)
@@ -9,6 +9,7 @@ from sqlalchemy import DDL
 from sqlalchemy import DateTime
 from sqlalchemy import Enum
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy import Integer
 from sqlalchemy import Numeric
 from sqlalchemy import String
@@ -38,6 +39,7 @@ class Booking(PcObject, Model, VersionedMixin):
     id = Column(BigInteger, primary_key=True, autoincrement=True)
 
     dateCreated = Column(DateTime, nullable=False, default=datetime.utcnow)
+    Index("ix_booking_dateCreated_id", dateCreated, id)
 
     dateUsed = Column(DateTime, nullable=True)
 
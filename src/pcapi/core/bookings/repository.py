@@ -2,26 +2,37 @@ from datetime import date
 from datetime import datetime
 from datetime import time
 import math
+from typing import Iterator
+from typing import Optional
 
 from dateutil import tz
 from sqlalchemy import Date
 from sqlalchemy import cast
+from sqlalchemy import exists
 from sqlalchemy import func
 from sqlalchemy import or_
+from sqlalchemy import select
 from sqlalchemy import text
+from sqlalchemy import tuple_
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.orm import Query
+from sqlalchemy.orm import contains_eager
 from sqlalchemy.sql.functions import coalesce
 from sqlalchemy.util._collections import AbstractKeyedTuple
 
 from pcapi.core.bookings import conf
 from pcapi.core.bookings.models import BookingCancellationReasons
 from pcapi.core.offerers.models import Offerer
+from pcapi.core.offers.models import EVENT_AUTOMATIC_REFUND_DELAY
 from pcapi.core.users.api import sanitize_email
 from pcapi.core.users.models import User
 from pcapi.domain.booking_recap.booking_recap import BookBookingRecap
 from pcapi.domain.booking_recap.booking_recap import BookingRecap
 from pcapi.domain.booking_recap.booking_recap import EventBookingRecap
 from pcapi.domain.booking_recap.booking_recap import ThingBookingRecap
+from pcapi.domain.booking_recap.bookings_recap_paginated import BookingsRecapCursor
+from pcapi.domain.booking_recap.bookings_recap_paginated import BookingsRecapPage
 from pcapi.domain.booking_recap.bookings_recap_paginated import BookingsRecapPaginated
 from pcapi.domain.postal_code.postal_code import PostalCode
 from pcapi.models import Booking
@@ -83,6 +94,43 @@ def find_by_pro_user_id(user_id: int, page: int = 1, per_page_limit: int = 1000)
     )
 
 
+def find_by_pro_user_id_with_cursor(
+    user_id: int, cursor: Optional[BookingsRecapCursor] = None, per_page_limit: int = 1000
+) -> BookingsRecapPage:
+    """Return the bookings recap that follow `cursor`, without counting
+    all bookings nor skipping the previous ones like `find_by_pro_user_id()`
+    does. Duo bookings are listed twice but only count for one booking
+    in `per_page_limit`.
+    """
+    bookings_recap_query = _build_bookings_recap_query(user_id).add_columns(Booking.id.label("bookingId"))
+    if cursor:
+        bookings_recap_query = bookings_recap_query.filter(
+            tuple_(Booking.dateCreated, Booking.id) < tuple_(cursor.booking_date, cursor.booking_id)
+        )
+    bookings = bookings_recap_query.order_by(Booking.dateCreated.desc(), Booking.id.desc()).limit(per_page_limit).all()
+
+    bookings_recap = []
+    for booking in bookings:
+        booking_recap = _serialize_booking_recap(booking)
+        bookings_recap.extend([booking_recap] * (DUO_QUANTITY if booking.quantity == DUO_QUANTITY else 1))
+
+    next_cursor = None
+    if len(bookings) == per_page_limit:
+        next_cursor = BookingsRecapCursor(booking_date=bookings[-1].bookingDate, booking_id=bookings[-1].bookingId)
+    return BookingsRecapPage(bookings_recap=bookings_recap, next_cursor=next_cursor)
+
+
+def iterate_by_pro_user_id(user_id: int, batch_size: int = 1000) -> Iterator[BookingRecap]:
+    """Yield all bookings recap of the pro user, fetched by batches."""
+    cursor = None
+    while True:
+        bookings_recap_page = find_by_pro_user_id_with_cursor(user_id, cursor=cursor, per_page_limit=batch_size)
+        yield from bookings_recap_page.bookings_recap
+        cursor = bookings_recap_page.next_cursor
+        if cursor is None:
+            return
+
+
 def find_ongoing_bookings_by_stock(stock_id: int) -> list[Booking]:
     return Booking.query.filter_by(stockId=stock_id, isCancelled=False, isUsed=False).all()
 
@@ -91,14 +139,32 @@ def find_not_cancelled_bookings_by_stock(stock: Stock) -> list[Booking]:
     return Booking.query.filter_by(stockId=stock.id, isCancelled=False).all()
 
 
-def find_bookings_eligible_for_payment_for_venue(venue_id: int) -> list[Booking]:
+def find_venue_ids_with_bookings_eligible_for_payment() -> list[int]:
+    query = _find_bookings_eligible_for_payment().with_entities(Venue.id).distinct().order_by(Venue.id)
+    return [venue_id for venue_id, in query]
+
+
+def find_bookings_eligible_for_payment(venue_id: int) -> Query:
+    """Return the bookings of the venue that are eligible for payment,
+    each with whether it has already been paid, already paid bookings
+    first and by creation date.
+    """
+    offer_loader = contains_eager(Booking.stock).contains_eager(Stock.offer)
+    # A booking may have several payments: check their existence rather
+    # than joining them, so that each booking is returned once.
+    is_already_paid = exists().where(Payment.bookingId == Booking.id).label("isAlreadyPaid")
     return (
         _find_bookings_eligible_for_payment()
         .filter(Venue.id == venue_id)
-        .reset_joinpoint()
-        .outerjoin(Payment)
-        .order_by(Payment.id, Booking.dateCreated.asc())
-        .all()
+        .add_columns(is_already_paid)
+        .options(offer_loader.joinedload(Offer.product))
+        .options(offer_loader.contains_eager(Offer.venue).joinedload(Venue.bankInformation))
+        .options(
+            offer_loader.contains_eager(Offer.venue)
+            .joinedload(Venue.managingOfferer)
+            .joinedload(Offerer.bankInformation)
+        )
+        .order_by(is_already_paid.desc(), Booking.dateCreated.asc())
     )
 
 
@@ -110,6 +176,70 @@ def find_not_used_and_not_cancelled() -> list[Booking]:
     return Booking.query.filter(Booking.isUsed.is_(False)).filter(Booking.isCancelled.is_(False)).all()
 
 
+def mark_bookings_of_past_events_as_used(min_id: int, max_id: int) -> list[int]:
+    """Mark as used the bookings (with an id between `min_id` and
+    `max_id`) of events that cannot be deleted anymore, i.e. that began
+    more than `EVENT_AUTOMATIC_REFUND_DELAY` ago, and return their ids.
+    """
+    now = datetime.utcnow()
+    statement = (
+        update(Booking.__table__)
+        .where(Booking.id.between(min_id, max_id))
+        .where(Booking.isUsed.is_(False))
+        .where(Booking.isCancelled.is_(False))
+        .where(Booking.stockId == Stock.id)
+        .where(Stock.beginningDatetime < now - EVENT_AUTOMATIC_REFUND_DELAY)
+        .values(isUsed=True, dateUsed=now)
+        .returning(Booking.id)
+    )
+    return [booking_id for booking_id, in db.session.execute(statement)]
+
+
+def cancel_bookings_and_update_stocks(booking_ids: list[int], reason: BookingCancellationReasons) -> int:
+    """Cancel the given bookings (unless already cancelled) and return
+    the number of cancelled bookings.
+
+    The `dnBookedQuantity` of their stocks is decremented by the
+    quantity of the cancelled bookings in the same statement, which
+    avoids a full recompute (and the lock of all bookings of each
+    stock it implies).
+    """
+    # Lock stocks before their bookings, and in a consistent order, like
+    # `_cancel_bookings_from_stock()` does, so that both cannot deadlock.
+    db.session.execute(
+        select([Stock.id])
+        .where(Stock.id.in_(select([Booking.stockId]).where(Booking.id.in_(booking_ids))))
+        .order_by(Stock.id)
+        .with_for_update()
+    )
+    cancelled_bookings = (
+        update(Booking.__table__)
+        .where(Booking.id.in_(booking_ids))
+        .where(Booking.isCancelled.is_(False))
+        .values(isCancelled=True, cancellationReason=reason)
+        .returning(Booking.stockId, Booking.quantity)
+        .cte("cancelled_bookings")
+    )
+    deltas = (
+        select(
+            [
+                cancelled_bookings.c.stockId.label("stock_id"),
+                func.sum(cancelled_bookings.c.quantity).label("quantity"),
+                func.count().label("bookings"),
+            ]
+        )
+        .group_by(cancelled_bookings.c.stockId)
+        .cte("deltas")
+    )
+    statement = (
+        update(Stock.__table__)
+        .where(Stock.id == deltas.c.stock_id)
+        .values(dnBookedQuantity=Stock.dnBookedQuantity - deltas.c.quantity)
+        .returning(deltas.c.bookings)
+    )
+    return sum(bookings for bookings, in db.session.execute(statement))
+
+
 def find_used_by_token(token: str) -> Booking:
     return Booking.query.filter_by(token=token.upper(), isUsed=True).one_or_none()
 
@@ -158,6 +288,10 @@ def find_soon_to_be_expiring_booking_ordered_by_user(given_date: date = None) ->
     )
 
 
+def find_soon_to_be_expiring_booking_ids_grouped_by_user(given_date: date = None) -> list[tuple[int, list[int]]]:
+    return _group_booking_ids_by_user(find_soon_to_be_expiring_booking_ordered_by_user(given_date))
+
+
 def generate_booking_token():
     for _i in range(100):
         token = random_token()
@@ -173,6 +307,17 @@ def find_expired_bookings_ordered_by_user(expired_on: date = None) -> Query:
         .filter(cast(Booking.cancellationDate, Date) == expired_on)
         .filter(Booking.cancellationReason == BookingCancellationReasons.EXPIRED)
         .order_by(Booking.userId)
+    )
+
+
+def find_expired_booking_ids_grouped_by_user(expired_on: date = None) -> list[tuple[int, list[int]]]:
+    return _group_booking_ids_by_user(find_expired_bookings_ordered_by_user(expired_on))
+
+
+def _group_booking_ids_by_user(bookings_query: Query) -> list[tuple[int, list[int]]]:
+    return (
+        bookings_query.with_entities(Booking.userId, func.array_agg(aggregate_order_by(Booking.id, Booking.id)))
+        .group_by(Booking.userId)
         .all()
     )
 
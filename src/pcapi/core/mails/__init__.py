@@ -25,16 +25,30 @@ def send(*, recipients: Iterable[str], data: dict) -> bool:
     return result.successful
 
 
-def _save_email(result: models.MailResult):
-    """Save email to the database with its status"""
-    email = models.Email(
-        content=result.sent_data,
-        status=models.EmailStatus.SENT if result.successful else models.EmailStatus.ERROR,
-    )
+def send_many(*, messages: list[tuple[Iterable[str], dict]]) -> list[bool]:
+    """Try to send several e-mails, given as `(recipients, data)` pairs,
+    in as few calls to the e-mail service as possible, and return
+    whether each of them was successful.
+    """
+    backend = import_string(settings.EMAIL_BACKEND)
+    results = backend().send_mails(messages)
+    _save_email(*results)
+    return [result.successful for result in results]
+
+
+def _save_email(*results: models.MailResult):
+    """Save emails to the database with their status"""
+    emails = [
+        models.Email(
+            content=result.sent_data,
+            status=models.EmailStatus.SENT if result.successful else models.EmailStatus.ERROR,
+        )
+        for result in results
+    ]
     # FIXME (dbaty, 2020-02-08): avoid import loop. Again. Yes, it's on my todo list.
     from pcapi.repository import repository
 
-    repository.save(email)
+    repository.save(*emails)
 
 
 # FIXME (dbaty, 2020-02-02): returning a Response object is not very
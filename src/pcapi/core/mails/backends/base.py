@@ -10,10 +10,19 @@ from ..models import MailResult
 
 class BaseBackend:
     def send_mail(self, recipients: Iterable[str], data: dict) -> MailResult:
+        self._add_default_data(data)
+        return self._send(recipients=recipients, data=data)
+
+    def send_mails(self, messages: list[tuple[Iterable[str], dict]]) -> list[MailResult]:
+        """Send several e-mails, given as `(recipients, data)` pairs, and
+        return a result for each of them.
+        """
+        return [self.send_mail(recipients=recipients, data=data) for recipients, data in messages]
+
+    def _add_default_data(self, data: dict) -> None:
         data.setdefault("FromEmail", settings.SUPPORT_EMAIL_ADDRESS)
         if "Vars" in data:
             data["Vars"].setdefault("env", "" if settings.IS_PROD else f"-{settings.ENV}")
-        return self._send(recipients=recipients, data=data)
 
     def _send(self, recipients: Iterable, data: dict) -> MailResult:
         raise NotImplementedError()
@@ -13,6 +13,9 @@ from .base import BaseBackend
 
 logger = logging.getLogger(__name__)
 
+# Mailjet does not accept more messages in a single call to its Send API.
+MAX_MESSAGES_PER_SEND = 50
+
 
 def monkey_patch_mailjet_requests():
     # We want the `mailjet_rest` library to use our wrapper around
@@ -48,23 +51,36 @@ class MailjetBackend(BaseBackend):
             else:
                 _add_template_debugging(data)
 
+        return MailResult(
+            sent_data=data,
+            successful=self._create(data),
+        )
+
+    def send_mails(self, messages: list[tuple[Iterable[str], dict]]) -> list[MailResult]:
+        results = []
+        for start in range(0, len(messages), MAX_MESSAGES_PER_SEND):
+            messages_data = []
+            for recipients, data in messages[start : start + MAX_MESSAGES_PER_SEND]:
+                self._add_default_data(data)
+                data["To"] = ", ".join(recipients)
+                if settings.MAILJET_TEMPLATE_DEBUGGING:
+                    _add_template_debugging(data)
+                messages_data.append(data)
+            successful = self._create({"Messages": messages_data})
+            results.extend(MailResult(sent_data=data, successful=successful) for data in messages_data)
+        return results
+
+    def _create(self, data: dict) -> bool:
         try:
             response = self.mailjet_client.send.create(data=data, timeout=settings.MAILJET_HTTP_TIMEOUT)
         except Exception as exc:  # pylint: disable=broad-except
             logger.exception("Error trying to send e-mail with Mailjet: %s", exc)
-            return MailResult(
-                sent_data=data,
-                successful=False,
-            )
+            return False
 
         successful = response.status_code == 200
         if not successful:
             logger.warning("Got %d return code from Mailjet: content=%s", response.status_code, response.content)
-
-        return MailResult(
-            sent_data=data,
-            successful=successful,
-        )
+        return successful
 
     def create_contact(self, email: str) -> Response:
         data = {"Email": email}
@@ -106,17 +122,24 @@ class ToDevMailjetBackend(MailjetBackend):
         )
         data["Html-part"] = notice + data["Html-part"]
 
-    def send_mail(self, recipients: Iterable[str], data: dict) -> MailResult:
+    def _override_recipients(self, recipients: Iterable[str], data: dict) -> Iterable[str]:
         # FIXME (apibrac, 2021-03-17): we can delete this as soon as AppNative's beta test is finished
         # WHITELISTED_EMAIL_RECIPIENTS should be deleted as well
         some_recipients_are_whitelisted = set(recipients) & set(settings.WHITELISTED_EMAIL_RECIPIENTS)
         if some_recipients_are_whitelisted:
-            return super().send_mail(recipients=recipients, data=data)
+            return recipients
 
         self._inject_html_test_notice(recipients, data)
-        recipients = [settings.DEV_EMAIL_ADDRESS]
+        return [settings.DEV_EMAIL_ADDRESS]
+
+    def send_mail(self, recipients: Iterable[str], data: dict) -> MailResult:
+        recipients = self._override_recipients(recipients, data)
         return super().send_mail(recipients=recipients, data=data)
 
+    def send_mails(self, messages: list[tuple[Iterable[str], dict]]) -> list[MailResult]:
+        messages = [(self._override_recipients(recipients, data), data) for recipients, data in messages]
+        return super().send_mails(messages)
+
     def create_contact(self, email: str) -> Response:
         email = settings.DEV_EMAIL_ADDRESS
         return super().create_contact(email)
@@ -1,4 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
+import functools
+from typing import Iterable
+
 from pcapi import settings
+from pcapi.core.object_storage.backends.base import BaseBackend
 from pcapi.models.db import Model
 from pcapi.utils.human_ids import humanize
 from pcapi.utils.inflect_engine import inflect_engine
@@ -52,16 +57,34 @@ def _get_backends() -> set:
     return backends_set
 
 
+@functools.lru_cache(maxsize=None)
+def _get_backend(backend_path: str) -> BaseBackend:
+    return import_string(backend_path)()
+
+
 def store_public_object(bucket: str, object_id: str, blob: bytes, content_type: str, symlink_path=None) -> None:
     for backend_path in _get_backends():
-        backend = import_string(backend_path)
-        backend().store_public_object(bucket, object_id, blob, content_type, symlink_path)
+        _get_backend(backend_path).store_public_object(bucket, object_id, blob, content_type, symlink_path)
+
+
+def store_public_objects(bucket: str, blobs_by_object_id: dict[str, bytes], content_type: str) -> None:
+    """Store many objects concurrently. Raise the first error, once all
+    other objects have been stored (or have failed).
+    """
+    with ThreadPoolExecutor(
+        max_workers=settings.OBJECT_STORAGE_UPLOAD_THREADS, thread_name_prefix="object-storage"
+    ) as executor:
+        futures = [
+            executor.submit(store_public_object, bucket, object_id, blob, content_type)
+            for object_id, blob in blobs_by_object_id.items()
+        ]
+    for future in futures:
+        future.result()
 
 
 def delete_public_object(bucket: str, object_id: str) -> None:
     for backend_path in _get_backends():
-        backend = import_string(backend_path)
-        backend().delete_public_object(bucket, object_id)
+        _get_backend(backend_path).delete_public_object(bucket, object_id)
 
 
 def build_thumb_path(pc_object: Model, index: int) -> str:
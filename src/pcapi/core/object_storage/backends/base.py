@@ -1,3 +1,31 @@
+import os
+import threading
+from typing import Callable
+from typing import Generic
+from typing import TypeVar
+
+
+Client = TypeVar("Client")
+
+
+class ThreadLocalClient(Generic[Client]):
+    """Create a client with `factory` on first use and reuse it
+    afterwards, so that backends do not connect and authenticate for
+    each object. Storage clients are not thread-safe: each thread (and
+    each forked process) gets its own client.
+    """
+
+    def __init__(self, factory: Callable[[], Client]):
+        self._factory = factory
+        self._local = threading.local()
+
+    def get(self) -> Client:
+        if getattr(self._local, "pid", None) != os.getpid():
+            self._local.client = self._factory()
+            self._local.pid = os.getpid()
+        return self._local.client
+
+
 class BaseBackend:
     def store_public_object(
         self, bucket: str, object_id: str, blob: bytes, content_type: str, symlink_path=None
@@ -10,15 +10,23 @@ from pcapi import settings
 logger = logging.getLogger(__name__)
 
 from .base import BaseBackend
+from .base import ThreadLocalClient
+
+
+def _create_gcp_storage_client_bucket() -> Bucket:
+    # Credentials refresh their access token by themselves when it has expired.
+    credentials = Credentials.from_service_account_info(settings.GCP_BUCKET_CREDENTIALS)
+    project_id = settings.GCP_BUCKET_CREDENTIALS.get("project_id")
+    storage_client = Client(credentials=credentials, project=project_id)
+
+    return storage_client.bucket(settings.GCP_BUCKET_NAME)
 
 
 class GCPBackend(BaseBackend):
-    def get_gcp_storage_client_bucket(self) -> Bucket:
-        credentials = Credentials.from_service_account_info(settings.GCP_BUCKET_CREDENTIALS)
-        project_id = settings.GCP_BUCKET_CREDENTIALS.get("project_id")
-        storage_client = Client(credentials=credentials, project=project_id)
+    _storage_client_bucket = ThreadLocalClient(_create_gcp_storage_client_bucket)
 
-        return storage_client.bucket(settings.GCP_BUCKET_NAME)
+    def get_gcp_storage_client_bucket(self) -> Bucket:
+        return self._storage_client_bucket.get()
 
     def store_public_object(
         self, bucket: str, object_id: str, blob: bytes, content_type: str, symlink_path: str = None
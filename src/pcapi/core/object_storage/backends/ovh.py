@@ -10,18 +10,27 @@ from pcapi import settings
 logger = logging.getLogger(__name__)
 
 from .base import BaseBackend
+from .base import ThreadLocalClient
+
+
+def _create_swift_connection() -> Connection:
+    # The connection authenticates on its first request, and again by
+    # itself when its token has expired.
+    return swiftclient.Connection(
+        user=settings.SWIFT_USER,
+        key=settings.SWIFT_KEY,
+        authurl=settings.SWIFT_AUTH_URL,
+        os_options={"region_name": settings.SWIFT_REGION_NAME},
+        tenant_name=settings.SWIFT_TENANT_NAME,
+        auth_version="3",
+    )
 
 
 class OVHBackend(BaseBackend):
+    _swift_connection = ThreadLocalClient(_create_swift_connection)
+
     def swift_con(self) -> Connection:
-        return swiftclient.Connection(
-            user=settings.SWIFT_USER,
-            key=settings.SWIFT_KEY,
-            authurl=settings.SWIFT_AUTH_URL,
-            os_options={"region_name": settings.SWIFT_REGION_NAME},
-            tenant_name=settings.SWIFT_TENANT_NAME,
-            auth_version="3",
-        )
+        return self._swift_connection.get()
 
     def store_public_object(
         self, bucket: str, object_id: str, blob: bytes, content_type: str, symlink_path: str = None
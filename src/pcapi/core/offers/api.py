@@ -231,8 +231,7 @@ def update_offers_active_status(query, is_active):
         db.session.commit()
 
         if feature_queries.is_active(FeatureToggle.SYNCHRONIZE_ALGOLIA):
-            for offer_id in offer_ids_batch:
-                redis.add_offer_id(client=app.redis_client, offer_id=offer_id)
+            redis.add_offer_ids(client=app.redis_client, offer_ids=offer_ids_batch)
 
 
 def _create_stock(
@@ -593,8 +592,7 @@ def add_criteria_to_offers(criteria: list[Criterion], isbn: str) -> bool:
     db.session.commit()
 
     if feature_queries.is_active(FeatureToggle.SYNCHRONIZE_ALGOLIA):
-        for offer_id in offer_ids:
-            redis.add_offer_id(client=app.redis_client, offer_id=offer_id)
+        redis.add_offer_ids(client=app.redis_client, offer_ids=offer_ids)
 
     return True
 
@@ -626,8 +624,7 @@ def deactivate_inappropriate_products(isbn: str) -> bool:
     )
 
     if feature_queries.is_active(FeatureToggle.SYNCHRONIZE_ALGOLIA):
-        for offer_id in offer_ids:
-            redis.add_offer_id(client=app.redis_client, offer_id=offer_id)
+        redis.add_offer_ids(client=app.redis_client, offer_ids=offer_ids)
 
     return True
 
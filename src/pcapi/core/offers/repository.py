@@ -6,6 +6,7 @@ from typing import Optional
 
 from sqlalchemy import and_
 from sqlalchemy import func
+from sqlalchemy import or_
 from sqlalchemy.orm import Query
 from sqlalchemy.orm import aliased
 from sqlalchemy.orm import joinedload
@@ -259,11 +260,28 @@ def get_and_lock_stock(stock_id: int) -> Stock:
     return stock
 
 
-def check_stock_consistency() -> list[int]:
+def check_stock_consistency(modified_since: Optional[datetime] = None) -> list[int]:
+    """Return the ids of stocks whose `dnBookedQuantity` does not match
+    their bookings.
+
+    If `modified_since` is given, only check the stocks that have been
+    modified, or whose bookings have been created, cancelled or used
+    since then.
+    """
+    query = db.session.query(Stock.id)
+    if modified_since:
+        modified_bookings_stock_ids = db.session.query(Booking.stockId).filter(
+            or_(
+                Booking.dateCreated >= modified_since,
+                Booking.cancellationDate >= modified_since,
+                Booking.dateUsed >= modified_since,
+            )
+        )
+        modified_stock_ids = db.session.query(Stock.id).filter(Stock.dateModified >= modified_since)
+        query = query.filter(Stock.id.in_(modified_bookings_stock_ids.union(modified_stock_ids)))
     return [
         item[0]
-        for item in db.session.query(Stock.id)
-        .outerjoin(Stock.bookings)
+        for item in query.outerjoin(Stock.bookings)
         .group_by(Stock.id)
         .having(
             Stock.dnBookedQuantity != func.coalesce(func.sum(Booking.quantity).filter(Booking.isCancelled == False), 0)
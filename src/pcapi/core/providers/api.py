@@ -301,8 +301,7 @@ def _build_new_offer(venue: Venue, product: Product, id_at_providers: str, provi
 
 def _reindex_offers(offer_ids: Set[int]) -> None:
     if feature_queries.is_active(FeatureToggle.SYNCHRONIZE_ALGOLIA):
-        for offer_id in offer_ids:
-            redis.add_offer_id(client=app.redis_client, offer_id=offer_id)
+        redis.add_offer_ids(client=app.redis_client, offer_ids=offer_ids)
 
 
 def _should_reindex_offer(new_quantity: int, new_price: float, existing_stock: dict) -> bool:
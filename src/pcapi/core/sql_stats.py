@@ -0,0 +1,134 @@
+"""Record statistics about the SQL queries that are issued while
+handling an HTTP request, running an RQ job or a cron task: number of
+queries, time spent in the database and the statements that are
+repeated the most (which usually reveal N+1 patterns).
+
+Usage::
+
+    with record_queries() as stats:
+        do_something()
+    logger.info("Done", extra=stats.as_log_extra())
+"""
+import collections
+import contextlib
+import contextvars
+import logging
+import re
+import time
+import typing
+
+import sqlalchemy.engine
+import sqlalchemy.event
+
+from pcapi import settings
+
+
+logger = logging.getLogger(__name__)
+
+# Number of repeated statements that are reported in logs.
+TOP_REPEATED_STATEMENTS = 3
+# Fingerprints of statements are truncated in logs.
+MAX_FINGERPRINT_LENGTH = 300
+
+# Numbered bind parameters, e.g. "%(id_1)s, %(id_2)s" for "IN" clauses
+_NUMBERED_PARAMETER_RE = re.compile(r"%\((\w+?)_\d+\)s")
+_REPEATED_PARAMETERS_RE = re.compile(r"%\((\w+)\)s(?:, %\(\1\)s)+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_active_stats: contextvars.ContextVar[tuple["QueryStats", ...]] = contextvars.ContextVar("sql_stats", default=())
+
+
+class QueryStats:
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0  # seconds
+        self.fingerprints: typing.Counter[str] = collections.Counter()
+
+    def add(self, fingerprint: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.fingerprints[fingerprint] += 1
+
+    def get_repeated_statements(self) -> list[tuple[str, int]]:
+        return [
+            (fingerprint, count)
+            for fingerprint, count in self.fingerprints.most_common(TOP_REPEATED_STATEMENTS)
+            if count > 1
+        ]
+
+    def as_log_extra(self) -> dict:
+        return {
+            "sqlQueries": self.count,
+            "sqlDuration": round(self.duration * 1000),  # milliseconds
+            "sqlRepeatedStatements": [
+                {"statement": fingerprint[:MAX_FINGERPRINT_LENGTH], "count": count}
+                for fingerprint, count in self.get_repeated_statements()
+            ],
+        }
+
+
+def get_fingerprint(statement: str) -> str:
+    """Return a normalized version of the statement, so that the same
+    query issued with different parameters (or a different number of
+    items in an "IN" clause) gets the same fingerprint.
+    """
+    fingerprint = _NUMBERED_PARAMETER_RE.sub(r"%(\1)s", statement)
+    fingerprint = _REPEATED_PARAMETERS_RE.sub(r"%(\1)s, ...", fingerprint)
+    return _WHITESPACE_RE.sub(" ", fingerprint).strip()
+
+
+def start_recording() -> QueryStats:
+    stats = QueryStats()
+    _active_stats.set(_active_stats.get() + (stats,))
+    return stats
+
+
+def stop_recording(stats: QueryStats) -> None:
+    # Idempotent, so that it can safely be called more than once
+    # (e.g. after a request and when tearing it down).
+    _active_stats.set(tuple(active for active in _active_stats.get() if active is not stats))
+
+
+@contextlib.contextmanager
+def record_queries() -> typing.Iterator[QueryStats]:
+    stats = start_recording()
+    try:
+        yield stats
+    finally:
+        stop_recording(stats)
+
+
+def warn_if_thresholds_exceeded(stats: QueryStats, description: str, extra: typing.Optional[dict] = None) -> None:
+    """Log a warning if too many queries have been issued, or if the same
+    statement has been repeated too many times. Thresholds are disabled
+    when set to 0.
+    """
+    extra = extra or stats.as_log_extra()
+    if 0 < settings.SQL_QUERIES_WARNING_THRESHOLD < stats.count:
+        logger.warning("Too many SQL queries (%d) in %s", stats.count, description, extra=extra)
+    repeated_statements = stats.get_repeated_statements()
+    if repeated_statements and 0 < settings.SQL_REPEATED_QUERIES_WARNING_THRESHOLD < repeated_statements[0][1]:
+        logger.warning("Same SQL query repeated %d times in %s", repeated_statements[0][1], description, extra=extra)
+
+
+def _before_cursor_execute(context, **kwargs) -> None:  # type: ignore
+    if _active_stats.get():
+        context._sql_stats_start = time.perf_counter()
+
+
+def _after_cursor_execute(statement, context, **kwargs) -> None:  # type: ignore
+    active_stats = _active_stats.get()
+    start = getattr(context, "_sql_stats_start", None)
+    if not active_stats or start is None:
+        return
+    duration = time.perf_counter() - start
+    fingerprint = get_fingerprint(statement)
+    for stats in active_stats:
+        stats.add(fingerprint, duration)
+
+
+def install_sql_stats() -> None:
+    if sqlalchemy.event.contains(sqlalchemy.engine.Engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    sqlalchemy.event.listen(sqlalchemy.engine.Engine, "before_cursor_execute", _before_cursor_execute, named=True)
+    sqlalchemy.event.listen(sqlalchemy.engine.Engine, "after_cursor_execute", _after_cursor_execute, named=True)
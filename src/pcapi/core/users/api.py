@@ -29,6 +29,7 @@ from pcapi.core.users.models import TokenType
 from pcapi.core.users.models import User
 from pcapi.core.users.models import VOID_PUBLIC_NAME
 from pcapi.core.users.repository import get_beneficiary_import_for_beneficiary
+from pcapi.core.users.repository import get_not_cancelled_bookings_amounts
 from pcapi.core.users.utils import decode_jwt_token
 from pcapi.core.users.utils import encode_jwt_payload
 from pcapi.core.users.utils import format_phone_number_with_country_code
@@ -41,6 +42,7 @@ from pcapi.emails.beneficiary_email_change import build_beneficiary_confirmation
 from pcapi.emails.beneficiary_email_change import build_beneficiary_information_email_change_data
 from pcapi.models import BeneficiaryImport
 from pcapi.models import Booking
+from pcapi.models import Deposit
 from pcapi.models import ImportStatus
 from pcapi.models.db import db
 from pcapi.models.feature import FeatureToggle
@@ -375,22 +377,17 @@ def get_domains_credit(user: User) -> Optional[DomainsCredit]:
     if not version or version not in LIMIT_CONFIGURATIONS:
         return None
 
-    bookings = user.get_not_cancelled_bookings()
     config = LIMIT_CONFIGURATIONS[version]
+    bookings_total, digital_bookings_total, physical_bookings_total = get_not_cancelled_bookings_amounts(user, config)
 
     domains_credit = DomainsCredit(
         all=Credit(
             initial=config.TOTAL_CAP,
-            remaining=max(config.TOTAL_CAP - sum(booking.total_amount for booking in bookings), Decimal("0"))
-            if user.has_active_deposit
-            else Decimal("0"),
+            remaining=get_remaining_credit(user.deposit, bookings_total),
         )
     )
 
     if config.DIGITAL_CAP:
-        digital_bookings_total = sum(
-            [booking.total_amount for booking in bookings if config.digital_cap_applies(booking.stock.offer)]
-        )
         domains_credit.digital = Credit(
             initial=config.DIGITAL_CAP,
             remaining=(
@@ -399,9 +396,6 @@ def get_domains_credit(user: User) -> Optional[DomainsCredit]:
         )
 
     if config.PHYSICAL_CAP:
-        physical_bookings_total = sum(
-            [booking.total_amount for booking in bookings if config.physical_cap_applies(booking.stock.offer)]
-        )
         domains_credit.physical = Credit(
             initial=config.PHYSICAL_CAP,
             remaining=(
@@ -412,6 +406,19 @@ def get_domains_credit(user: User) -> Optional[DomainsCredit]:
     return domains_credit
 
 
+def get_remaining_credit(deposit: Optional[Deposit], not_cancelled_bookings_total: Decimal) -> Optional[Decimal]:
+    """Return the credit that remains on all domains (that is
+    `get_domains_credit(user).all.remaining`), from the deposit and the
+    bookings total of the user, fetched beforehand.
+    """
+    version = deposit.version if deposit else None
+    if not version or version not in LIMIT_CONFIGURATIONS:
+        return None
+    if not (deposit.expirationDate and deposit.expirationDate > datetime.now()):
+        return Decimal("0")
+    return max(LIMIT_CONFIGURATIONS[version].TOTAL_CAP - not_cancelled_bookings_total, Decimal("0"))
+
+
 def create_pro_user_and_offerer(pro_user: ProUserCreationBodyModel) -> User:
     objects_to_save = []
 
@@ -1,23 +1,33 @@
 from datetime import date
 from datetime import datetime
+from decimal import Decimal
+from typing import NamedTuple
 from typing import Optional
 
 from dateutil.relativedelta import relativedelta
+from sqlalchemy import and_
+from sqlalchemy import case
+from sqlalchemy import distinct
+from sqlalchemy import false
+from sqlalchemy import func
 from sqlalchemy.orm import joinedload
 from sqlalchemy.orm import load_only
 from sqlalchemy.orm.query import Query
 
+from pcapi.core.bookings.conf import BaseLimitConfiguration
 from pcapi.domain.beneficiary_pre_subscription.beneficiary_pre_subscription_validator import _is_postal_code_eligible
 from pcapi.domain.favorite.favorite import FavoriteDomain
 from pcapi.infrastructure.repository.favorite import favorite_domain_converter
 from pcapi.models import BeneficiaryImport
 from pcapi.models import BeneficiaryImportStatus
 from pcapi.models import Booking
+from pcapi.models import Deposit
 from pcapi.models import ImportStatus
 from pcapi.models import Offer
 from pcapi.models import Stock
 from pcapi.models import UserOfferer
 from pcapi.models import Venue
+from pcapi.models.db import db
 from pcapi.repository.user_queries import find_user_by_email
 
 from . import constants
@@ -142,6 +152,46 @@ def get_booking_categories(user: User) -> list[str]:
     return list(set(offer.type for offer in offers))
 
 
+class UserBookingsStats(NamedTuple):
+    last_booking_date: datetime
+    booking_categories: list[str]
+    not_cancelled_bookings_total: Decimal
+
+
+def get_bookings_stats_by_user_id(user_ids: list[int]) -> dict[int, UserBookingsStats]:
+    """Return, with a single query, the same data as `get_last_booking_date()`,
+    `get_booking_categories()` and `get_not_cancelled_bookings_amounts()`
+    (total amount only) for each of the given users that have bookings.
+    """
+    rows = (
+        db.session.query(
+            Booking.userId,
+            func.max(Booking.dateCreated),
+            func.array_agg(distinct(Offer.type)),
+            func.coalesce(func.sum(Booking.amount * Booking.quantity).filter(Booking.isCancelled.is_(False)), 0),
+        )
+        .select_from(Booking)
+        .join(Stock)
+        .join(Offer)
+        .filter(Booking.userId.in_(user_ids))
+        .group_by(Booking.userId)
+    )
+    return {
+        user_id: UserBookingsStats(last_booking_date, booking_categories, Decimal(total))
+        for user_id, last_booking_date, booking_categories, total in rows
+    }
+
+
+def get_deposits_by_user_id(user_ids: list[int]) -> dict[int, Deposit]:
+    """Return the first deposit (like `User.deposit`) of each of the
+    given users that have one.
+    """
+    deposits = {}
+    for deposit in Deposit.query.filter(Deposit.userId.in_(user_ids)).order_by(Deposit.id):
+        deposits.setdefault(deposit.userId, deposit)
+    return deposits
+
+
 def get_beneficiary_import_for_beneficiary(user: User) -> Optional[BeneficiaryImport]:
     return (
         BeneficiaryImport.query.join(BeneficiaryImportStatus)
@@ -150,3 +200,38 @@ def get_beneficiary_import_for_beneficiary(user: User) -> Optional[BeneficiaryIm
         .order_by(BeneficiaryImportStatus.date.desc())
         .first()
     )
+
+
+def get_not_cancelled_bookings_amounts(user: User, config: BaseLimitConfiguration) -> tuple[Decimal, Decimal, Decimal]:
+    """Return the total amount of the not cancelled bookings of the
+    user, and the parts of it that fall under the digital and physical
+    caps of the given limit configuration, with a single query.
+
+    Capped bookings are selected like `digital_cap_applies()` and
+    `physical_cap_applies()` of the configuration do.
+    """
+    amount = Booking.amount * Booking.quantity
+    is_digital = and_(Offer.url.isnot(None), Offer.url != "")
+
+    if config.DIGITAL_CAP:
+        digital_cap_applies = and_(is_digital, Offer.type.in_({str(type_) for type_ in config.DIGITAL_CAPPED_TYPES}))
+    else:
+        digital_cap_applies = false()
+    if config.PHYSICAL_CAP:
+        physical_cap_applies = and_(~is_digital, Offer.type.in_({str(type_) for type_ in config.PHYSICAL_CAPPED_TYPES}))
+    else:
+        physical_cap_applies = false()
+
+    total, digital_total, physical_total = (
+        db.session.query(
+            func.coalesce(func.sum(amount), 0),
+            func.coalesce(func.sum(case([(digital_cap_applies, amount)], else_=0)), 0),
+            func.coalesce(func.sum(case([(physical_cap_applies, amount)], else_=0)), 0),
+        )
+        .select_from(Booking)
+        .join(Stock)
+        .join(Offer)
+        .filter(Booking.userId == user.id, Booking.isCancelled.is_(False))
+        .one()
+    )
+    return Decimal(total), Decimal(digital_total), Decimal(physical_total)
@@ -1,3 +1,7 @@
+from datetime import datetime
+from typing import NamedTuple
+from typing import Optional
+
 from pcapi.domain.booking_recap.booking_recap import BookingRecap
 
 
@@ -13,3 +17,18 @@ class BookingsRecapPaginated:
         self.page = page
         self.pages = pages
         self.total = total
+
+
+class BookingsRecapCursor(NamedTuple):
+    """Position of the last booking of a page, in the order of the
+    bookings recap list (the most recent bookings first).
+    """
+
+    booking_date: datetime
+    booking_id: int
+
+
+class BookingsRecapPage:
+    def __init__(self, bookings_recap: list[BookingRecap], next_cursor: Optional[BookingsRecapCursor]):
+        self.bookings_recap = bookings_recap
+        self.next_cursor = next_cursor
@@ -113,48 +113,26 @@ class PaymentDetails:
         ]
 
 
-def create_payment_for_booking(booking_reimbursement: BookingReimbursement) -> Payment:
+def create_payment_values_for_booking(booking_reimbursement: BookingReimbursement, transaction_label: str) -> dict:
+    """Return the column values of the payment of a booking, to insert
+    payments in bulk. Bank information of the venue is used if any,
+    otherwise that of its offerer.
+    """
     venue = booking_reimbursement.booking.stock.offer.venue
-
-    payment = Payment()
-    payment.booking = booking_reimbursement.booking
-    payment.amount = booking_reimbursement.reimbursed_amount
-    payment.reimbursementRule = booking_reimbursement.reimbursement.value.description
-    payment.reimbursementRate = booking_reimbursement.reimbursement.value.rate
-    payment.author = "batch"
-    payment.transactionLabel = make_transaction_label(datetime.utcnow())
-
-    if venue.iban:
-        payment.iban = format_raw_iban_and_bic(venue.iban)
-        payment.bic = format_raw_iban_and_bic(venue.bic)
-    else:
-        offerer = venue.managingOfferer
-        payment.iban = format_raw_iban_and_bic(offerer.iban)
-        payment.bic = format_raw_iban_and_bic(offerer.bic)
-
-    payment.recipientName = venue.managingOfferer.name
-    payment.recipientSiren = venue.managingOfferer.siren
-
-    if payment.iban:
-        payment.setStatus(TransactionStatus.PENDING)
-    else:
-        payment.setStatus(TransactionStatus.NOT_PROCESSABLE, detail="IBAN et BIC manquants sur l'offreur")
-
-    return payment
-
-
-def filter_out_already_paid_for_bookings(
-    booking_reimbursements: list[BookingReimbursement],
-) -> list[BookingReimbursement]:
-    return list(filter(lambda x: not x.booking.payments, booking_reimbursements))
-
-
-def filter_out_bookings_without_cost(booking_reimbursements: list[BookingReimbursement]) -> list[BookingReimbursement]:
-    return list(filter(lambda x: x.reimbursed_amount > Decimal(0), booking_reimbursements))
-
-
-def keep_only_pending_payments(payments: list[Payment]) -> list[Payment]:
-    return list(filter(lambda x: x.currentStatus.status == TransactionStatus.PENDING, payments))
+    bank_information_holder = venue if venue.iban else venue.managingOfferer
+
+    return {
+        "bookingId": booking_reimbursement.booking.id,
+        "amount": booking_reimbursement.reimbursed_amount,
+        "reimbursementRule": booking_reimbursement.reimbursement.value.description,
+        "reimbursementRate": booking_reimbursement.reimbursement.value.rate,
+        "author": "batch",
+        "transactionLabel": transaction_label,
+        "iban": format_raw_iban_and_bic(bank_information_holder.iban),
+        "bic": format_raw_iban_and_bic(bank_information_holder.bic),
+        "recipientName": venue.managingOfferer.name,
+        "recipientSiren": venue.managingOfferer.siren,
+    }
 
 
 def keep_only_not_processable_payments(payments: list[Payment]) -> list[Payment]:
@@ -10,6 +10,44 @@ from pcapi.models import ThingType
 
 MIN_DATETIME = datetime.datetime(datetime.MINYEAR, 1, 1)
 MAX_DATETIME = datetime.datetime(datetime.MAXYEAR, 1, 1)
+# Digital offers of these types are reimbursed like physical offers.
+DIGITAL_OFFER_TYPES_REIMBURSED_AS_PHYSICAL = {str(ThingType.LIVRE_EDITION), str(ThingType.CINEMA_CARD)}
+
+
+class ReimbursableBookings:
+    """Columns of the booking data that reimbursement rules need, so that
+    rules are evaluated on many bookings at once (see
+    `find_all_reimbursements()`) rather than through ORM attributes of
+    each booking.
+    """
+
+    def __init__(
+        self,
+        total_amounts: list[Decimal],
+        years: list[int],
+        offer_types: list[str],
+        offers_are_digital: list[bool],
+        products_are_digital: list[bool],
+    ):
+        self.total_amounts = total_amounts
+        self.years = years
+        self.offer_types = offer_types
+        self.offers_are_digital = offers_are_digital
+        self.products_are_digital = products_are_digital
+
+    @classmethod
+    def from_bookings(cls, bookings: list[Booking]) -> "ReimbursableBookings":
+        offers = [booking.stock.offer for booking in bookings]
+        return cls(
+            total_amounts=[booking.total_amount for booking in bookings],
+            years=[booking.dateCreated.year for booking in bookings],
+            offer_types=[offer.type for offer in offers],
+            offers_are_digital=[offer.isDigital for offer in offers],
+            products_are_digital=[offer.product.isDigital for offer in offers],
+        )
+
+    def __len__(self) -> int:
+        return len(self.total_amounts)
 
 
 class ReimbursementRule(ABC):
@@ -22,6 +60,10 @@ class ReimbursementRule(ABC):
     def is_relevant(self, booking: Booking, **kwargs: Decimal) -> bool:
         pass
 
+    @abstractmethod
+    def are_relevant(self, bookings: ReimbursableBookings, cumulative_values: list[Decimal]) -> list[bool]:
+        """Like `is_relevant()`, for each of the bookings."""
+
     @property
     @abstractmethod
     def rate(self) -> Decimal:
@@ -59,6 +101,12 @@ class DigitalThingsReimbursement(ReimbursementRule):
         offer_is_an_exception = book_offer or cinema_card_offer
         return offer.isDigital and not offer_is_an_exception
 
+    def are_relevant(self, bookings: ReimbursableBookings, cumulative_values: list[Decimal]) -> list[bool]:
+        return [
+            is_digital and offer_type not in DIGITAL_OFFER_TYPES_REIMBURSED_AS_PHYSICAL
+            for offer_type, is_digital in zip(bookings.offer_types, bookings.offers_are_digital)
+        ]
+
 
 class PhysicalOffersReimbursement(ReimbursementRule):
     rate = Decimal(1)
@@ -73,6 +121,12 @@ class PhysicalOffersReimbursement(ReimbursementRule):
         offer_is_an_exception = book_offer or cinema_card_offer
         return offer_is_an_exception or not offer.isDigital
 
+    def are_relevant(self, bookings: ReimbursableBookings, cumulative_values: list[Decimal]) -> list[bool]:
+        return [
+            offer_type in DIGITAL_OFFER_TYPES_REIMBURSED_AS_PHYSICAL or not is_digital
+            for offer_type, is_digital in zip(bookings.offer_types, bookings.offers_are_digital)
+        ]
+
 
 class MaxReimbursementByOfferer(ReimbursementRule):
     rate = Decimal(0)
@@ -85,6 +139,12 @@ class MaxReimbursementByOfferer(ReimbursementRule):
             return False
         return kwargs["cumulative_value"] > 20000
 
+    def are_relevant(self, bookings: ReimbursableBookings, cumulative_values: list[Decimal]) -> list[bool]:
+        return [
+            not is_digital and cumulative_value > 20000
+            for is_digital, cumulative_value in zip(bookings.products_are_digital, cumulative_values)
+        ]
+
 
 class ReimbursementRateByVenueBetween20000And40000(ReimbursementRule):
     rate = Decimal(0.95)
@@ -97,6 +157,12 @@ class ReimbursementRateByVenueBetween20000And40000(ReimbursementRule):
             return False
         return 20000 < kwargs["cumulative_value"] <= 40000
 
+    def are_relevant(self, bookings: ReimbursableBookings, cumulative_values: list[Decimal]) -> list[bool]:
+        return [
+            not is_digital and 20000 < cumulative_value <= 40000
+            for is_digital, cumulative_value in zip(bookings.products_are_digital, cumulative_values)
+        ]
+
 
 class ReimbursementRateByVenueBetween40000And150000(ReimbursementRule):
     rate = Decimal(0.85)
@@ -109,6 +175,12 @@ class ReimbursementRateByVenueBetween40000And150000(ReimbursementRule):
             return False
         return 40000 < kwargs["cumulative_value"] <= 150000
 
+    def are_relevant(self, bookings: ReimbursableBookings, cumulative_values: list[Decimal]) -> list[bool]:
+        return [
+            not is_digital and 40000 < cumulative_value <= 150000
+            for is_digital, cumulative_value in zip(bookings.products_are_digital, cumulative_values)
+        ]
+
 
 class ReimbursementRateByVenueAbove150000(ReimbursementRule):
     rate = Decimal(0.7)
@@ -121,6 +193,12 @@ class ReimbursementRateByVenueAbove150000(ReimbursementRule):
             return False
         return kwargs["cumulative_value"] > 150000
 
+    def are_relevant(self, bookings: ReimbursableBookings, cumulative_values: list[Decimal]) -> list[bool]:
+        return [
+            not is_digital and cumulative_value > 150000
+            for is_digital, cumulative_value in zip(bookings.products_are_digital, cumulative_values)
+        ]
+
 
 class ReimbursementRateForBookAbove20000(ReimbursementRule):
     rate = Decimal(0.95)
@@ -133,6 +211,13 @@ class ReimbursementRateForBookAbove20000(ReimbursementRule):
             return False
         return kwargs["cumulative_value"] > 20000
 
+    def are_relevant(self, bookings: ReimbursableBookings, cumulative_values: list[Decimal]) -> list[bool]:
+        book_type = str(ThingType.LIVRE_EDITION)
+        return [
+            offer_type == book_type and cumulative_value > 20000
+            for offer_type, cumulative_value in zip(bookings.offer_types, cumulative_values)
+        ]
+
 
 class ReimbursementRules(Enum):
     DIGITAL_THINGS = DigitalThingsReimbursement()
@@ -173,20 +258,67 @@ def find_all_booking_reimbursements(
     cumulative_bookings_value_by_year = {}
 
     for booking in bookings:
-        booking_civil_year = booking.dateCreated.year
-        if booking_civil_year not in cumulative_bookings_value_by_year:
-            cumulative_bookings_value_by_year[booking_civil_year] = Decimal(0)
+        reimbursements.append(find_booking_reimbursement(booking, active_rules, cumulative_bookings_value_by_year))
+
+    return reimbursements
 
-        if ReimbursementRules.PHYSICAL_OFFERS.value.is_relevant(booking):
-            cumulative_bookings_value_by_year[booking_civil_year] = (
-                cumulative_bookings_value_by_year[booking_civil_year] + booking.total_amount
-            )
 
-        potential_rules = _find_potential_rules(
-            booking, active_rules, cumulative_bookings_value_by_year[booking_civil_year]
+def find_booking_reimbursement(
+    booking: Booking, active_rules: list[ReimbursementRules], cumulative_bookings_value_by_year: dict[int, Decimal]
+) -> BookingReimbursement:
+    """Reimburse the next booking of a venue, given the cumulative value
+    by civil year of its previous bookings, which is updated in place.
+    """
+    booking_civil_year = booking.dateCreated.year
+    if booking_civil_year not in cumulative_bookings_value_by_year:
+        cumulative_bookings_value_by_year[booking_civil_year] = Decimal(0)
+
+    if ReimbursementRules.PHYSICAL_OFFERS.value.is_relevant(booking):
+        cumulative_bookings_value_by_year[booking_civil_year] = (
+            cumulative_bookings_value_by_year[booking_civil_year] + booking.total_amount
         )
-        elected_rule = determine_elected_rule(booking, potential_rules)
-        reimbursements.append(BookingReimbursement(booking, elected_rule.rule, elected_rule.amount))
+
+    potential_rules = _find_potential_rules(
+        booking, active_rules, cumulative_bookings_value_by_year[booking_civil_year]
+    )
+    elected_rule = determine_elected_rule(booking, potential_rules)
+    return BookingReimbursement(booking, elected_rule.rule, elected_rule.amount)
+
+
+def find_all_reimbursements(
+    bookings: ReimbursableBookings,
+    active_rules: list[ReimbursementRules],
+    cumulative_bookings_value_by_year: dict[int, Decimal],
+) -> list[AppliedReimbursement]:
+    """Elect the reimbursement rule of each of the next bookings of a
+    venue, like `find_booking_reimbursement()` does for one booking,
+    but evaluating each rule on all bookings at once.
+    """
+    physical_offers = ReimbursementRules.PHYSICAL_OFFERS.value.are_relevant(bookings, [])
+    cumulative_values = []
+    for year, total_amount, is_physical_offer in zip(bookings.years, bookings.total_amounts, physical_offers):
+        cumulative_value = cumulative_bookings_value_by_year.get(year, Decimal(0))
+        if is_physical_offer:
+            cumulative_value += total_amount
+        cumulative_bookings_value_by_year[year] = cumulative_value
+        cumulative_values.append(cumulative_value)
+
+    relevances_by_rule = [(rule, rule.value.are_relevant(bookings, cumulative_values)) for rule in active_rules]
+
+    reimbursements = []
+    for index, total_amount in enumerate(bookings.total_amounts):
+        amounts_by_rule = {
+            rule: Decimal(total_amount * rule.value.rate)
+            for rule, relevances in relevances_by_rule
+            if relevances[index]
+        }
+        if ReimbursementRules.BOOK_REIMBURSEMENT in amounts_by_rule:
+            elected_rule = ReimbursementRules.BOOK_REIMBURSEMENT
+        else:
+            # Like `min()` in `determine_elected_rule()`, the first of
+            # the rules with the lowest amount is elected.
+            elected_rule = min(amounts_by_rule, key=amounts_by_rule.get)
+        reimbursements.append(AppliedReimbursement(elected_rule, amounts_by_rule[elected_rule]))
 
     return reimbursements
 
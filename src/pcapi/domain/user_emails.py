@@ -156,9 +156,14 @@ def send_booking_cancellation_emails_to_user_and_offerer(
         send_user_driven_cancellation_email_to_offerer(booking)
 
 
-def send_expired_bookings_recap_email_to_beneficiary(beneficiary: User, bookings: list[Booking]) -> None:
-    data = build_expired_bookings_recap_email_data_for_beneficiary(beneficiary, bookings)
-    mails.send(recipients=[beneficiary.email], data=data)
+def send_expired_bookings_recap_emails_to_beneficiaries(
+    bookings_by_beneficiary: list[tuple[User, list[Booking]]],
+) -> list[bool]:
+    messages = [
+        ([beneficiary.email], build_expired_bookings_recap_email_data_for_beneficiary(beneficiary, bookings))
+        for beneficiary, bookings in bookings_by_beneficiary
+    ]
+    return mails.send_many(messages=messages)
 
 
 def send_expired_bookings_recap_email_to_offerer(offerer: Offerer, bookings: list[Booking]) -> None:
@@ -177,9 +182,14 @@ def send_admin_user_validation_email(user: User, token: Token) -> None:
     mails.send(recipients=[user.email], data=data)
 
 
-def send_soon_to_be_expired_bookings_recap_email_to_beneficiary(beneficiary: User, bookings: list[Booking]) -> None:
-    data = build_soon_to_be_expired_bookings_recap_email_data_for_beneficiary(beneficiary, bookings)
-    mails.send(recipients=[beneficiary.email], data=data)
+def send_soon_to_be_expired_bookings_recap_emails_to_beneficiaries(
+    bookings_by_beneficiary: list[tuple[User, list[Booking]]],
+) -> list[bool]:
+    messages = [
+        ([beneficiary.email], build_soon_to_be_expired_bookings_recap_email_data_for_beneficiary(beneficiary, bookings))
+        for beneficiary, bookings in bookings_by_beneficiary
+    ]
+    return mails.send_many(messages=messages)
 
 
 def send_activation_email(
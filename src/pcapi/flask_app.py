@@ -25,6 +25,7 @@ from sqlalchemy import orm
 from werkzeug.middleware.profiler import ProfilerMiddleware
 
 from pcapi import settings
+from pcapi.core import sql_stats
 from pcapi.core.logging import get_or_set_correlation_id
 from pcapi.core.logging import install_logging
 from pcapi.models.db import db
@@ -37,6 +38,7 @@ from pcapi.utils.rate_limiting import rate_limiter
 logger = logging.getLogger(__name__)
 
 install_logging()
+sql_stats.install_sql_stats()
 
 if settings.IS_DEV is False:
     # pylint: disable=abstract-class-instantiated
@@ -103,6 +105,7 @@ def before_request() -> None:
         )
     sentry_sdk.set_tag("correlation-id", get_or_set_correlation_id())
     g.request_start = time.perf_counter()
+    g.sql_stats = sql_stats.start_recording()
 
 
 @app.after_request
@@ -117,8 +120,14 @@ def log_request_details(response: flask.wrappers.Response) -> flask.wrappers.Res
         "duration": duration,
         "size": response.headers.get("Content-Length", type=int),
     }
+    stats = g.get("sql_stats")
+    if stats:
+        sql_stats.stop_recording(stats)
+        extra.update(stats.as_log_extra())
 
     logger.info("HTTP request at %s", request.path, extra=extra)
+    if stats:
+        sql_stats.warn_if_thresholds_exceeded(stats, f"HTTP request at {request.path}", extra=extra)
 
     return response
 
@@ -141,6 +150,9 @@ def remove_db_session(
         db.session.remove()
     except AttributeError:
         pass
+    stats = g.get("sql_stats")
+    if stats:
+        sql_stats.stop_recording(stats)
 
 
 admin.init_app(app)
@@ -1,22 +1,44 @@
+from typing import Iterable
 from typing import Optional
 
 from pcapi.local_providers.providable_info import ProvidableInfo
 from pcapi.models.db import Model
 from pcapi.repository.providable_queries import get_existing_object
+from pcapi.repository.providable_queries import get_existing_objects
 from pcapi.repository.providable_queries import insert_chunk
 from pcapi.repository.providable_queries import update_chunk
 
 
 def get_existing_pc_obj(
-    providable_info: ProvidableInfo, chunk_to_insert: dict, chunk_to_update: dict
+    providable_info: ProvidableInfo,
+    chunk_to_insert: dict,
+    chunk_to_update: dict,
+    prefetched_objects: Optional[dict[str, Optional[Model]]] = None,
 ) -> Optional[Model]:
     object_in_current_chunk = get_object_from_current_chunks(providable_info, chunk_to_insert, chunk_to_update)
     if object_in_current_chunk is None:
+        chunk_key = f"{providable_info.id_at_providers}|{providable_info.type.__name__}"
+        if prefetched_objects is not None and chunk_key in prefetched_objects:
+            return prefetched_objects[chunk_key]
         return get_existing_object(providable_info.type, providable_info.id_at_providers)
 
     return object_in_current_chunk
 
 
+def prefetch_existing_pc_objs(ids_at_providers_by_type: dict[type, Iterable[str]]) -> dict[str, Optional[Model]]:
+    """Return existing objects indexed by chunk key, with one query per
+    model. Requested ids that do not exist (yet) are mapped to None, so
+    that they can be told apart from ids that have not been prefetched.
+    """
+    prefetched_objects = {}
+    for model_type, ids_at_providers in ids_at_providers_by_type.items():
+        for id_at_providers in ids_at_providers:
+            prefetched_objects[f"{id_at_providers}|{model_type.__name__}"] = None
+        for pc_object in get_existing_objects(model_type, ids_at_providers):
+            prefetched_objects[f"{pc_object.idAtProviders}|{model_type.__name__}"] = pc_object
+    return prefetched_objects
+
+
 def get_object_from_current_chunks(
     providable_info: ProvidableInfo, chunk_to_insert: dict, chunk_to_update: dict
 ) -> Optional[Model]:
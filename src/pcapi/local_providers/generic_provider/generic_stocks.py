@@ -39,9 +39,14 @@ class GenericStocks(LocalProvider):
         try:
             self.provider_stocks = next(self.stock_data)
         except StopIteration:
-            self.stock_data = self.get_provider_stock_information(  # pylint: disable=not-callable
-                self.id_at_provider, self.last_processed_isbn, self.modified_since
+            stocks = list(
+                self.get_provider_stock_information(  # pylint: disable=not-callable
+                    self.id_at_provider, self.last_processed_isbn, self.modified_since
+                )
             )
+            ids_at_providers = [f"{stock['ref']}@{self.id_at_provider}" for stock in stocks]
+            self.prefetch_existing_objects({Offer: ids_at_providers, Stock: ids_at_providers})
+            self.stock_data = iter(stocks)
             self.provider_stocks = next(self.stock_data)
 
         self.last_processed_isbn = str(self.provider_stocks["ref"])
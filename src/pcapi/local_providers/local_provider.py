@@ -1,19 +1,25 @@
 from abc import abstractmethod
+from collections import defaultdict
+from collections.abc import Iterable
 from collections.abc import Iterator
 from datetime import datetime
 import logging
 
 from flask import current_app as app
 
+from pcapi import settings
 from pcapi.connectors import redis
 from pcapi.connectors.redis import send_venue_provider_data_to_redis
 from pcapi.connectors.thumb_storage import create_thumb
+from pcapi.connectors.thumb_storage import create_thumbs
 from pcapi.core.offers.models import Offer
 from pcapi.core.offers.models import Stock
 from pcapi.core.providers.repository import get_provider_by_local_class
 from pcapi.local_providers.chunk_manager import get_existing_pc_obj
+from pcapi.local_providers.chunk_manager import prefetch_existing_pc_objs
 from pcapi.local_providers.chunk_manager import save_chunks
 from pcapi.local_providers.providable_info import ProvidableInfo
+from pcapi.local_providers.thumb_pipeline import ThumbPipeline
 from pcapi.models import ApiErrors
 from pcapi.models.db import Model
 from pcapi.models.db import db
@@ -45,6 +51,10 @@ class LocalProvider(Iterator):
         self.checkedThumbs = 0
         self.erroredThumbs = 0
         self.provider = get_provider_by_local_class(self.__class__.__name__)
+        self.prefetched_objects = {}
+        self.prefetched_ids_at_providers = {}
+        self.thumb_pipeline = None
+        self.pipelineUploadedThumbs = 0
 
     @property
     @abstractmethod
@@ -66,6 +76,36 @@ class LocalProvider(Iterator):
         providable_info.date_modified_at_provider = date_modified_at_provider
         return providable_info
 
+    def prefetch_existing_objects(self, ids_at_providers_by_type: dict[type, Iterable[str]]) -> None:
+        """Load with a single query per model the existing objects that
+        the next providable infos refer to, so that `updateObjects` does
+        not look them up one by one. Subclasses should call it as soon as
+        they know a batch of upcoming ids (a page of stocks, a window of
+        lines of a file...). It replaces any previous prefetch.
+        """
+        self.prefetched_ids_at_providers = {
+            model_type: set(ids_at_providers) for model_type, ids_at_providers in ids_at_providers_by_type.items()
+        }
+        self.prefetched_objects = prefetch_existing_pc_objs(self.prefetched_ids_at_providers)
+
+    def _prefetch_providable_infos(self, providable_infos: list[ProvidableInfo]) -> None:
+        ids_at_providers_by_type = defaultdict(set)
+        for providable_info in providable_infos:
+            chunk_key = providable_info.id_at_providers + "|" + str(providable_info.type.__name__)
+            if chunk_key not in self.prefetched_objects:
+                ids_at_providers_by_type[providable_info.type].add(providable_info.id_at_providers)
+        if sum(len(ids_at_providers) for ids_at_providers in ids_at_providers_by_type.values()) > 1:
+            self.prefetch_existing_objects(ids_at_providers_by_type)
+
+    def _save_chunks(self, chunk_to_insert: dict, chunk_to_update: dict) -> None:
+        self._wait_for_thumbs()
+        save_chunks(chunk_to_insert, chunk_to_update)
+        if self.prefetched_objects:
+            # Saving commits the session, which expires prefetched
+            # objects, and may have created some of them: load them
+            # again in one go rather than one by one.
+            self.prefetch_existing_objects(self.prefetched_ids_at_providers)
+
     def get_object_thumb(self) -> bytes:
         return bytes()
 
@@ -87,8 +127,26 @@ class LocalProvider(Iterator):
         if not new_thumb:
             return
 
-        _save_same_thumb_from_thumb_count_to_index(pc_object, new_thumb_index, new_thumb)
-        self.createdThumbs += new_thumb_index
+        self.createdThumbs += _save_same_thumb_from_thumb_count_to_index(
+            pc_object, new_thumb_index, new_thumb, self.thumb_pipeline
+        )
+
+    def _wait_for_thumbs(self) -> None:
+        if self.thumb_pipeline is None:
+            return
+        failures = self.thumb_pipeline.wait()
+        # Only count the thumbs that the pipeline did upload.
+        uploaded_thumbs = self.thumb_pipeline.stats["uploaded"]
+        self.createdThumbs += uploaded_thumbs - self.pipelineUploadedThumbs
+        self.pipelineUploadedThumbs = uploaded_thumbs
+        for failure in failures:
+            self.log_provider_event(LocalProviderEventType.SyncError, failure.error.__class__.__name__)
+            self.erroredThumbs += 1
+            logger.info("ERROR during handle thumb: %s", failure.error, exc_info=failure.error)
+            if failure.is_new_thumb:
+                # Like when thumbs are stored one by one, only count the
+                # thumbs stored before the first failure.
+                failure.pc_object.thumbCount = min(failure.pc_object.thumbCount, failure.index)
 
     def _create_object(self, providable_info: ProvidableInfo) -> Model:
         pc_object = providable_info.type()
@@ -153,9 +211,10 @@ class LocalProvider(Iterator):
             self.updatedThumbs,
             self.erroredThumbs,
         )
+        if self.thumb_pipeline is not None:
+            logger.info("Thumbs pipeline of venue=%s, stats=%s", venue_id, self.thumb_pipeline.stats)
 
     def updateObjects(self, limit=None):
-        # pylint: disable=too-many-nested-blocks
         if self.venue_provider and not self.venue_provider.isActive:
             logger.info("Venue provider %s is inactive", self.venue_provider)
             return
@@ -168,13 +227,39 @@ class LocalProvider(Iterator):
         # TODO (asaunier,2021-03-18): We may replace this log in BDD with logs in the monitoring system
         self.log_provider_event(LocalProviderEventType.SyncStart)
 
-        chunk_to_insert = {}
-        chunk_to_update = {}
-
         reindex_whole_venue_provider_later = feature_queries.is_active(
             FeatureToggle.ENABLE_WHOLE_VENUE_PROVIDER_ALGOLIA_INDEXATION
         )
 
+        if settings.PROVIDERS_SYNC_THUMBS_PROCESSES > 0:
+            self.thumb_pipeline = ThumbPipeline(
+                processes=settings.PROVIDERS_SYNC_THUMBS_PROCESSES,
+                upload_threads=settings.PROVIDERS_SYNC_THUMBS_UPLOAD_THREADS,
+                max_pending=settings.PROVIDERS_SYNC_THUMBS_MAX_PENDING,
+            )
+            self.pipelineUploadedThumbs = 0
+        try:
+            self._synchronize_objects(limit, reindex_whole_venue_provider_later)
+        finally:
+            if self.thumb_pipeline is not None:
+                self.thumb_pipeline.close()
+
+        self._print_objects_summary()
+        self.log_provider_event(LocalProviderEventType.SyncEnd)
+
+        if self.venue_provider is not None:
+            self.venue_provider.lastSyncDate = datetime.utcnow()
+            self.venue_provider.syncWorkerId = None
+            repository.save(self.venue_provider)
+            if reindex_whole_venue_provider_later:
+                if feature_queries.is_active(FeatureToggle.SYNCHRONIZE_ALGOLIA):
+                    send_venue_provider_data_to_redis(self.venue_provider)
+
+    def _synchronize_objects(self, limit, reindex_whole_venue_provider_later):
+        # pylint: disable=too-many-nested-blocks
+        chunk_to_insert = {}
+        chunk_to_update = {}
+
         for providable_infos in self:
             objects_limit_reached = limit and self.checkedObjects >= limit
             if objects_limit_reached:
@@ -185,9 +270,15 @@ class LocalProvider(Iterator):
                 self.checkedObjects += 1
                 continue
 
+            # Providers that yield many providable infos at once (e.g.
+            # all showtimes of a movie) get them looked up in one go.
+            self._prefetch_providable_infos(providable_infos)
+
             for providable_info in providable_infos:
                 chunk_key = providable_info.id_at_providers + "|" + str(providable_info.type.__name__)
-                pc_object = get_existing_pc_obj(providable_info, chunk_to_insert, chunk_to_update)
+                pc_object = get_existing_pc_obj(
+                    providable_info, chunk_to_insert, chunk_to_update, self.prefetched_objects
+                )
 
                 if pc_object is None:
                     if not self.can_create:
@@ -235,40 +326,45 @@ class LocalProvider(Iterator):
                 self.checkedObjects += 1
 
                 if len(chunk_to_insert) + len(chunk_to_update) >= CHUNK_MAX_SIZE:
-                    save_chunks(chunk_to_insert, chunk_to_update)
+                    self._save_chunks(chunk_to_insert, chunk_to_update)
                     if not reindex_whole_venue_provider_later:
                         _reindex_offers(list(chunk_to_insert.values()) + list(chunk_to_update.values()))
                     chunk_to_insert = {}
                     chunk_to_update = {}
 
         if len(chunk_to_insert) + len(chunk_to_update) > 0:
-            save_chunks(chunk_to_insert, chunk_to_update)
+            self._save_chunks(chunk_to_insert, chunk_to_update)
             if not reindex_whole_venue_provider_later:
                 _reindex_offers(list(chunk_to_insert.values()) + list(chunk_to_update.values()))
+        # Thumbs of objects that did not need to be saved.
+        self._wait_for_thumbs()
 
-        self._print_objects_summary()
-        self.log_provider_event(LocalProviderEventType.SyncEnd)
-
-        if self.venue_provider is not None:
-            self.venue_provider.lastSyncDate = datetime.utcnow()
-            self.venue_provider.syncWorkerId = None
-            repository.save(self.venue_provider)
-            if reindex_whole_venue_provider_later:
-                if feature_queries.is_active(FeatureToggle.SYNCHRONIZE_ALGOLIA):
-                    send_venue_provider_data_to_redis(self.venue_provider)
 
-
-def _save_same_thumb_from_thumb_count_to_index(pc_object: Model, thumb_index: int, image_as_bytes: bytes):
+def _save_same_thumb_from_thumb_count_to_index(
+    pc_object: Model, thumb_index: int, image_as_bytes: bytes, thumb_pipeline: ThumbPipeline = None
+) -> int:
+    """Return the number of thumbs that have been stored, which is 0 for
+    thumbs submitted to the pipeline: they are counted once uploaded.
+    """
     if pc_object.thumbCount is None:  # handle unsaved object
         pc_object.thumbCount = 0
     if thumb_index <= pc_object.thumbCount:
         # replace existing thumb
+        if thumb_pipeline:
+            thumb_pipeline.submit(pc_object, image_as_bytes, [thumb_index], is_new_thumb=False)
+            return 0
         create_thumb(pc_object, image_as_bytes, thumb_index)
-    else:
-        # add new thumb
-        for index in range(pc_object.thumbCount, thumb_index):
-            create_thumb(pc_object, image_as_bytes, index)
-            pc_object.thumbCount += 1
+        return 1
+    new_thumb_indexes = range(pc_object.thumbCount, thumb_index)
+    if thumb_pipeline:
+        # add new thumbs, `ThumbPipeline.wait()` reports those that failed
+        thumb_pipeline.submit(pc_object, image_as_bytes, new_thumb_indexes, is_new_thumb=True)
+        pc_object.thumbCount = thumb_index
+        return 0
+    # add new thumbs
+    create_thumbs(pc_object, image_as_bytes, new_thumb_indexes)
+    pc_object.thumbCount = thumb_index
+    return len(new_thumb_indexes)
 
 
 def _reindex_offers(created_or_updated_objects):
@@ -280,5 +376,4 @@ def _reindex_offers(created_or_updated_objects):
             offer_ids.add(obj.offerId)
         elif isinstance(obj, Offer):
             offer_ids.add(obj.id)
-    for offer_id in offer_ids:
-        redis.add_offer_id(client=app.redis_client, offer_id=offer_id)
+    redis.add_offer_ids(client=app.redis_client, offer_ids=offer_ids)
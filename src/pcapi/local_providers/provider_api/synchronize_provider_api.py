@@ -1,11 +1,15 @@
 from datetime import datetime
 import logging
+import queue
+import threading
 import time
 from typing import Counter
 from typing import Generator
+from typing import Iterator
 
 from sqlalchemy.sql.sqltypes import DateTime
 
+from pcapi import settings
 from pcapi.core.providers.api import synchronize_stocks
 from pcapi.core.providers.models import VenueProvider
 from pcapi.infrastructure.repository.stock_provider.provider_api import ProviderAPI
@@ -14,6 +18,8 @@ from pcapi.repository import repository
 
 logger = logging.getLogger(__name__)
 
+_END_OF_BATCHES = object()
+
 
 def synchronize_venue_provider(venue_provider: VenueProvider) -> None:
     venue = venue_provider.venue
@@ -25,9 +31,10 @@ def synchronize_venue_provider(venue_provider: VenueProvider) -> None:
     provider_api = provider.getProviderAPI()
 
     stats = Counter()
-    for raw_stocks in _get_stocks_by_batch(
+    stocks_batches = _get_stocks_by_batch(
         venue_provider.venueIdAtOfferProvider, provider_api, venue_provider.lastSyncDate
-    ):
+    )
+    for raw_stocks in _prefetch_batches(stocks_batches, settings.PROVIDERS_SYNC_PREFETCHED_PAGES):
         stock_details = _build_stock_details_from_raw_stocks(raw_stocks, venue_provider.venueIdAtOfferProvider)
         operations = synchronize_stocks(stock_details, venue, provider_id=provider.id)
         stats += Counter(operations)
@@ -66,6 +73,51 @@ def _get_stocks_by_batch(siret: str, provider_api: ProviderAPI, modified_since:
         last_processed_provider_reference = raw_stocks[-1]["ref"]
 
 
+def _prefetch_batches(batches: Iterator[list[dict]], max_prefetched_batches: int) -> Generator:
+    """Yield batches from `batches`, which are fetched in a background
+    thread, up to `max_prefetched_batches` in advance. The next page is
+    thus requested from the provider while the current one is written
+    to the database.
+    """
+    if max_prefetched_batches <= 0:
+        yield from batches
+        return
+
+    prefetched_batches = queue.Queue(maxsize=max_prefetched_batches)
+    stopped = threading.Event()
+
+    def put(item: object) -> None:
+        # Do not block forever if the consumer has stopped early.
+        while not stopped.is_set():
+            try:
+                prefetched_batches.put(item, timeout=1)
+                return
+            except queue.Full:
+                continue
+
+    def fetch() -> None:
+        try:
+            for batch in batches:
+                put(batch)
+                if stopped.is_set():
+                    return
+            put(_END_OF_BATCHES)
+        except Exception as exc:  # pylint: disable=broad-except
+            put(exc)
+
+    threading.Thread(target=fetch, name="provider-api-prefetch", daemon=True).start()
+    try:
+        while True:
+            item = prefetched_batches.get()
+            if item is _END_OF_BATCHES:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stopped.set()
+
+
 def _build_stock_details_from_raw_stocks(raw_stocks: list[dict], venue_siret: str) -> list[dict]:
     stock_details = {}
     for stock in raw_stocks:
@@ -1,7 +1,11 @@
+from concurrent.futures import ThreadPoolExecutor
 import logging
 from typing import Callable
 from typing import Optional
 
+import flask
+
+from pcapi import settings
 from pcapi.core.providers.models import VenueProvider
 import pcapi.local_providers
 from pcapi.local_providers.local_provider import LocalProvider
@@ -26,7 +30,31 @@ def synchronize_data_for_provider(provider_name: str, limit: Optional[int] = Non
 
 def synchronize_venue_providers_for_provider(provider_id: int, limit: Optional[int] = None) -> None:
     venue_providers = get_active_venue_providers_for_specific_provider(provider_id)
-    for venue_provider in venue_providers:
+
+    workers_count = settings.PROVIDERS_SYNC_CONCURRENT_VENUE_PROVIDERS
+    if workers_count <= 1:
+        for venue_provider in venue_providers:
+            synchronize_venue_provider(venue_provider, limit)
+        return
+
+    # Each thread has its own database session, hence ids and not
+    # objects bound to the session of this thread.
+    app = flask.current_app._get_current_object()
+    venue_provider_ids = [venue_provider.id for venue_provider in venue_providers]
+    with ThreadPoolExecutor(max_workers=workers_count, thread_name_prefix="venue-provider-sync") as executor:
+        futures = [
+            executor.submit(_synchronize_venue_provider_in_app_context, app, venue_provider_id, limit)
+            for venue_provider_id in venue_provider_ids
+        ]
+    for future in futures:
+        future.result()
+
+
+def _synchronize_venue_provider_in_app_context(
+    app: flask.Flask, venue_provider_id: int, limit: Optional[int]
+) -> None:
+    with app.app_context():
+        venue_provider = VenueProvider.query.get(venue_provider_id)
         synchronize_venue_provider(venue_provider, limit)
 
 
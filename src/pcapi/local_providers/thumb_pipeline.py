@@ -0,0 +1,130 @@
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import multiprocessing
+import threading
+import time
+from typing import Iterable
+from typing import NamedTuple
+
+from pcapi.connectors.thumb_storage import store_thumb
+from pcapi.models.db import Model
+from pcapi.utils.image_conversion import standardize_image_timed
+
+
+class ThumbFailure(NamedTuple):
+    pc_object: Model
+    index: int
+    is_new_thumb: bool
+    error: Exception
+
+
+class _Job:
+    def __init__(self, pc_object: Model, indexes: list[int], is_new_thumb: bool):
+        self.pc_object = pc_object
+        self.is_new_thumb = is_new_thumb
+        # Storage ids are computed here, in the synchronization thread:
+        # objects must not be accessed from other threads.
+        self.thumbs = [(index, pc_object.get_thumb_storage_id(index)) for index in indexes]
+        self.remaining_uploads = len(indexes)
+
+
+class ThumbPipeline:
+    """Convert thumbs in a pool of processes and upload them in a pool of
+    threads, so that the synchronization can go on with the next objects
+    meanwhile.
+
+    At most `max_pending` images are converted or uploaded at the same
+    time: `submit()` blocks beyond. Failures are only reported by
+    `wait()`, which must be called from the synchronization thread
+    before saving the objects whose thumbs were submitted.
+    """
+
+    def __init__(self, processes: int, upload_threads: int, max_pending: int):
+        # Forked processes would share the database connections of the
+        # synchronization process: start fresh interpreters instead. Note
+        # that each of them re-imports the `__main__` module of the parent
+        # (e.g. a clock, and through it the whole application) before
+        # the conversion function: this is paid once per worker process,
+        # which lives as long as the pipeline.
+        self._conversion_pool = ProcessPoolExecutor(
+            max_workers=processes, mp_context=multiprocessing.get_context("spawn")
+        )
+        self._upload_pool = ThreadPoolExecutor(max_workers=upload_threads, thread_name_prefix="thumbs-upload")
+        self._pending_jobs = threading.BoundedSemaphore(max_pending)
+        self._condition = threading.Condition()
+        self._running_jobs = 0
+        self._failures: list[ThumbFailure] = []
+        self.stats = {
+            "converted": 0,
+            "conversion_seconds": 0.0,
+            "uploaded": 0,
+            "upload_seconds": 0.0,
+            "failed": 0,
+        }
+
+    def submit(self, pc_object: Model, image_as_bytes: bytes, indexes: Iterable[int], is_new_thumb: bool) -> None:
+        """Store `image_as_bytes` as the thumbs of `pc_object` at each of
+        the given indexes. The image is only converted once.
+        """
+        job = _Job(pc_object, list(indexes), is_new_thumb)
+        if not job.thumbs:
+            return
+        self._pending_jobs.acquire()  # pylint: disable=consider-using-with
+        with self._condition:
+            self._running_jobs += 1
+        conversion = self._conversion_pool.submit(standardize_image_timed, image_as_bytes)
+        conversion.add_done_callback(partial(self._on_converted, job))
+
+    def wait(self) -> list[ThumbFailure]:
+        """Wait for all submitted thumbs to be stored and return the
+        failures since the previous call.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._running_jobs == 0)
+            failures, self._failures = self._failures, []
+        return failures
+
+    def close(self) -> None:
+        self._conversion_pool.shutdown(wait=True)
+        self._upload_pool.shutdown(wait=True)
+
+    def _on_converted(self, job: _Job, conversion: Future) -> None:
+        try:
+            image_as_bytes, duration = conversion.result()
+        except Exception as error:  # pylint: disable=broad-except
+            self._fail(job, job.thumbs[0][0], error)
+            self._finish(job, len(job.thumbs))
+            return
+        with self._condition:
+            self.stats["converted"] += 1
+            self.stats["conversion_seconds"] += duration
+        for index, thumb_storage_id in job.thumbs:
+            self._upload_pool.submit(self._upload, job, index, thumb_storage_id, image_as_bytes)
+
+    def _upload(self, job: _Job, index: int, thumb_storage_id: str, image_as_bytes: bytes) -> None:
+        start = time.perf_counter()
+        try:
+            store_thumb(thumb_storage_id, image_as_bytes)
+        except Exception as error:  # pylint: disable=broad-except
+            self._fail(job, index, error)
+        else:
+            with self._condition:
+                self.stats["uploaded"] += 1
+                self.stats["upload_seconds"] += time.perf_counter() - start
+        self._finish(job, 1)
+
+    def _fail(self, job: _Job, index: int, error: Exception) -> None:
+        with self._condition:
+            self.stats["failed"] += 1
+            self._failures.append(ThumbFailure(job.pc_object, index, job.is_new_thumb, error))
+
+    def _finish(self, job: _Job, uploads: int) -> None:
+        with self._condition:
+            job.remaining_uploads -= uploads
+            if job.remaining_uploads > 0:
+                return
+            self._running_jobs -= 1
+            self._condition.notify_all()
+        self._pending_jobs.release()
@@ -1,10 +1,12 @@
-from io import BytesIO
+from collections import deque
 from io import TextIOWrapper
+from itertools import islice
 import logging
 import re
+from typing import Iterator
 from typing import Optional
 
-from pcapi.connectors.ftp_titelive import connect_to_titelive_ftp
+from pcapi.connectors.ftp_titelive import download_file_from_ftp
 from pcapi.connectors.ftp_titelive import get_files_to_process_from_titelive_ftp
 from pcapi.domain.titelive import get_date_from_filename
 from pcapi.domain.titelive import read_things_date
@@ -26,6 +28,7 @@ from pcapi.utils.string_processing import trim_with_elipsis
 DATE_REGEXP = re.compile(r"([a-zA-Z]+)(\d+).tit")
 THINGS_FOLDER_NAME_TITELIVE = "livre3_11"
 NUMBER_OF_ELEMENTS_PER_LINE = 46  # (45 elements from line + \n)
+PREFETCH_WINDOW_SIZE = 1000
 PAPER_PRESS_TVA = "2,10"
 PAPER_PRESS_SUPPORT_CODE = "R"
 SCHOOL_RELATED_CSR_CODE = [
@@ -90,6 +93,7 @@ class TiteLiveThings(LocalProvider):
         self.thing_files = self.get_remaining_files_to_check(ordered_thing_files)
 
         self.data_lines = None
+        self.prefetched_data_lines = deque()
         self.products_file = None
         self.product_extra_data = {}
 
@@ -98,11 +102,11 @@ class TiteLiveThings(LocalProvider):
             self.open_next_file()
 
         try:
-            data_lines = next(self.data_lines)
+            data_lines = self.next_data_line()
             elements = data_lines.split("~")
         except StopIteration:
             self.open_next_file()
-            elements = next(self.data_lines).split("~")
+            elements = self.next_data_line().split("~")
 
         if len(elements) != NUMBER_OF_ELEMENTS_PER_LINE:
             self.log_provider_event(LocalProviderEventType.SyncError, "number of elements mismatch")
@@ -118,6 +122,9 @@ class TiteLiveThings(LocalProvider):
         ineligibility_reason = self.get_ineligibility_reason()
         if ineligibility_reason:
             logger.info("Ignoring isbn=%s because reason=%s", book_unique_identifier, ineligibility_reason)
+            # The product may be deleted below: do not let a later line
+            # of the same window find it among prefetched objects.
+            self.prefetched_objects.pop(f"{book_unique_identifier}|{Product.__name__}", None)
             try:
                 product_queries.delete_unwanted_existing_product(book_unique_identifier)
             except ProductWithBookingsException:
@@ -130,6 +137,18 @@ class TiteLiveThings(LocalProvider):
         providable_info = self.create_providable_info(Product, book_unique_identifier, book_information_last_update)
         return [providable_info]
 
+    def next_data_line(self) -> str:
+        # Read lines by windows so that existing products of a whole
+        # window are fetched at once (see `prefetch_existing_objects`).
+        if not self.prefetched_data_lines:
+            self.prefetched_data_lines.extend(islice(self.data_lines, PREFETCH_WINDOW_SIZE))
+            if not self.prefetched_data_lines:
+                raise StopIteration
+            self.prefetch_existing_objects(
+                {Product: [data_line.split("~", 1)[0] for data_line in self.prefetched_data_lines]}
+            )
+        return self.prefetched_data_lines.popleft()
+
     def get_ineligibility_reason(self) -> str:
         if self.product_infos["is_scolaire"] == "1" or self.product_infos["code_csr"] in SCHOOL_RELATED_CSR_CODE:
             return "school"
@@ -178,17 +197,12 @@ class TiteLiveThings(LocalProvider):
         return iter([])
 
 
-def get_lines_from_thing_file(thing_file: str):
-    data_file = BytesIO()
-    data_wrapper = TextIOWrapper(
-        data_file,
-        encoding="iso-8859-1",
-        line_buffering=True,
-    )
-    file_path = "RETR " + THINGS_FOLDER_NAME_TITELIVE + "/" + thing_file
-    connect_to_titelive_ftp().retrbinary(file_path, data_file.write)
-    data_wrapper.seek(0, 0)
-    return iter(data_wrapper.readlines())
+def get_lines_from_thing_file(thing_file: str) -> Iterator[str]:
+    # Lines are yielded one by one from the downloaded file rather than
+    # all read at once: catch-up files are too big to be held in memory.
+    data_file = download_file_from_ftp(thing_file, THINGS_FOLDER_NAME_TITELIVE)
+    with TextIOWrapper(data_file, encoding="iso-8859-1") as data_wrapper:
+        yield from data_wrapper
 
 
 def get_thing_type_and_extra_data_from_titelive_type(titelive_type):
@@ -51,6 +51,7 @@ class FeatureToggle(enum.Enum):
     ENABLE_PHONE_VALIDATION = "Active la validation du numéro de téléphone"
     USE_NEW_BATCH_INDEX_OFFERS_BEHAVIOUR = "Utilise une boucle dans le cron de réindexation Algolia"
     ENABLE_NATIVE_ID_CHECK_VERSION = "Utilise la version d'ID-Check intégrée à l'application native"
+    DEBOUNCE_PUSH_USER_ATTRIBUTES_UPDATES = "Regroupe les mises à jour des attributs des utilisateurs envoyées à Batch"
 
 
 class Feature(PcObject, Model, DeactivableMixin):
@@ -69,6 +70,7 @@ FEATURES_DISABLED_BY_DEFAULT = (
     FeatureToggle.ENABLE_ACTIVATION_CODES,
     FeatureToggle.USE_NEW_BATCH_INDEX_OFFERS_BEHAVIOUR,
     FeatureToggle.ENABLE_NATIVE_ID_CHECK_VERSION,
+    FeatureToggle.DEBOUNCE_PUSH_USER_ATTRIBUTES_UPDATES,
 )
 
 
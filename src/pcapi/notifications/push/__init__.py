@@ -9,9 +9,9 @@ def update_user_attributes(user_id: int, attribute_values: dict) -> None:
     backend().update_user_attributes(user_id, attribute_values)
 
 
-def update_users_attributes(users_data: list[UserUpdateData]) -> None:
+def update_users_attributes(users_data: list[UserUpdateData]) -> bool:
     backend = import_string(settings.PUSH_NOTIFICATION_BACKEND)
-    backend().update_users_attributes(users_data)
+    return backend().update_users_attributes(users_data)
 
 
 def send_transactional_notification(notification_data: TransactionalNotificationData) -> None:
@@ -42,14 +42,16 @@ class BatchBackend:
         make_post_request(BatchAPI.ANDROID)
         make_post_request(BatchAPI.IOS)
 
-    def update_users_attributes(self, users_data: list[UserUpdateData]) -> None:
+    def update_users_attributes(self, users_data: list[UserUpdateData]) -> bool:
+        """Return whether the attributes have been updated on all platforms."""
+
         def payload_template(user: UserUpdateData) -> dict:
             return {
                 "id": user.user_id,
                 "update": {"overwrite": False, "values": user.attributes},
             }
 
-        def make_post_request(api: BatchAPI) -> None:
+        def make_post_request(api: BatchAPI) -> bool:
             try:
                 response = requests.post(
                     f"{settings.BATCH_API_URL}/1.0/{api.value}/data/users/",
@@ -58,7 +60,7 @@ class BatchBackend:
                 )
             except Exception as exc:  # pylint: disable=broad-except
                 logger.exception("Error with Batch Custom Data API trying to update attributes of users: %s", exc)
-                return
+                return False
 
             if not response.ok:
                 logger.error(
@@ -66,9 +68,13 @@ class BatchBackend:
                     response.status_code,
                     response.content,
                 )
+                return False
+            return True
 
-        make_post_request(BatchAPI.ANDROID)
-        make_post_request(BatchAPI.IOS)
+        # Both requests are sent, even if the first one fails.
+        android_updated = make_post_request(BatchAPI.ANDROID)
+        ios_updated = make_post_request(BatchAPI.IOS)
+        return android_updated and ios_updated
 
     def send_transactional_notification(self, notification_data: TransactionalNotificationData) -> None:
         def make_post_request(api: BatchAPI) -> None:
@@ -15,12 +15,13 @@ class LoggerBackend:
             attribute_values,
         )
 
-    def update_users_attributes(self, users_data: list[UserUpdateData]) -> None:
+    def update_users_attributes(self, users_data: list[UserUpdateData]) -> bool:
         logger.info(
             "A request to update users attributes would be sent for %d users: %s",
             len(users_data),
             [user.user_id for user in users_data],
         )
+        return True
 
     def send_transactional_notification(self, notification_data: TransactionalNotificationData) -> None:
         logger.info(
@@ -9,9 +9,10 @@ class TestingBackend(LoggerBackend):
         super().update_user_attributes(user_id, attribute_values)
         testing.requests.append({"user_id": user_id, "attribute_values": attribute_values})
 
-    def update_users_attributes(self, users_data: list[UserUpdateData]) -> None:
-        super().update_users_attributes(users_data)
+    def update_users_attributes(self, users_data: list[UserUpdateData]) -> bool:
+        updated = super().update_users_attributes(users_data)
         testing.requests.append(users_data)
+        return updated
 
     def send_transactional_notification(self, notification_data: TransactionalNotificationData) -> None:
         super().send_transactional_notification(notification_data)
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from datetime import datetime
+from decimal import Decimal
 from typing import Optional
 
 from pcapi.core.users.models import User
@@ -18,15 +19,48 @@ def get_user_attributes(user: User) -> dict:
     from pcapi.core.users.api import get_domains_credit
 
     credit = get_domains_credit(user)
+    return _format_user_attributes(user, credit.all.remaining if credit else None, user.deposit_expiration_date)
+
+
+def get_users_attributes(users: list[User]) -> list[UserUpdateData]:
+    """Return the same attributes as `get_user_attributes()` and
+    `get_user_booking_attributes()` for all given users, with a few
+    queries whatever their number.
+    """
+    from pcapi.core.users.api import get_remaining_credit
+    from pcapi.core.users.repository import get_bookings_stats_by_user_id
+    from pcapi.core.users.repository import get_deposits_by_user_id
+
+    user_ids = [user.id for user in users]
+    deposits = get_deposits_by_user_id(user_ids)
+    bookings_stats = get_bookings_stats_by_user_id(user_ids)
+
+    users_data = []
+    for user in users:
+        deposit = deposits.get(user.id)
+        stats = bookings_stats.get(user.id)
+        remaining_credit = get_remaining_credit(deposit, stats.not_cancelled_bookings_total if stats else Decimal("0"))
+        attributes = _format_user_attributes(user, remaining_credit, deposit.expirationDate if deposit else None)
+        attributes["date(u.last_booking_date)"] = format_booking_date(stats.last_booking_date if stats else None)
+        # A Batch tag can't be an empty list, otherwise the API returns an error
+        if stats and stats.booking_categories:
+            attributes["ut.booking_categories"] = stats.booking_categories
+        users_data.append(UserUpdateData(user_id=str(user.id), attributes=attributes))
+    return users_data
+
+
+def _format_user_attributes(
+    user: User, remaining_credit: Optional[Decimal], deposit_expiration_date: Optional[datetime]
+) -> dict:
     return {
-        "u.credit": int(credit.all.remaining * 100) if credit else 0,
+        "u.credit": int(remaining_credit * 100) if remaining_credit is not None else 0,
         "date(u.date_of_birth)": user.dateOfBirth.strftime(BATCH_DATETIME_FORMAT) if user.dateOfBirth else None,
         "u.postal_code": user.postalCode,
         "date(u.date_created)": user.dateCreated.strftime(BATCH_DATETIME_FORMAT),
         "u.marketing_push_subscription": user.get_notification_subscriptions().marketing_push,
         "u.is_beneficiary": user.isBeneficiary,
-        "date(u.deposit_expiration_date)": user.deposit_expiration_date.strftime(BATCH_DATETIME_FORMAT)
-        if user.deposit_expiration_date
+        "date(u.deposit_expiration_date)": deposit_expiration_date.strftime(BATCH_DATETIME_FORMAT)
+        if deposit_expiration_date
         else None,
     }
 
@@ -1,11 +1,36 @@
+import os
+import threading
+import time
+from typing import Optional
+
+from flask import current_app
 from flask import has_request_context
 from flask import request
+from sqlalchemy.event import listens_for
+from sqlalchemy.orm import Session
+from sqlalchemy.orm import object_session
 
+from pcapi import settings
+from pcapi.connectors import redis
 from pcapi.models.api_errors import ResourceNotFoundError
 from pcapi.models.feature import Feature
 from pcapi.models.feature import FeatureToggle
 
 
+# Process-wide cache of all features, so that crons, workers and
+# provider synchronizations do not query the database each time they
+# check a feature. It is refreshed every `FEATURES_CACHE_TTL` seconds
+# and invalidated when an update of a feature is committed (in this
+# process through the SQLAlchemy events below, in long-lived processes
+# that listen to invalidations through Redis pub/sub).
+_cache_lock = threading.Lock()
+_cached_features: Optional[dict[str, bool]] = None
+_cached_features_expire_at = 0.0
+_invalidation_listener_enabled = False
+_invalidation_listener_pid: Optional[int] = None
+cache_stats = {"hits": 0, "misses": 0}
+
+
 def find_all():
     return Feature.query.all()
 
@@ -22,9 +47,90 @@ def is_active(feature_toggle: FeatureToggle) -> bool:
         if cached_value is not None:
             return cached_value
 
-    value = Feature.query.filter_by(name=feature_toggle.name).one().isActive
+    value = _get_cached_features().get(feature_toggle.name)
+    if value is None:
+        value = Feature.query.filter_by(name=feature_toggle.name).one().isActive
 
     if has_request_context():
         request._cached_features[feature_toggle.name] = value
 
     return value
+
+
+def _get_cached_features() -> dict[str, bool]:
+    global _cached_features, _cached_features_expire_at  # pylint: disable=global-statement
+
+    if settings.FEATURES_CACHE_TTL <= 0:
+        return {}
+
+    features = _cached_features
+    if features is not None and time.monotonic() < _cached_features_expire_at:
+        cache_stats["hits"] += 1
+        return features
+
+    with _cache_lock:
+        cache_stats["misses"] += 1
+        _listen_to_invalidations()
+        features = dict(Feature.query.with_entities(Feature.name, Feature.isActive).all())
+        _cached_features = features
+        _cached_features_expire_at = time.monotonic() + settings.FEATURES_CACHE_TTL
+    return features
+
+
+def enable_invalidation_listener() -> None:
+    """Make the process listen to updates of features made by other
+    processes, through Redis pub/sub.
+
+    Only long-lived processes (API, clocks) should call it: RQ runs each
+    job in a new forked process, which would otherwise open its own
+    Redis connection and listening thread for a single job.
+    """
+    global _invalidation_listener_enabled  # pylint: disable=global-statement
+
+    _invalidation_listener_enabled = True
+
+
+def _listen_to_invalidations() -> None:
+    global _invalidation_listener_pid  # pylint: disable=global-statement
+
+    if not settings.FEATURES_CACHE_REDIS_INVALIDATION or not _invalidation_listener_enabled:
+        return
+    # Threads do not survive a fork (e.g. gunicorn workers), hence the
+    # check on the pid rather than on a simple boolean.
+    if _invalidation_listener_pid == os.getpid():
+        return
+    _invalidation_listener_pid = os.getpid()
+    redis.subscribe_to_features_invalidation(invalidate_cache)
+
+
+def invalidate_cache() -> None:
+    global _cached_features  # pylint: disable=global-statement
+
+    _cached_features = None
+    if has_request_context() and hasattr(request, "_cached_features"):
+        request._cached_features = {}
+
+
+def get_cache_stats() -> dict[str, int]:
+    return dict(cache_stats)
+
+
+# Updates are flushed before being committed: invalidating the cache
+# right away would let a concurrent refresh load the old values again.
+@listens_for(Feature, "after_update")
+def _record_feature_update(mapper, connection, target):  # pylint: disable=unused-argument
+    object_session(target).info["features_updated"] = True
+
+
+@listens_for(Session, "after_commit")
+def _invalidate_cache_after_commit(session):
+    if not session.info.pop("features_updated", False):
+        return
+    invalidate_cache()
+    if settings.FEATURES_CACHE_REDIS_INVALIDATION:
+        redis.publish_features_invalidation(client=current_app.redis_client)
+
+
+@listens_for(Session, "after_rollback")
+def _forget_features_update_after_rollback(session):
+    session.info.pop("features_updated", None)
@@ -3,10 +3,13 @@ from datetime import datetime
 from sqlalchemy import func
 from sqlalchemy.orm import aliased
 from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import selectinload
 
 from pcapi.models import Booking
 from pcapi.models import Offer
+from pcapi.models import Product
 from pcapi.models import Stock
+from pcapi.models import Venue
 
 
 def _build_bookings_quantity_subquery():
@@ -56,6 +59,23 @@ def get_offers_by_ids(offer_ids: list[int]) -> list[Offer]:
     return Offer.query.filter(Offer.id.in_(offer_ids)).options(joinedload("stocks")).all()
 
 
+def get_offers_for_indexing(offer_ids: list[int]) -> list[Offer]:
+    # Load upfront everything that is used to check whether offers are
+    # bookable and to build their Algolia objects, so that indexing a
+    # chunk of offers does not issue lazy-loading queries per offer.
+    # Collections are loaded by separate queries: joining them all would
+    # return as many rows per offer as the product of their sizes.
+    return (
+        Offer.query.filter(Offer.id.in_(offer_ids))
+        .options(selectinload(Offer.stocks))
+        .options(joinedload(Offer.venue).joinedload(Venue.managingOfferer))
+        .options(selectinload(Offer.criteria))
+        .options(selectinload(Offer.mediations))
+        .options(joinedload(Offer.product).load_only(Product.id, Product.thumbCount))
+        .all()
+    )
+
+
 def get_paginated_active_offer_ids(limit: int, page: int) -> list[tuple]:
     return (
         Offer.query.with_entities(Offer.id)
@@ -18,6 +18,12 @@ from pcapi.models.db import db
 from pcapi.models.payment_status import TransactionStatus
 
 
+def find_by_ids(payment_ids: list[int]) -> list[Payment]:
+    if not payment_ids:
+        return []
+    return Payment.query.filter(Payment.id.in_(payment_ids)).order_by(Payment.id).all()
+
+
 def find_error_payments() -> list[Payment]:
     query = render_template("sql/find_payment_ids_with_last_status.sql", status="ERROR")
     error_payment_ids = db.session.query(PaymentStatus.paymentId).from_statement(text(query)).all()
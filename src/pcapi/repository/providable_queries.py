@@ -1,64 +1,139 @@
+from collections import defaultdict
 import datetime
+from typing import Iterable
 from typing import Optional
 
-from pcapi import models
+from sqlalchemy import Column
+from sqlalchemy import inspect
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import ColumnProperty
+from sqlalchemy.orm import Mapper
+
 from pcapi.models.db import Model
 from pcapi.models.db import db
 
 
 def insert_chunk(chunk_to_insert: dict):
-    db.session.bulk_save_objects(chunk_to_insert.values(), return_defaults=False)
+    groups = _group_by_model_and_columns(chunk_to_insert.values(), only_set_attributes=True)
+    # Insert referenced tables first, so that foreign keys to rows that
+    # already existed can be fixed before inserting referencing rows.
+    sorted_tables = Model.metadata.sorted_tables
+    replaced_ids = defaultdict(dict)
+    for (model, columns), objects_and_values in sorted(
+        groups.items(), key=lambda group: sorted_tables.index(group[0][0].__table__)
+    ):
+        table = model.__table__
+        for pc_object, values in objects_and_values:
+            _replace_foreign_keys(pc_object, values, replaced_ids)
+        statement = insert(table).values([values for _pc_object, values in objects_and_values])
+        # Another synchronization may have created some of these
+        # objects in the meantime: update them instead of failing.
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.idAtProviders],
+            set_={column: statement.excluded[column] for column in columns if column != "id"},
+        ).returning(table.c.id, table.c.idAtProviders)
+        ids = {id_at_providers: id_ for id_, id_at_providers in db.session.execute(statement)}
+        for pc_object, _values in objects_and_values:
+            if pc_object.idAtProviders not in ids:
+                continue
+            # On conflict, the existing row keeps its id, which differs
+            # from the id that may have been reserved from the sequence.
+            id_ = ids[pc_object.idAtProviders]
+            if pc_object.id is not None and pc_object.id != id_:
+                replaced_ids[table][pc_object.id] = id_
+            pc_object.id = id_
     db.session.commit()
 
 
 def update_chunk(chunk_to_update: dict):
-    models_in_chunk = set(_extract_model_name_from_chunk_key(key) for key in chunk_to_update.keys())
-
-    for model_in_chunk in models_in_chunk:
-        matching_tuples_in_chunk = _filter_matching_pc_object_in_chunk(model_in_chunk, chunk_to_update)
-        values_to_update_in_chunk = _extract_dict_values_from_chunk(matching_tuples_in_chunk)
-        model_to_update = getattr(models, model_in_chunk)
-
-        db.session.bulk_update_mappings(model_to_update, values_to_update_in_chunk)
+    _load_unloaded_attributes(chunk_to_update.values())
+    for (model, columns), objects_and_values in _group_by_model_and_columns(
+        chunk_to_update.values(), only_set_attributes=False
+    ).items():
+        table = model.__table__
+        # A multi-row "upsert" on the primary key is a single statement,
+        # where `bulk_update_mappings()` sends one UPDATE per object.
+        statement = insert(table).values([values for _pc_object, values in objects_and_values])
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.id],
+            set_={column: statement.excluded[column] for column in columns if column != "id"},
+        )
+        db.session.execute(statement)
+        for pc_object, _values in objects_and_values:
+            # Changes have been written above, the session must not
+            # flush them a second time on commit.
+            if inspect(pc_object).persistent:
+                db.session.expire(pc_object)
     db.session.commit()
 
 
-def _filter_matching_pc_object_in_chunk(model_in_chunk: Model, chunk_to_update: dict) -> list[Model]:
-    return list(
-        filter(lambda item: _extract_model_name_from_chunk_key(item[0]) == model_in_chunk, chunk_to_update.items())
-    )
-
-
-def _extract_dict_values_from_chunk(matching_tuples_in_chunk: list[Model]) -> list[dict]:
-    return list(dictify_pc_object(pc_object_item) for pc_object_key, pc_object_item in matching_tuples_in_chunk)
+def _load_unloaded_attributes(pc_objects: Iterable[Model]) -> None:
+    """Load the columns of objects that have been expired (e.g. by the
+    commit of the previous chunk) with one query per model, rather than
+    one query per object when they are accessed.
+
+    Loading an object that is already in the session only populates its
+    unloaded attributes: pending changes are kept.
+    """
+    ids_by_model = defaultdict(list)
+    for pc_object in pc_objects:
+        state = inspect(pc_object)
+        if not state.persistent:
+            continue
+        if any(attribute.key in state.unloaded for attribute, _column in _get_table_columns(state.mapper)):
+            ids_by_model[type(pc_object)].append(pc_object.id)
+    for model, ids in ids_by_model.items():
+        model.query.filter(model.id.in_(ids)).all()
+
+
+def _replace_foreign_keys(pc_object: Model, values: dict, replaced_ids: dict) -> None:
+    for foreign_key in type(pc_object).__table__.foreign_keys:
+        column = foreign_key.parent
+        replaced_id = replaced_ids[foreign_key.column.table].get(values.get(column.key))
+        if replaced_id is not None:
+            values[column.key] = replaced_id
+            setattr(pc_object, inspect(pc_object).mapper.get_property_by_column(column).key, replaced_id)
+
+
+def _group_by_model_and_columns(pc_objects: Iterable[Model], only_set_attributes: bool) -> dict:
+    # Rows of a multi-row INSERT must all have the same columns.
+    groups = defaultdict(list)
+    for pc_object in pc_objects:
+        values = _get_column_values(pc_object, only_set_attributes)
+        groups[(type(pc_object), tuple(values))].append((pc_object, values))
+    return groups
+
+
+def _get_table_columns(mapper: Mapper) -> Iterable[tuple[ColumnProperty, Column]]:
+    for attribute in mapper.column_attrs:
+        column = attribute.columns[0]
+        if isinstance(column, Column) and column.table is mapper.local_table:
+            yield attribute, column
+
+
+def _get_column_values(pc_object: Model, only_set_attributes: bool) -> dict:
+    state = inspect(pc_object)
+    values = {}
+    for attribute, column in _get_table_columns(state.mapper):
+        is_loaded = attribute.key in state.dict
+        if not is_loaded and (only_set_attributes or state.detached):
+            continue
+        values[column.key] = getattr(pc_object, attribute.key)
+    return values
 
 
 def get_existing_object(model_type: Model, id_at_providers: str) -> Optional[dict]:
     return model_type.query.filter_by(idAtProviders=id_at_providers).one_or_none()
 
 
+def get_existing_objects(model_type: Model, ids_at_providers: Iterable[str]) -> list[Model]:
+    ids_at_providers = set(ids_at_providers)
+    if not ids_at_providers:
+        return []
+    return model_type.query.filter(model_type.idAtProviders.in_(ids_at_providers)).all()
+
+
 def get_last_update_for_provider(provider_id: int, pc_obj: Model) -> datetime:
     if pc_obj.lastProviderId == provider_id:
         return pc_obj.dateModifiedAtLastProvider if pc_obj.dateModifiedAtLastProvider else None
     return None
-
-
-def dictify_pc_object(object_to_update: Model) -> dict:
-    dict_to_update = object_to_update.__dict__.copy()
-    if "_sa_instance_state" in dict_to_update:
-        del dict_to_update["_sa_instance_state"]
-    if "datePublished" in dict_to_update:
-        del dict_to_update["datePublished"]
-    if "venue" in dict_to_update:
-        del dict_to_update["venue"]
-    if "offer" in dict_to_update:
-        del dict_to_update["offer"]
-    if "stocks" in dict_to_update:
-        del dict_to_update["stocks"]
-    if "remainingQuantity" in dict_to_update:
-        del dict_to_update["remainingQuantity"]
-    return dict_to_update
-
-
-def _extract_model_name_from_chunk_key(chunk_key: str) -> str:
-    return chunk_key.split("|")[1]
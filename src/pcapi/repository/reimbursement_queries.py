@@ -1,6 +1,8 @@
 from collections import namedtuple
+from typing import Iterator
 
 from sqlalchemy import subquery
+from sqlalchemy.orm import Query
 from sqlalchemy.orm import aliased
 
 from pcapi.core.bookings.models import Booking
@@ -14,6 +16,17 @@ from pcapi.models.payment import Payment
 
 
 def find_all_offerer_payments(offerer_id: int) -> list[namedtuple]:
+    return _build_offerer_payments_query(offerer_id).all()
+
+
+def iterate_offerer_payments(offerer_id: int, batch_size: int = 1000) -> Iterator[namedtuple]:
+    """Like `find_all_offerer_payments()`, but payments are fetched by
+    batches through a server-side cursor.
+    """
+    return iter(_build_offerer_payments_query(offerer_id).yield_per(batch_size))
+
+
+def _build_offerer_payments_query(offerer_id: int) -> Query:
     payment_status_query = _build_payment_status_subquery()
 
     return (
@@ -45,7 +58,6 @@ def find_all_offerer_payments(offerer_id: int) -> list[namedtuple]:
             payment_status_query.c.status.label("status"),
             payment_status_query.c.detail.label("detail"),
         )
-        .all()
     )
 
 
@@ -1,10 +1,15 @@
 from functools import wraps
 import logging
+import time
+from typing import Optional
 
 from flask import _request_ctx_stack
 from flask_jwt_extended.utils import get_jwt_identity
 from flask_jwt_extended.view_decorators import jwt_required
 
+from pcapi import settings
+from pcapi.core.users.models import User
+from pcapi.core.users.utils import sanitize_email
 from pcapi.models.api_errors import ForbiddenError
 from pcapi.repository.user_queries import find_user_by_email
 from pcapi.routes.native.v1.blueprint import JWT_AUTH
@@ -13,6 +18,13 @@ from pcapi.serialization.spec_tree import add_security_scheme
 
 logger = logging.getLogger(__name__)
 
+# Process-wide cache of the ids of authenticated users, by JWT identity
+# (their e-mail), so that they are fetched by primary key rather than
+# by e-mail. The fetched user is always checked (e-mail and active
+# status), hence changes (e.g. suspension) are effective right away,
+# and the cache never has to be invalidated from other processes.
+_cached_user_ids: dict[str, tuple[int, float]] = {}
+
 
 def authenticated_user_required(route_function):  # type: ignore
     add_security_scheme(route_function, JWT_AUTH)
@@ -21,7 +33,7 @@ def authenticated_user_required(route_function):  # type: ignore
     @jwt_required
     def retrieve_authenticated_user(*args, **kwargs):  # type: ignore
         email = get_jwt_identity()
-        user = find_user_by_email(email)
+        user = _get_user_by_jwt_identity(email)
         if user is None or not user.isActive:
             logger.error("Authenticated user with email %s not found or inactive", email)
             raise ForbiddenError({"email": ["Utilisateur introuvable"]})
@@ -33,3 +45,22 @@ def authenticated_user_required(route_function):  # type: ignore
         return route_function(user, *args, **kwargs)
 
     return retrieve_authenticated_user
+
+
+def _get_user_by_jwt_identity(email: str) -> Optional[User]:
+    if settings.JWT_USER_IDS_CACHE_TTL <= 0:
+        return find_user_by_email(email)
+
+    cached = _cached_user_ids.get(email)
+    if cached and time.monotonic() < cached[1]:
+        user = User.query.get(cached[0])
+        if user and user.email.lower() == sanitize_email(email):
+            return user
+        _cached_user_ids.pop(email, None)
+
+    user = find_user_by_email(email)
+    if user:
+        if len(_cached_user_ids) >= settings.JWT_USER_IDS_CACHE_MAX_SIZE:
+            _cached_user_ids.clear()
+        _cached_user_ids[email] = (user.id, time.monotonic() + settings.JWT_USER_IDS_CACHE_TTL)
+    return user
@@ -1,5 +1,7 @@
+from flask import Response
 from flask import jsonify
 from flask import request
+from flask import stream_with_context
 from flask_login import current_user
 from flask_login import login_required
 
@@ -10,11 +12,17 @@ import pcapi.core.bookings.validation as bookings_validation
 from pcapi.domain.users import check_is_authorized_to_access_bookings_recap
 from pcapi.flask_app import private_api
 from pcapi.flask_app import public_api
+from pcapi.models import ApiErrors
 from pcapi.models import EventType
 from pcapi.models.offer_type import ProductType
 from pcapi.routes.serialization import serialize
 from pcapi.routes.serialization import serialize_booking
+from pcapi.routes.serialization.bookings_recap_serialize import deserialize_bookings_recap_cursor
+from pcapi.routes.serialization.bookings_recap_serialize import generate_bookings_recap_csv
+from pcapi.routes.serialization.bookings_recap_serialize import generate_bookings_recap_json
+from pcapi.routes.serialization.bookings_recap_serialize import serialize_bookings_recap_page
 from pcapi.routes.serialization.bookings_recap_serialize import serialize_bookings_recap_paginated
+from pcapi.utils.csv_export import stream_csv_response
 from pcapi.utils.human_ids import dehumanize
 from pcapi.utils.human_ids import humanize
 from pcapi.utils.rest import check_user_has_access_to_offerer
@@ -68,6 +76,10 @@ def patch_booking_by_token(token: str):
 @private_api.route("/bookings/pro", methods=["GET"])
 @login_required
 def get_all_bookings():
+    cursor = request.args.get("cursor")
+    if cursor is not None:
+        return _get_bookings_page(cursor)
+
     page = request.args.get("page", 1)
     check_page_format_is_number(page)
 
@@ -82,6 +94,47 @@ def get_all_bookings():
     return serialize_bookings_recap_paginated(bookings_recap_paginated), 200
 
 
+def _get_bookings_page(cursor: str):
+    # An empty cursor requests the first page.
+    bookings_recap_cursor = None
+    if cursor:
+        try:
+            bookings_recap_cursor = deserialize_bookings_recap_cursor(cursor)
+        except ValueError:
+            api_errors = ApiErrors()
+            api_errors.add_error("global", f"L'argument 'cursor' {cursor} n'est pas valide")
+            raise api_errors
+
+    check_is_authorized_to_access_bookings_recap(current_user)
+
+    bookings_recap_page = booking_repository.find_by_pro_user_id_with_cursor(
+        user_id=current_user.id, cursor=bookings_recap_cursor
+    )
+
+    return serialize_bookings_recap_page(bookings_recap_page), 200
+
+
+# @debt api-migration
+@private_api.route("/bookings/pro/csv", methods=["GET"])
+@login_required
+def get_all_bookings_csv():
+    check_is_authorized_to_access_bookings_recap(current_user)
+
+    bookings_recap = booking_repository.iterate_by_pro_user_id(user_id=current_user.id)
+    return stream_csv_response(generate_bookings_recap_csv(bookings_recap), "reservations_pass_culture.csv")
+
+
+# @debt api-migration
+@private_api.route("/bookings/pro/json", methods=["GET"])
+@login_required
+def get_all_bookings_json():
+    check_is_authorized_to_access_bookings_recap(current_user)
+
+    bookings_recap = booking_repository.iterate_by_pro_user_id(user_id=current_user.id)
+
+    return Response(stream_with_context(generate_bookings_recap_json(bookings_recap)), mimetype="application/json")
+
+
 # @debt api-migration
 @public_api.route("/v2/bookings/token/<token>", methods=["GET"])
 @login_or_api_key_required
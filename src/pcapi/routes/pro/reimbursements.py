@@ -1,4 +1,4 @@
-from itertools import chain
+import itertools
 
 from flask_login import current_user
 from flask_login import login_required
@@ -6,8 +6,9 @@ from flask_login import login_required
 from pcapi.core.offerers.models import Offerer
 from pcapi.flask_app import private_api
 from pcapi.repository.user_offerer_queries import filter_query_where_user_is_user_offerer_and_is_validated
-from pcapi.routes.serialization.reimbursement_csv_serialize import find_all_offerer_reimbursement_details
-from pcapi.routes.serialization.reimbursement_csv_serialize import generate_reimbursement_details_csv
+from pcapi.routes.serialization.reimbursement_csv_serialize import generate_reimbursement_details_csv_lines
+from pcapi.routes.serialization.reimbursement_csv_serialize import iterate_offerer_reimbursement_details
+from pcapi.utils.csv_export import stream_csv_response
 
 
 # @debt api-migration
@@ -16,19 +17,14 @@ from pcapi.routes.serialization.reimbursement_csv_serialize import generate_reim
 def get_reimbursements_csv():
     query = filter_query_where_user_is_user_offerer_and_is_validated(Offerer.query, current_user)
 
-    all_validated_offerers_for_the_current_user = query.all()
+    validated_offerer_ids = [offerer_id for offerer_id, in query.with_entities(Offerer.id).all()]
 
-    reimbursement_details = chain(
-        *[find_all_offerer_reimbursement_details(offerer.id) for offerer in all_validated_offerers_for_the_current_user]
+    # Payments of each offerer are read through a server-side cursor
+    # while the CSV is sent, so that it is never fully held in memory.
+    reimbursement_details = itertools.chain.from_iterable(
+        iterate_offerer_reimbursement_details(offerer_id) for offerer_id in validated_offerer_ids
     )
 
-    reimbursement_details_csv = generate_reimbursement_details_csv(reimbursement_details)
-
-    return (
-        reimbursement_details_csv.encode("utf-8-sig"),
-        200,
-        {
-            "Content-type": "text/csv; charset=utf-8;",
-            "Content-Disposition": "attachment; filename=remboursements_pass_culture.csv",
-        },
+    return stream_csv_response(
+        generate_reimbursement_details_csv_lines(reimbursement_details), "remboursements_pass_culture.csv"
     )
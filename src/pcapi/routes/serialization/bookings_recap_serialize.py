@@ -1,5 +1,10 @@
 from datetime import datetime
+import itertools
 from typing import Any
+from typing import Iterable
+from typing import Iterator
+
+from flask import json
 
 from pcapi.domain.booking_recap.booking_recap import BookBookingRecap
 from pcapi.domain.booking_recap.booking_recap import BookingRecap
@@ -10,11 +15,30 @@ from pcapi.domain.booking_recap.booking_recap_history import BookingRecapConfirm
 from pcapi.domain.booking_recap.booking_recap_history import BookingRecapHistory
 from pcapi.domain.booking_recap.booking_recap_history import BookingRecapReimbursedHistory
 from pcapi.domain.booking_recap.booking_recap_history import BookingRecapValidatedHistory
+from pcapi.domain.booking_recap.bookings_recap_paginated import BookingsRecapCursor
+from pcapi.domain.booking_recap.bookings_recap_paginated import BookingsRecapPage
 from pcapi.domain.booking_recap.bookings_recap_paginated import BookingsRecapPaginated
+from pcapi.utils.csv_export import generate_csv_lines
 from pcapi.utils.date import format_into_timezoned_date
+from pcapi.utils.human_ids import NonDehumanizableId
+from pcapi.utils.human_ids import dehumanize
 from pcapi.utils.human_ids import humanize
 
 
+BOOKINGS_RECAP_CSV_HEADER = [
+    "Lieu",
+    "Nom de l'offre",
+    "Date de l'évènement",
+    "ISBN",
+    "Nom et prénom du bénéficiaire",
+    "Email du bénéficiaire",
+    "Date et heure de réservation",
+    "Contremarque",
+    "Prix de la réservation",
+    "Statut de la contremarque",
+]
+
+
 def serialize_bookings_recap_paginated(bookings_recap_paginated: BookingsRecapPaginated) -> dict[str, Any]:
     return {
         "bookings_recap": [
@@ -26,6 +50,66 @@ def serialize_bookings_recap_paginated(bookings_recap_paginated: BookingsRecapPa
     }
 
 
+def serialize_bookings_recap_page(bookings_recap_page: BookingsRecapPage) -> dict[str, Any]:
+    next_cursor = bookings_recap_page.next_cursor
+    return {
+        "bookings_recap": [
+            _serialize_booking_recap(booking_recap) for booking_recap in bookings_recap_page.bookings_recap
+        ],
+        "next_cursor": serialize_bookings_recap_cursor(next_cursor) if next_cursor else None,
+    }
+
+
+def serialize_bookings_recap_cursor(cursor: BookingsRecapCursor) -> str:
+    return f"{cursor.booking_date.isoformat()}_{humanize(cursor.booking_id)}"
+
+
+def deserialize_bookings_recap_cursor(cursor: str) -> BookingsRecapCursor:
+    """Raise ValueError if `cursor` has not been generated by
+    `serialize_bookings_recap_cursor()`.
+    """
+    booking_date, humanized_booking_id = cursor.split("_")
+    try:
+        booking_id = dehumanize(humanized_booking_id)
+    except NonDehumanizableId as exc:
+        raise ValueError(f"Invalid booking id: {humanized_booking_id}") from exc
+    return BookingsRecapCursor(booking_date=datetime.fromisoformat(booking_date), booking_id=booking_id)
+
+
+def generate_bookings_recap_json(bookings_recap: Iterable[BookingRecap]) -> Iterator[str]:
+    """Yield a JSON list of the bookings recap, piece by piece."""
+    separator = "["
+    for booking_recap in bookings_recap:
+        yield separator + json.dumps(_serialize_booking_recap(booking_recap))
+        separator = ","
+    yield "[]" if separator == "[" else "]"
+
+
+def generate_bookings_recap_csv(bookings_recap: Iterable[BookingRecap]) -> Iterator[str]:
+    """Yield the CSV export of the bookings recap, line by line."""
+    rows = itertools.chain([BOOKINGS_RECAP_CSV_HEADER], map(_booking_recap_as_csv_row, bookings_recap))
+    return generate_csv_lines(rows)
+
+
+def _booking_recap_as_csv_row(booking_recap: BookingRecap) -> list:
+    return [
+        booking_recap.venue_name,
+        booking_recap.offer_name,
+        (
+            format_into_timezoned_date(booking_recap.event_beginning_datetime)
+            if isinstance(booking_recap, EventBookingRecap)
+            else ""
+        ),
+        booking_recap.offer_isbn if isinstance(booking_recap, BookBookingRecap) else "",
+        f"{booking_recap.beneficiary_lastname} {booking_recap.beneficiary_firstname}",
+        booking_recap.beneficiary_email,
+        format_into_timezoned_date(booking_recap.booking_date),
+        booking_recap.booking_token,
+        booking_recap.booking_amount,
+        booking_recap.booking_status.value,
+    ]
+
+
 def _serialize_booking_status_info(booking_status: BookingRecapStatus, booking_status_date: datetime) -> dict[str, str]:
 
     serialized_booking_status_date = format_into_timezoned_date(booking_status_date) if booking_status_date else None
@@ -1,9 +1,12 @@
 from collections import namedtuple
-import csv
-from io import StringIO
+import itertools
+from typing import Iterable
+from typing import Iterator
 
 from pcapi.models.payment_status import TransactionStatus
 from pcapi.repository.reimbursement_queries import find_all_offerer_payments
+from pcapi.repository.reimbursement_queries import iterate_offerer_payments
+from pcapi.utils.csv_export import generate_csv_lines
 from pcapi.utils.date import MONTHS_IN_FRENCH
 
 
@@ -85,13 +88,16 @@ class ReimbursementDetails:
         ]
 
 
-def generate_reimbursement_details_csv(reimbursement_details: list[ReimbursementDetails]):
-    output = StringIO()
-    csv_lines = [reimbursement_detail.as_csv_row() for reimbursement_detail in reimbursement_details]
-    writer = csv.writer(output, dialect=csv.excel, delimiter=";", quoting=csv.QUOTE_NONNUMERIC)
-    writer.writerow(ReimbursementDetails.CSV_HEADER)
-    writer.writerows(csv_lines)
-    return output.getvalue()
+def generate_reimbursement_details_csv(reimbursement_details: Iterable[ReimbursementDetails]) -> str:
+    return "".join(generate_reimbursement_details_csv_lines(reimbursement_details))
+
+
+def generate_reimbursement_details_csv_lines(reimbursement_details: Iterable[ReimbursementDetails]) -> Iterator[str]:
+    """Yield the same CSV as `generate_reimbursement_details_csv()`,
+    line by line.
+    """
+    csv_lines = (reimbursement_detail.as_csv_row() for reimbursement_detail in reimbursement_details)
+    return generate_csv_lines(itertools.chain([ReimbursementDetails.CSV_HEADER], csv_lines))
 
 
 def find_all_offerer_reimbursement_details(offerer_id: int) -> list[ReimbursementDetails]:
@@ -101,6 +107,11 @@ def find_all_offerer_reimbursement_details(offerer_id: int) -> list[Reimbursemen
     return reimbursement_details
 
 
+def iterate_offerer_reimbursement_details(offerer_id: int) -> Iterator[ReimbursementDetails]:
+    for offerer_payment in iterate_offerer_payments(offerer_id):
+        yield ReimbursementDetails(offerer_payment)
+
+
 def _get_reimbursement_current_status_in_details(current_status: str, current_status_details: str):
     human_friendly_status = ReimbursementDetails.TRANSACTION_STATUSES_DETAILS.get(current_status)
 
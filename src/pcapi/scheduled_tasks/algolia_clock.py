@@ -61,6 +61,7 @@ def index_offers_in_error_in_algolia_by_offer(app):
 def main():
     from pcapi.flask_app import app
 
+    feature_queries.enable_invalidation_listener()
     scheduler = BlockingScheduler()
     utils.activate_sentry(scheduler)
 
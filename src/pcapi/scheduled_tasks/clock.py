@@ -2,6 +2,7 @@
     isort:skip_file
 """
 from datetime import date
+from datetime import datetime
 from datetime import timedelta
 import logging
 
@@ -11,6 +12,7 @@ from flask import Flask
 # FIXME (xordoquy, 2021-03-01): this is to prevent circular imports when importing pcapi.core.users.api
 import pcapi.models  # pylint: disable=unused-import
 from pcapi import settings
+from pcapi.connectors import redis
 from pcapi.core.logging import install_logging
 from pcapi.core.offers.repository import check_stock_consistency
 from pcapi.core.offers.repository import find_tomorrow_event_stock_ids
@@ -22,6 +24,7 @@ from pcapi.local_providers.provider_api import provider_api_stocks
 from pcapi.local_providers.provider_manager import synchronize_venue_providers_for_provider
 from pcapi.models.beneficiary_import import BeneficiaryImportSources
 from pcapi.models.feature import FeatureToggle
+from pcapi.repository import feature_queries
 from pcapi.repository.user_queries import find_most_recent_beneficiary_creation_date_for_source
 from pcapi.scheduled_tasks import utils
 from pcapi.scheduled_tasks.decorators import cron_context
@@ -32,6 +35,7 @@ from pcapi.scripts.booking.handle_expired_bookings import handle_expired_booking
 from pcapi.scripts.booking.notify_soon_to_be_expired_bookings import notify_soon_to_be_expired_bookings
 from pcapi.scripts.update_booking_used import update_booking_used_after_stock_occurrence
 from pcapi.workers.push_notification_job import send_tomorrow_stock_notification
+from pcapi.workers.push_notification_job import update_debounced_users_attributes
 
 
 install_logging()
@@ -120,9 +124,14 @@ def pc_clean_expired_tokens(app: Flask) -> None:
 @log_cron
 @cron_context
 def pc_check_stock_quantity_consistency(app: Flask) -> None:
-    inconsistent_stocks = check_stock_consistency()
+    # Only check the stocks that changed since the previous check. All
+    # stocks are checked if its date is unknown (i.e. on the first run).
+    checked_at = datetime.utcnow()
+    last_check = redis.get_stock_consistency_last_check(app.redis_client)
+    inconsistent_stocks = check_stock_consistency(modified_since=last_check)
     if inconsistent_stocks:
         logger.error("Found inconsistent stocks: %s", ", ".join([str(stock_id) for stock_id in inconsistent_stocks]))
+    redis.set_stock_consistency_last_check(app.redis_client, checked_at)
 
 
 @log_cron
@@ -133,9 +142,16 @@ def pc_send_tomorrow_events_notifications(app: Flask) -> None:
         send_tomorrow_stock_notification.delay(stock_id)
 
 
+@log_cron
+@cron_context
+def pc_update_debounced_users_attributes(app: Flask) -> None:
+    update_debounced_users_attributes(app.redis_client)
+
+
 def main() -> None:
     from pcapi.flask_app import app
 
+    feature_queries.enable_invalidation_listener()
     scheduler = BlockingScheduler()
     utils.activate_sentry(scheduler)
 
@@ -176,6 +192,8 @@ def main() -> None:
 
     scheduler.add_job(pc_send_tomorrow_events_notifications, "cron", [app], day="*", hour="16")
 
+    scheduler.add_job(pc_update_debounced_users_attributes, "cron", [app], minute="*")
+
     scheduler.start()
 
 
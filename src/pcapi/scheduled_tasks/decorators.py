@@ -2,6 +2,7 @@ from functools import wraps
 import logging
 import time
 
+from pcapi.core import sql_stats
 from pcapi.models.feature import FeatureToggle
 from pcapi.repository import feature_queries
 from pcapi.scheduled_tasks.logger import CronStatus
@@ -41,11 +42,16 @@ def log_cron(func):
         start_time = time.time()
         logger.info(build_cron_log_message(name=func.__name__, status=CronStatus.STARTED))
 
-        result = func(*args, **kwargs)
+        with sql_stats.record_queries() as stats:
+            result = func(*args, **kwargs)
 
         end_time = time.time()
         duration = end_time - start_time
-        logger.info(build_cron_log_message(name=func.__name__, status=CronStatus.ENDED, duration=duration))
+        logger.info(
+            build_cron_log_message(name=func.__name__, status=CronStatus.ENDED, duration=duration),
+            extra=stats.as_log_extra(),
+        )
+        sql_stats.warn_if_thresholds_exceeded(stats, f"cron {func.__name__}")
         return result
 
     return wrapper
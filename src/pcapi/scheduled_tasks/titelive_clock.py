@@ -10,6 +10,7 @@ from pcapi.core.providers.repository import get_provider_by_local_class
 from pcapi.local_providers.provider_manager import synchronize_data_for_provider
 from pcapi.local_providers.venue_provider_worker import update_venues_for_specific_provider
 from pcapi.models.feature import FeatureToggle
+from pcapi.repository import feature_queries
 from pcapi.scheduled_tasks import utils
 from pcapi.scheduled_tasks.decorators import cron_context
 from pcapi.scheduled_tasks.decorators import cron_require_feature
@@ -52,6 +53,7 @@ def synchronize_titelive_stocks(app):
 def main():
     from pcapi.flask_app import app
 
+    feature_queries.enable_invalidation_listener()
     scheduler = BlockingScheduler()
     utils.activate_sentry(scheduler)
 
@@ -1,23 +1,25 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from datetime import timedelta
 import logging
 
+import flask
 from redis import Redis
 
 from pcapi import settings
 from pcapi.algolia.usecase.orchestrator import delete_expired_offers
 from pcapi.algolia.usecase.orchestrator import process_eligible_offers
-from pcapi.connectors.redis import RedisBucket
-from pcapi.connectors.redis import delete_offer_ids
+from pcapi.connectors.redis import count_offer_ids
 from pcapi.connectors.redis import delete_offer_ids_in_error
 from pcapi.connectors.redis import delete_venue_ids
 from pcapi.connectors.redis import delete_venue_provider_currently_in_sync
 from pcapi.connectors.redis import delete_venue_providers
-from pcapi.connectors.redis import get_offer_ids
 from pcapi.connectors.redis import get_offer_ids_in_error
 from pcapi.connectors.redis import get_venue_ids
 from pcapi.connectors.redis import get_venue_providers
+from pcapi.connectors.redis import move_legacy_offer_ids
 from pcapi.connectors.redis import pop_offer_ids
+from pcapi.connectors.redis import pop_offer_ids_duplicates_count
 from pcapi.repository import offer_queries
 from pcapi.utils.converter import from_tuple_to_int
 
@@ -27,14 +29,17 @@ logger = logging.getLogger(__name__)
 
 # FIXME (dbaty, 2021-04-28): remove when we're sure that the new
 # version (`batch_indexing_offers_in_algolia_by_offer` below) works as
-# intended. Also remove `get_offer_ids` and `delete_offer_ids`.
+# intended.
 def legacy_batch_indexing_offers_in_algolia_by_offer(client: Redis) -> None:
-    offer_ids = get_offer_ids(client=client)
+    _move_legacy_offer_ids(client)
+    # Offers must be popped before being processed: an offer that is
+    # enqueued again meanwhile is then kept in the queue, and will be
+    # reindexed by the next run.
+    offer_ids = pop_offer_ids(client=client)
 
     if len(offer_ids) > 0:
         logger.info("[ALGOLIA] processing %i offers...", len(offer_ids))
         process_eligible_offers(client=client, offer_ids=offer_ids, from_provider_update=False)
-        delete_offer_ids(client=client)
         logger.info("[ALGOLIA] %i offers processed!", len(offer_ids))
 
 
@@ -52,7 +57,51 @@ def batch_indexing_offers_in_algolia_by_offer(client: Redis, stop_only_when_empt
     If `stop_only_when_empty` is True (i.e. if called from the
     `process_offers` Flask command), we pop from the queue and stop
     only when the queue is empty.
+
+    If ALGOLIA_INDEXING_WORKERS_COUNT is greater than 1, as many
+    workers pop and process chunks concurrently, each in its own
+    thread (and thus with its own database session), so that database
+    queries of a worker overlap with Algolia requests of the others.
+    The number of concurrent Algolia requests is capped by
+    ALGOLIA_MAX_CONCURRENT_REQUESTS.
     """
+    _move_legacy_offer_ids(client)
+
+    logger.info(
+        "[ALGOLIA] starting to process offers queue",
+        extra={
+            "queue_depth": count_offer_ids(client=client),
+            "duplicates_since_last_run": pop_offer_ids_duplicates_count(client=client),
+        },
+    )
+
+    workers_count = settings.ALGOLIA_INDEXING_WORKERS_COUNT
+    if workers_count <= 1:
+        _pop_and_process_offers(client, stop_only_when_empty)
+        return
+
+    app = flask.current_app._get_current_object()
+    with ThreadPoolExecutor(max_workers=workers_count, thread_name_prefix="algolia-indexing") as executor:
+        futures = [
+            executor.submit(_pop_and_process_offers_in_app_context, app, client, stop_only_when_empty)
+            for _ in range(workers_count)
+        ]
+    for future in futures:
+        future.result()
+
+
+def _move_legacy_offer_ids(client: Redis) -> None:
+    legacy_offer_ids_count = move_legacy_offer_ids(client=client)
+    if legacy_offer_ids_count:
+        logger.info("[ALGOLIA] moved %i offers from the legacy queue", legacy_offer_ids_count)
+
+
+def _pop_and_process_offers_in_app_context(app: flask.Flask, client: Redis, stop_only_when_empty: bool) -> None:
+    with app.app_context():
+        _pop_and_process_offers(client, stop_only_when_empty)
+
+
+def _pop_and_process_offers(client: Redis, stop_only_when_empty: bool) -> None:
     while True:
         # We must pop and not get-and-delete. Otherwise two concurrent
         # cron jobs could delete the wrong offers from the queue:
@@ -78,9 +127,9 @@ def batch_indexing_offers_in_algolia_by_offer(client: Redis, stop_only_when_empt
                     "offer_ids": offer_ids,
                 },
             )
-        logger.info("[ALGOLIA] %i offers processed!", len(offer_ids))
+        left_to_process = count_offer_ids(client=client)
+        logger.info("[ALGOLIA] %i offers processed!", len(offer_ids), extra={"queue_depth": left_to_process})
 
-        left_to_process = client.llen(RedisBucket.REDIS_LIST_OFFER_IDS_NAME.value)
         if not stop_only_when_empty and left_to_process < settings.REDIS_OFFER_IDS_CHUNK_SIZE:
             break
 
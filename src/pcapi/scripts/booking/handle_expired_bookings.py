@@ -1,16 +1,15 @@
 import datetime
 from itertools import groupby
 import logging
+import math
 from operator import attrgetter
 
 from pcapi import settings
-from pcapi.core.bookings.api import recompute_dnBookedQuantity
-from pcapi.core.bookings.models import Booking
 from pcapi.core.bookings.models import BookingCancellationReasons
 import pcapi.core.bookings.repository as bookings_repository
-from pcapi.domain.user_emails import send_expired_bookings_recap_email_to_beneficiary
 from pcapi.domain.user_emails import send_expired_bookings_recap_email_to_offerer
 from pcapi.models import db
+from pcapi.workers.user_emails_job import send_expired_bookings_recap_emails_to_beneficiaries_job
 
 
 logger = logging.getLogger(__name__)
@@ -53,41 +52,26 @@ def cancel_expired_bookings(batch_size: int = 500) -> None:
 
     updated_total = 0
     expiring_booking_ids = bookings_repository.find_expiring_bookings_ids().limit(batch_size).all()
-    max_id = expiring_booking_ids[-1][0]
-    stocks_to_recompute = [
-        row[0]
-        for row in db.session.query(Booking.stockId).filter(Booking.id.in_(expiring_booking_ids)).distinct().all()
-    ]
 
     # we commit here to make sure there is no unexpected objects in SQLA cache before the update,
-    # as we use synchronize_session=False
+    # as we do not synchronize the session
     db.session.commit()
 
     while expiring_booking_ids:
-        updated = (
-            Booking.query.filter(Booking.id <= max_id)
-            .filter(Booking.id.in_(expiring_booking_ids))
-            .update(
-                {"isCancelled": True, "cancellationReason": BookingCancellationReasons.EXPIRED},
-                synchronize_session=False,
-            )
+        # The denormalized booked quantity of the stocks is updated in
+        # the same statement.
+        updated = bookings_repository.cancel_bookings_and_update_stocks(
+            [booking_id for booking_id, in expiring_booking_ids], BookingCancellationReasons.EXPIRED
         )
         db.session.commit()
 
         updated_total += updated
         expiring_booking_ids = bookings_repository.find_expiring_bookings_ids().limit(batch_size).all()
-        if expiring_booking_ids:
-            max_id = expiring_booking_ids[-1][0]
         logger.info(
             "[cancel_expired_bookings] %d Bookings have been cancelled in this batch",
             updated,
         )
 
-    # Recompute denormalized stock quantity
-    if stocks_to_recompute:
-        recompute_dnBookedQuantity(stocks_to_recompute)
-        db.session.commit()
-
     logger.info(
         "[cancel_expired_bookings] %d Bookings have been cancelled",
         updated_total,
@@ -99,22 +83,17 @@ def notify_users_of_expired_bookings(expired_on: datetime.date = None) -> None:
     expired_on = expired_on or datetime.date.today()
 
     logger.info("[notify_users_of_expired_bookings] Start")
-    expired_bookings_ordered_by_user = bookings_repository.find_expired_bookings_ordered_by_user(expired_on)
-
-    expired_bookings_grouped_by_user = dict()
-    for user, booking in groupby(expired_bookings_ordered_by_user, attrgetter("user")):
-        expired_bookings_grouped_by_user[user] = list(booking)
-
-    notified_users = []
+    booking_ids_grouped_by_user = bookings_repository.find_expired_booking_ids_grouped_by_user(expired_on)
+    booking_ids_by_user = [booking_ids for _user_id, booking_ids in booking_ids_grouped_by_user]
 
-    for user, bookings in expired_bookings_grouped_by_user.items():
-        send_expired_bookings_recap_email_to_beneficiary(user, bookings)
-        notified_users.append(user)
+    batch_size = settings.BULK_EMAILS_BATCH_SIZE
+    for start in range(0, len(booking_ids_by_user), batch_size):
+        send_expired_bookings_recap_emails_to_beneficiaries_job.delay(booking_ids_by_user[start : start + batch_size])
 
     logger.info(
-        "[notify_users_of_expired_bookings] %d Users have been notified: %s",
-        len(notified_users),
-        notified_users,
+        "[notify_users_of_expired_bookings] %d Users will be notified by %d jobs",
+        len(booking_ids_by_user),
+        math.ceil(len(booking_ids_by_user) / batch_size),
     )
 
     logger.info("[notify_users_of_expired_bookings] End")
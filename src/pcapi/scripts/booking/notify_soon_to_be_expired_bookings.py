@@ -1,11 +1,10 @@
 import datetime
-from itertools import groupby
 import logging
-from operator import attrgetter
+import math
 
 from pcapi import settings
 import pcapi.core.bookings.repository as bookings_repository
-from pcapi.domain.user_emails import send_soon_to_be_expired_bookings_recap_email_to_beneficiary
+from pcapi.workers.user_emails_job import send_soon_to_be_expired_bookings_recap_emails_to_beneficiaries_job
 
 
 logger = logging.getLogger(__name__)
@@ -22,22 +21,19 @@ def notify_soon_to_be_expired_bookings() -> None:
 
 def notify_users_of_soon_to_be_expired_bookings(given_date: datetime.date = None) -> None:
     logger.info("[notify_users_of_soon_to_be_expired_bookings] Start")
-    bookings_ordered_by_user = bookings_repository.find_soon_to_be_expiring_booking_ordered_by_user(given_date)
+    booking_ids_grouped_by_user = bookings_repository.find_soon_to_be_expiring_booking_ids_grouped_by_user(given_date)
+    booking_ids_by_user = [booking_ids for _user_id, booking_ids in booking_ids_grouped_by_user]
 
-    expired_bookings_grouped_by_user = dict()
-    for user, booking in groupby(bookings_ordered_by_user, attrgetter("user")):
-        expired_bookings_grouped_by_user[user] = list(booking)
-
-    notified_users = []
-
-    for user, bookings in expired_bookings_grouped_by_user.items():
-        send_soon_to_be_expired_bookings_recap_email_to_beneficiary(user, bookings)
-        notified_users.append(user)
+    batch_size = settings.BULK_EMAILS_BATCH_SIZE
+    for start in range(0, len(booking_ids_by_user), batch_size):
+        send_soon_to_be_expired_bookings_recap_emails_to_beneficiaries_job.delay(
+            booking_ids_by_user[start : start + batch_size]
+        )
 
     logger.info(
-        "[notify_users_of_soon_to_be_expired_bookings] %d Users have been notified: %s",
-        len(notified_users),
-        notified_users,
+        "[notify_users_of_soon_to_be_expired_bookings] %d Users will be notified by %d jobs",
+        len(booking_ids_by_user),
+        math.ceil(len(booking_ids_by_user) / batch_size),
     )
 
     logger.info("[notify_users_of_soon_to_be_expired_bookings] End")
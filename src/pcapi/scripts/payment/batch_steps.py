@@ -1,32 +1,33 @@
 from datetime import datetime
+from decimal import Decimal
+import itertools
 import logging
 from typing import Optional
 
 from lxml.etree import DocumentInvalid
 
 import pcapi.core.bookings.repository as booking_repository
-from pcapi.core.offerers.models import Offerer
 from pcapi.domain.admin_emails import send_payment_details_email
 from pcapi.domain.admin_emails import send_payment_message_email
 from pcapi.domain.admin_emails import send_payments_report_emails
 from pcapi.domain.admin_emails import send_wallet_balances_email
 from pcapi.domain.payments import create_all_payments_details
-from pcapi.domain.payments import create_payment_for_booking
-from pcapi.domain.payments import filter_out_already_paid_for_bookings
-from pcapi.domain.payments import filter_out_bookings_without_cost
+from pcapi.domain.payments import create_payment_values_for_booking
 from pcapi.domain.payments import generate_file_checksum
 from pcapi.domain.payments import generate_message_file
 from pcapi.domain.payments import generate_payment_details_csv
 from pcapi.domain.payments import generate_payment_message
 from pcapi.domain.payments import generate_wallet_balances_csv
 from pcapi.domain.payments import group_payments_by_status
-from pcapi.domain.payments import keep_only_not_processable_payments
-from pcapi.domain.payments import keep_only_pending_payments
+from pcapi.domain.payments import make_transaction_label
 from pcapi.domain.payments import validate_message_file_structure
+from pcapi.domain.reimbursement import BookingReimbursement
 from pcapi.domain.reimbursement import RULES
-from pcapi.domain.reimbursement import find_all_booking_reimbursements
+from pcapi.domain.reimbursement import ReimbursableBookings
+from pcapi.domain.reimbursement import find_all_reimbursements
 from pcapi.models.db import db
 from pcapi.models.payment import Payment
+from pcapi.models.payment_status import PaymentStatus
 from pcapi.models.payment_status import TransactionStatus
 from pcapi.repository import payment_queries
 from pcapi.repository import repository
@@ -37,6 +38,9 @@ logger = logging.getLogger(__name__)
 from pcapi.utils.mailing import MailServiceException
 
 
+PAYMENTS_BATCH_SIZE = 1000
+
+
 def concatenate_payments_with_errors_and_retries(payments: list[Payment]) -> list[Payment]:
     error_payments = payment_queries.find_error_payments()
     retry_payments = payment_queries.find_retry_payments()
@@ -50,33 +54,64 @@ def concatenate_payments_with_errors_and_retries(payments: list[Payment]) -> lis
 
 
 def generate_new_payments() -> tuple[list[Payment], list[Payment]]:
-    offerers = Offerer.query.all()
-    all_payments = []
-
-    for offerer in offerers:
-        booking_reimbursements = []
-        for venue in offerer.managedVenues:
-            final_bookings = booking_repository.find_bookings_eligible_for_payment_for_venue(venue.id)
-            booking_reimbursements += find_all_booking_reimbursements(final_bookings, RULES)
-
-        booking_reimbursements_to_pay = filter_out_already_paid_for_bookings(
-            filter_out_bookings_without_cost(booking_reimbursements)
-        )
-
-        with db.session.no_autoflush:
-            payments = list(map(create_payment_for_booking, booking_reimbursements_to_pay))
-
-        if payments:
-            repository.save(*payments)
-            all_payments.extend(payments)
-        logger.info("[BATCH][PAYMENTS] Saved %i payments for offerer : %s", len(payments), offerer.name)
+    transaction_label = make_transaction_label(datetime.utcnow())
+    payment_ids_by_status = {TransactionStatus.PENDING: [], TransactionStatus.NOT_PROCESSABLE: []}
+
+    # Payments are committed venue by venue, so that a failure does not
+    # roll back the payments of the previous venues and locks are not
+    # held during the whole batch. A commit would close a server-side
+    # cursor, hence bookings are streamed by one query per venue.
+    for venue_id in booking_repository.find_venue_ids_with_bookings_eligible_for_payment():
+        _generate_new_payments_for_venue(venue_id, transaction_label, payment_ids_by_status)
+        db.session.commit()
+
+    pending_payment_ids = payment_ids_by_status[TransactionStatus.PENDING]
+    not_processable_payment_ids = payment_ids_by_status[TransactionStatus.NOT_PROCESSABLE]
+    logger.info(
+        "[BATCH][PAYMENTS] Generated %i payments in total", len(pending_payment_ids) + len(not_processable_payment_ids)
+    )
+    logger.info("[BATCH][PAYMENTS] %s Payments in status PENDING to send", len(pending_payment_ids))
+    return payment_queries.find_by_ids(pending_payment_ids), payment_queries.find_by_ids(not_processable_payment_ids)
 
-    logger.info("[BATCH][PAYMENTS] Generated %i payments for %i offerers in total", len(all_payments), len(offerers))
 
-    pending_payments = keep_only_pending_payments(all_payments)
-    not_processable_payments = keep_only_not_processable_payments(all_payments)
-    logger.info("[BATCH][PAYMENTS] %s Payments in status PENDING to send", len(pending_payments))
-    return pending_payments, not_processable_payments
+def _generate_new_payments_for_venue(
+    venue_id: int, transaction_label: str, payment_ids_by_status: dict[TransactionStatus, list[int]]
+) -> None:
+    bookings = iter(booking_repository.find_bookings_eligible_for_payment(venue_id).yield_per(PAYMENTS_BATCH_SIZE))
+    cumulative_bookings_value_by_year = {}
+    while True:
+        rows = list(itertools.islice(bookings, PAYMENTS_BATCH_SIZE))
+        if not rows:
+            break
+        reimbursable_bookings = ReimbursableBookings.from_bookings([row.Booking for row in rows])
+        reimbursements = find_all_reimbursements(reimbursable_bookings, RULES, cumulative_bookings_value_by_year)
+        payments_values = []
+        for (booking, is_already_paid), reimbursement in zip(rows, reimbursements):
+            if is_already_paid or reimbursement.amount <= Decimal(0):
+                continue
+            booking_reimbursement = BookingReimbursement(booking, reimbursement.rule, reimbursement.amount)
+            payments_values.append(create_payment_values_for_booking(booking_reimbursement, transaction_label))
+        if payments_values:
+            _insert_payments(payments_values, payment_ids_by_status)
+
+
+def _insert_payments(payments_values: list[dict], payment_ids_by_status: dict[TransactionStatus, list[int]]) -> None:
+    payment_table = Payment.__table__
+    inserted_payments = db.session.execute(
+        payment_table.insert().values(payments_values).returning(payment_table.c.id, payment_table.c.iban)
+    ).fetchall()
+
+    now = datetime.utcnow()
+    statuses_values = []
+    for payment_id, iban in inserted_payments:
+        if iban:
+            status, detail = TransactionStatus.PENDING, None
+        else:
+            status, detail = TransactionStatus.NOT_PROCESSABLE, "IBAN et BIC manquants sur l'offreur"
+        statuses_values.append({"paymentId": payment_id, "status": status, "detail": detail, "date": now})
+        payment_ids_by_status[status].append(payment_id)
+    db.session.execute(PaymentStatus.__table__.insert().values(statuses_values))
+    logger.info("[BATCH][PAYMENTS] Inserted %i payments", len(inserted_payments))
 
 
 def send_transactions(
@@ -1,27 +1,46 @@
-from datetime import datetime
+import logging
+import time
+
+from sqlalchemy.sql.functions import func
 
 import pcapi.core.bookings.repository as booking_repository
+from pcapi.models import Booking
+from pcapi.models import db
 from pcapi.models.feature import FeatureToggle
 from pcapi.repository import feature_queries
-from pcapi.repository import repository
 
 
-def update_booking_used_after_stock_occurrence():
+logger = logging.getLogger(__name__)
+
+
+def update_booking_used_after_stock_occurrence(batch_size: int = 10000) -> list[int]:
     if not feature_queries.is_active(FeatureToggle.UPDATE_BOOKING_USED):
         raise ValueError("This function is behind a deactivated feature flag.")
 
-    bookings_to_process = booking_repository.find_not_used_and_not_cancelled()
-    bookings_id_errors = []
-
-    for booking in bookings_to_process:
-        if booking.stock.beginningDatetime:
-            now = datetime.utcnow()
-            if not booking.stock.isEventDeletable:
-                booking.isUsed = True
-                booking.dateUsed = now
-                try:
-                    repository.save(booking)
-                except Exception:  # pylint: disable=broad-except
-                    bookings_id_errors.append(booking.id)
-
-    print("Bookings id in error %s" % bookings_id_errors)
+    start = time.perf_counter()
+    min_id, max_id = db.session.query(func.min(Booking.id), func.max(Booking.id)).one()
+    if min_id is None or max_id is None:
+        logger.info("No bookings needed to be marked as used")
+        return []
+
+    updated_booking_ids = []
+    failed_batches = []
+    for batch_start in range(min_id, max_id + 1, batch_size):
+        batch_end = batch_start + batch_size - 1
+        try:
+            booking_ids = booking_repository.mark_bookings_of_past_events_as_used(batch_start, batch_end)
+            db.session.commit()
+        except Exception:  # pylint: disable=broad-except
+            db.session.rollback()
+            logger.exception("Could not mark bookings with id between %d and %d as used", batch_start, batch_end)
+            failed_batches.append((batch_start, batch_end))
+            continue
+        updated_booking_ids.extend(booking_ids)
+
+    logger.info(
+        "%d bookings have been marked as used in %.2f seconds",
+        len(updated_booking_ids),
+        time.perf_counter() - start,
+        extra={"failed_batches": failed_batches},
+    )
+    return updated_booking_ids
@@ -49,6 +49,14 @@ DATABASE_URL = os.environ.get("DATABASE_URL") if not IS_RUNNING_TESTS else os.en
 DATABASE_POOL_SIZE = int(os.environ.get("DATABASE_POOL_SIZE", 20))
 DATABASE_STATEMENT_TIMEOUT = int(os.environ.get("DATABASE_STATEMENT_TIMEOUT", 0))
 DATABASE_LOCK_TIMEOUT = int(os.environ.get("DATABASE_LOCK_TIMEOUT", 0))
+# Log a warning when a request, job or cron issues more SQL queries
+# than this, or repeats the same query more than this (0 to disable).
+SQL_QUERIES_WARNING_THRESHOLD = int(os.environ.get("SQL_QUERIES_WARNING_THRESHOLD", 0))
+SQL_REPEATED_QUERIES_WARNING_THRESHOLD = int(os.environ.get("SQL_REPEATED_QUERIES_WARNING_THRESHOLD", 0))
+
+# FEATURES
+FEATURES_CACHE_TTL = int(os.environ.get("FEATURES_CACHE_TTL", 30))
+FEATURES_CACHE_REDIS_INVALIDATION = bool(int(os.environ.get("FEATURES_CACHE_REDIS_INVALIDATION", "1")))
 
 # FLASK
 PROFILE_REQUESTS = bool(os.environ.get("PROFILE_REQUESTS", False))
@@ -57,6 +65,12 @@ FLASK_PORT = int(os.environ.get("PORT", 5000))
 FLASK_SECRET = os.environ.get("FLASK_SECRET", "+%+3Q23!zbc+!Dd@")
 CORS_ALLOWED_ORIGIN = os.environ.get("CORS_ALLOWED_ORIGIN")
 
+# HTTP CLIENT (outbound requests, see `pcapi.utils.requests`)
+HTTP_POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", 10))
+HTTP_MAX_RETRIES = int(os.environ.get("HTTP_MAX_RETRIES", 2))
+HTTP_RETRY_BACKOFF_FACTOR = float(os.environ.get("HTTP_RETRY_BACKOFF_FACTOR", 0.5))
+HTTP_TIMEOUTS_BY_HOST = json.loads(os.environ.get("HTTP_TIMEOUTS_BY_HOST", "{}"))
+
 
 # NATIVE APP SPECIFIC SETTINGS
 NATIVE_APP_MINIMAL_CLIENT_VERSION = semver.VersionInfo.parse(
@@ -112,9 +126,16 @@ PAYMENTS_DETAILS_RECIPIENTS = utils.parse_email_addresses(os.environ.get("PAYMEN
 WALLET_BALANCES_RECIPIENTS = utils.parse_email_addresses(os.environ.get("WALLET_BALANCES_RECIPIENTS"))
 WHITELISTED_EMAIL_RECIPIENTS = utils.parse_email_addresses(os.environ.get("WHITELISTED_EMAIL_RECIPIENTS"))
 WHITELISTED_SMS_RECIPIENTS = utils.parse_phone_numbers(os.environ.get("WHITELISTED_SMS_RECIPIENTS"))
+# E-mails of bulk notifications (e.g. expired bookings) are sent from the
+# low queue, by batches of this size, at most this many per second (0 is
+# unlimited).
+BULK_EMAILS_BATCH_SIZE = int(os.environ.get("BULK_EMAILS_BATCH_SIZE", 50))
+BULK_EMAILS_PER_SECOND = int(os.environ.get("BULK_EMAILS_PER_SECOND", 10))
 
 # NOTIFICATIONS
 PUSH_NOTIFICATION_BACKEND = os.environ.get("PUSH_NOTIFICATION_BACKEND", _default_push_notification_backend)
+PUSH_USER_ATTRIBUTES_DEBOUNCE_DELAY = int(os.environ.get("PUSH_USER_ATTRIBUTES_DEBOUNCE_DELAY", 30))  # seconds
+PUSH_USER_ATTRIBUTES_BATCH_SIZE = int(os.environ.get("PUSH_USER_ATTRIBUTES_BATCH_SIZE", 1000))
 SMS_NOTIFICATION_BACKEND = os.environ.get("SMS_NOTIFICATION_BACKEND", _default_sms_notification_backend)
 
 # ALGOLIA
@@ -136,6 +157,8 @@ ALGOLIA_DELETING_OFFERS_CHUNK_SIZE = int(os.environ.get("ALGOLIA_DELETING_OFFERS
 ALGOLIA_OFFERS_BY_VENUE_CHUNK_SIZE = int(os.environ.get("ALGOLIA_OFFERS_BY_VENUE_CHUNK_SIZE", 10000))
 ALGOLIA_OFFERS_BY_VENUE_PROVIDER_CHUNK_SIZE = int(os.environ.get("ALGOLIA_OFFERS_BY_VENUE_PROVIDER_CHUNK_SIZE", 10000))
 ALGOLIA_SYNC_WORKERS_POOL_SIZE = int(os.environ.get("ALGOLIA_SYNC_WORKERS_POOL_SIZE", 10))
+ALGOLIA_INDEXING_WORKERS_COUNT = int(os.environ.get("ALGOLIA_INDEXING_WORKERS_COUNT", 1))
+ALGOLIA_MAX_CONCURRENT_REQUESTS = int(os.environ.get("ALGOLIA_MAX_CONCURRENT_REQUESTS", 4))
 
 # BATCH
 BATCH_API_URL = os.environ.get("BATCH_API_URL", "https://api.batch.com")
@@ -172,6 +195,10 @@ MAILJET_HTTP_TIMEOUT = int(os.environ.get("MAILJET_HTTP_TIMEOUT", 5))
 
 # JWT
 JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY")
+# Ids of authenticated users of the native API are cached by JWT identity
+# (see `pcapi.routes.native.security`), 0 disables the cache.
+JWT_USER_IDS_CACHE_TTL = int(os.environ.get("JWT_USER_IDS_CACHE_TTL", 300))  # seconds
+JWT_USER_IDS_CACHE_MAX_SIZE = int(os.environ.get("JWT_USER_IDS_CACHE_MAX_SIZE", 100000))
 
 
 # TITELIVE
@@ -197,6 +224,14 @@ ALLOCINE_API_KEY = os.environ.get("ALLOCINE_API_KEY")
 FNAC_API_TOKEN = os.environ.get("PROVIDER_FNAC_BASIC_AUTHENTICATION_TOKEN")
 FNAC_API_URL = "https://passculture-fr.ws.fnac.com/api/v1/pass-culture/stocks"
 PROVIDERS_SYNC_WORKERS_POOL_SIZE = int(os.environ.get("SYNC_WORKERS_POOL_SIZE", 5))
+PROVIDERS_SYNC_PREFETCHED_PAGES = int(os.environ.get("PROVIDERS_SYNC_PREFETCHED_PAGES", 1))
+PROVIDERS_SYNC_CONCURRENT_VENUE_PROVIDERS = int(os.environ.get("PROVIDERS_SYNC_CONCURRENT_VENUE_PROVIDERS", 1))
+# Thumbs of synchronized objects are converted in a pool of processes and
+# uploaded in a pool of threads. 0 processes converts and uploads them
+# one by one during the synchronization.
+PROVIDERS_SYNC_THUMBS_PROCESSES = int(os.environ.get("PROVIDERS_SYNC_THUMBS_PROCESSES", 2))
+PROVIDERS_SYNC_THUMBS_UPLOAD_THREADS = int(os.environ.get("PROVIDERS_SYNC_THUMBS_UPLOAD_THREADS", 4))
+PROVIDERS_SYNC_THUMBS_MAX_PENDING = int(os.environ.get("PROVIDERS_SYNC_THUMBS_MAX_PENDING", 100))
 
 
 # DEMARCHES SIMPLIFIEES
@@ -210,6 +245,7 @@ DMS_WEBHOOK_TOKEN = os.environ.get("DEMARCHES_SIMPLIFIEES_WEBHOOK_TOKEN")
 # OBJECT STORAGE
 OBJECT_STORAGE_URL = os.environ.get("OBJECT_STORAGE_URL")
 OBJECT_STORAGE_PROVIDER = os.environ.get("OBJECT_STORAGE_PROVIDER", "")
+OBJECT_STORAGE_UPLOAD_THREADS = int(os.environ.get("OBJECT_STORAGE_UPLOAD_THREADS", 8))
 
 # SWIFT
 SWIFT_AUTH_URL = os.environ.get("SWIFT_AUTH_URL", "https://auth.cloud.ovh.net/v3/")
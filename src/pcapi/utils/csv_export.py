@@ -0,0 +1,36 @@
+import codecs
+import csv
+from io import StringIO
+import itertools
+from typing import Iterable
+from typing import Iterator
+
+from flask import Response
+from flask import stream_with_context
+
+
+def generate_csv_lines(rows: Iterable[Iterable]) -> Iterator[str]:
+    """Yield the CSV export of the rows (header included), line by line."""
+    output = StringIO()
+    writer = csv.writer(output, dialect=csv.excel, delimiter=";", quoting=csv.QUOTE_NONNUMERIC)
+    for row in rows:
+        writer.writerow(row)
+        yield output.getvalue()
+        output.seek(0)
+        output.truncate()
+
+
+def stream_csv_response(lines: Iterable[str], filename: str) -> Response:
+    """Return a response that sends the CSV lines as they are generated,
+    so that the whole file is never held in memory.
+    """
+    # Like "utf-8-sig" encoding, but the BOM must only precede the first line.
+    content = itertools.chain([codecs.BOM_UTF8], (line.encode("utf-8") for line in lines))
+
+    return Response(
+        stream_with_context(content),
+        headers={
+            "Content-type": "text/csv; charset=utf-8;",
+            "Content-Disposition": f"attachment; filename={filename}",
+        },
+    )
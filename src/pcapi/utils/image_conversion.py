@@ -1,4 +1,5 @@
 import io
+import time
 
 import PIL
 from PIL.Image import Image
@@ -20,6 +21,17 @@ def standardize_image(image: bytes, crop_params: tuple = None) -> bytes:
     return standard_image
 
 
+def standardize_image_timed(image: bytes) -> tuple[bytes, float]:
+    """Return the standardized image and the time spent converting it.
+
+    Used by the thumbs pipeline of providers: its conversion processes
+    are spawned and only need to import this module.
+    """
+    start = time.perf_counter()
+    standard_image = standardize_image(image)
+    return standard_image, time.perf_counter() - start
+
+
 def _crop_image(crop_origin_x: int, crop_origin_y: int, crop_rect_height: int, image: Image) -> Image:
     if (crop_origin_x, crop_origin_y, crop_rect_height) == DO_NOT_CROP:
         return image
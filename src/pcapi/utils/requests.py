@@ -1,9 +1,18 @@
+from http.cookiejar import DefaultCookiePolicy
 import logging
+import os
+import threading
 from typing import Any
 from typing import Callable
+from typing import Optional
+from urllib.parse import urlparse
 
 import requests
 from requests import Response
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from pcapi import settings
 
 
 # fmt: off
@@ -21,18 +30,24 @@ import requests.exceptions as exceptions
 logger = logging.getLogger(__name__)
 
 REQUEST_TIMEOUT_IN_SECOND = 10
+RETRIED_STATUS_CODES = (502, 503, 504)
 
 
-def _wrapper(request_func: Callable, method: str, url: str, **kwargs: Any) -> Response:
+def _wrapper(
+    request_func: Callable, method: str, url: str, pool_stats: Optional[dict] = None, **kwargs: Any
+) -> Response:
     try:
-        timeout = kwargs.pop("timeout", REQUEST_TIMEOUT_IN_SECOND)
+        host = urlparse(url).netloc
+        timeout = kwargs.pop("timeout", settings.HTTP_TIMEOUTS_BY_HOST.get(host, REQUEST_TIMEOUT_IN_SECOND))
         response = request_func(method=method, url=url, timeout=timeout, **kwargs)
         logger.info(
             "External service called",
             extra={
                 "url": response.url,
+                "host": host,
                 "statusCode": response.status_code,
                 "duration": response.elapsed.total_seconds(),
+                **(pool_stats or {}),
             },
         )
     except Exception as exc:
@@ -43,24 +58,80 @@ def _wrapper(request_func: Callable, method: str, url: str, **kwargs: Any) -> Re
 
 
 def get(url: str, **kwargs: Any) -> Response:
-    with Session() as session:
-        return session.request(method="GET", url=url, **kwargs)
+    return _get_pooled_session(url).request(method="GET", url=url, **kwargs)
 
 
 def post(url: str, **kwargs: Any) -> Response:
-    with Session() as session:
-        return session.request(method="POST", url=url, **kwargs)
+    return _get_pooled_session(url).request(method="POST", url=url, **kwargs)
 
 
 def put(url: str, **kwargs: Any) -> Response:
-    with Session() as session:
-        return session.request(method="PUT", url=url, **kwargs)
+    return _get_pooled_session(url).request(method="PUT", url=url, **kwargs)
 
 
 class _SessionMixin:
     def request(self, method: str, url: str, *args: Any, **kwargs: Any) -> Response:
-        return _wrapper(super().request, method, url, *args, **kwargs)
+        return _wrapper(super().request, method, url, *args, pool_stats=_get_pool_stats(self, url), **kwargs)
 
 
 class Session(_SessionMixin, requests.Session):
     pass
+
+
+# Sessions used by `get()`, `post()` and `put()`: one per scheme and
+# host, so that connections are kept alive and reused from one call to
+# another. Connections cannot be shared with a forked process (e.g. a
+# RQ job), which starts with no session.
+_pooled_sessions: dict[str, Session] = {}
+_pooled_sessions_lock = threading.Lock()
+
+
+def _reset_pooled_sessions() -> None:
+    global _pooled_sessions_lock  # pylint: disable=global-statement
+    _pooled_sessions.clear()
+    _pooled_sessions_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_pooled_sessions)
+
+
+def _get_pooled_session(url: str) -> Session:
+    parsed_url = urlparse(url)
+    key = f"{parsed_url.scheme}://{parsed_url.netloc}"
+    with _pooled_sessions_lock:
+        session = _pooled_sessions.get(key)
+        if session is None:
+            session = _pooled_sessions[key] = _create_pooled_session()
+    return session
+
+
+def _create_pooled_session() -> Session:
+    session = Session()
+    # Calls must not depend on each other: do not store cookies.
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    # By default, `Retry` only retries idempotent requests (not POST).
+    retries = Retry(
+        total=settings.HTTP_MAX_RETRIES,
+        backoff_factor=settings.HTTP_RETRY_BACKOFF_FACTOR,
+        status_forcelist=RETRIED_STATUS_CODES,
+        raise_on_status=False,
+    )
+    # Beyond `pool_maxsize` concurrent requests, new connections are
+    # opened but closed after use. This is logged in `poolInUse`.
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.HTTP_POOL_MAXSIZE, max_retries=retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _get_pool_stats(session: requests.Session, url: str) -> dict:
+    adapter = session.get_adapter(url)
+    if not isinstance(adapter, HTTPAdapter):  # e.g. `requests_mock` in tests
+        return {}
+    try:
+        queue = adapter.poolmanager.connection_from_url(url).pool
+        # The queue holds idle connections and free slots.
+        return {"poolSize": queue.maxsize, "poolInUse": queue.maxsize - queue.qsize()}
+    except Exception:  # pylint: disable=broad-except
+        # Let the request fail (and be logged) with the same error, if any.
+        return {}
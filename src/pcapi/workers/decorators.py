@@ -1,6 +1,7 @@
 from functools import wraps
 import logging
 
+from pcapi.core import sql_stats
 from pcapi.flask_app import app
 from pcapi.settings import IS_RUNNING_TESTS
 
@@ -29,9 +30,11 @@ def log_job(func):
     def wrapper(*args, **kwargs):
         job_description = f"{func.__name__} {args}"
         logger.info(build_job_log_message(job=job_description, status=JobStatus.STARTED))
-        result = func(*args, **kwargs)
+        with sql_stats.record_queries() as stats:
+            result = func(*args, **kwargs)
 
-        logger.info(build_job_log_message(job=job_description, status=JobStatus.ENDED))
+        logger.info(build_job_log_message(job=job_description, status=JobStatus.ENDED), extra=stats.as_log_extra())
+        sql_stats.warn_if_thresholds_exceeded(stats, f"job {func.__name__}")
         return result
 
     return wrapper
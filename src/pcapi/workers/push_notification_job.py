@@ -1,15 +1,24 @@
 import logging
+import time
 from typing import Callable
 
+from flask import current_app as app
+from redis import Redis
 from rq.decorators import job
 
+from pcapi import settings
+from pcapi.connectors import redis
 from pcapi.core.users.models import User
+from pcapi.models.feature import FeatureToggle
 from pcapi.notifications.push import send_transactional_notification
 from pcapi.notifications.push import update_user_attributes
+from pcapi.notifications.push import update_users_attributes
 from pcapi.notifications.push.transactional_notifications import get_bookings_cancellation_notification_data
 from pcapi.notifications.push.transactional_notifications import get_tomorrow_stock_notification_data
 from pcapi.notifications.push.user_attributes_updates import get_user_attributes
 from pcapi.notifications.push.user_attributes_updates import get_user_booking_attributes
+from pcapi.notifications.push.user_attributes_updates import get_users_attributes
+from pcapi.repository import feature_queries
 from pcapi.workers import worker
 from pcapi.workers.decorators import job_context
 from pcapi.workers.decorators import log_job
@@ -42,6 +51,42 @@ def update_user_bookings_attributes_job(user_id: int) -> None:
     update_user_attributes(user.id, get_user_booking_attributes(user))
 
 
+def schedule_user_attributes_update(user_id: int, update_job: Callable = update_user_attributes_job) -> None:
+    """Update the attributes of the user on Batch with `update_job`, or
+    with the next batch of updates if updates are debounced.
+    """
+    if feature_queries.is_active(FeatureToggle.DEBOUNCE_PUSH_USER_ATTRIBUTES_UPDATES):
+        redis.add_push_user_ids(client=app.redis_client, user_ids=[user_id])
+    else:
+        update_job.delay(user_id)
+
+
+def update_debounced_users_attributes(client: Redis) -> None:
+    """Update on Batch, by batches, the attributes of the users that have
+    not changed for `PUSH_USER_ATTRIBUTES_DEBOUNCE_DELAY` seconds.
+    """
+    changed_before = time.time() - settings.PUSH_USER_ATTRIBUTES_DEBOUNCE_DELAY
+    updated_users_count = 0
+    while True:
+        user_ids = redis.pop_push_user_ids(client, changed_before, settings.PUSH_USER_ATTRIBUTES_BATCH_SIZE)
+        if not user_ids:
+            break
+        try:
+            users = User.query.filter(User.id.in_(user_ids)).all()
+            updated = update_users_attributes(get_users_attributes(users))
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Could not update attributes of %d users on Batch", len(user_ids))
+            updated = False
+        if not updated:
+            # Try again on the next call.
+            logger.warning("Attributes of %d users will be updated on Batch later", len(user_ids))
+            redis.add_push_user_ids(client, user_ids)
+            break
+        updated_users_count += len(users)
+
+    logger.info("Updated attributes of %d users on Batch", updated_users_count)
+
+
 @job(worker.default_queue, connection=worker.conn)
 @job_context
 @log_job
@@ -1,9 +1,20 @@
+from itertools import groupby
 import logging
+from operator import attrgetter
+import time
+from typing import Callable
 
 from rq.decorators import job
+from sqlalchemy.orm import joinedload
 
+from pcapi import settings
 from pcapi.core.bookings.models import Booking
+from pcapi.core.users.models import User
 from pcapi.domain.user_emails import send_booking_cancellation_emails_to_user_and_offerer
+from pcapi.domain.user_emails import send_expired_bookings_recap_emails_to_beneficiaries
+from pcapi.domain.user_emails import send_soon_to_be_expired_bookings_recap_emails_to_beneficiaries
+from pcapi.models import Offer
+from pcapi.models import Stock
 from pcapi.utils.mailing import MailServiceException
 from pcapi.workers import worker
 from pcapi.workers.decorators import job_context
@@ -24,3 +35,46 @@ def send_booking_cancellation_emails_to_user_and_offerer_job(booking_id: int) ->
         send_booking_cancellation_emails_to_user_and_offerer(booking, booking.cancellationReason)
     except MailServiceException as error:
         logger.exception("Could not send booking=%s cancellation emails: %s", booking.id, error)
+
+
+@job(worker.low_queue, connection=worker.conn)
+@job_context
+@log_job
+def send_expired_bookings_recap_emails_to_beneficiaries_job(booking_ids_by_user: list[list[int]]) -> None:
+    _send_bookings_recap_emails(booking_ids_by_user, send_expired_bookings_recap_emails_to_beneficiaries)
+
+
+@job(worker.low_queue, connection=worker.conn)
+@job_context
+@log_job
+def send_soon_to_be_expired_bookings_recap_emails_to_beneficiaries_job(booking_ids_by_user: list[list[int]]) -> None:
+    _send_bookings_recap_emails(booking_ids_by_user, send_soon_to_be_expired_bookings_recap_emails_to_beneficiaries)
+
+
+def _send_bookings_recap_emails(
+    booking_ids_by_user: list[list[int]],
+    send_emails: Callable[[list[tuple[User, list[Booking]]]], list[bool]],
+) -> None:
+    start = time.perf_counter()
+    booking_ids = [booking_id for user_booking_ids in booking_ids_by_user for booking_id in user_booking_ids]
+    bookings = (
+        Booking.query.filter(Booking.id.in_(booking_ids))
+        .options(joinedload(Booking.user))
+        .options(joinedload(Booking.stock).joinedload(Stock.offer).joinedload(Offer.venue))
+        .order_by(Booking.userId, Booking.id)
+        .all()
+    )
+    bookings_by_beneficiary = [(user, list(bookings)) for user, bookings in groupby(bookings, attrgetter("user"))]
+
+    results = send_emails(bookings_by_beneficiary)
+    logger.info(
+        "Sent %d bookings recap e-mails out of %d in %.2f seconds",
+        results.count(True),
+        len(results),
+        time.perf_counter() - start,
+    )
+
+    # Jobs of the low queue are run one after the other: waiting here
+    # limits the rate at which a worker sends these e-mails.
+    if settings.BULK_EMAILS_PER_SECOND > 0:
+        time.sleep(max(0, len(results) / settings.BULK_EMAILS_PER_SECOND - (time.perf_counter() - start)))
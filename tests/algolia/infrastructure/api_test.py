@@ -0,0 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from unittest.mock import patch
+
+from pcapi import settings
+from pcapi.algolia.infrastructure.api import add_objects
+from pcapi.algolia.infrastructure.api import delete_objects
+
+
+class ConcurrentRequestsTest:
+    @patch("pcapi.algolia.infrastructure.api.init_connection")
+    def test_caps_the_number_of_concurrent_requests(self, mock_init_connection):
+        # Given
+        max_requests = settings.ALGOLIA_MAX_CONCURRENT_REQUESTS
+        condition = threading.Condition()
+        release_requests = threading.Event()
+        running_requests = []
+
+        def send_request(objects):
+            with condition:
+                running_requests.append(objects)
+                condition.notify_all()
+            release_requests.wait(timeout=5)
+            with condition:
+                running_requests.remove(objects)
+
+        mock_init_connection.return_value.save_objects.side_effect = send_request
+        mock_init_connection.return_value.delete_objects.side_effect = send_request
+
+        # When
+        with ThreadPoolExecutor(max_workers=2 * max_requests) as executor:
+            futures = [executor.submit(add_objects, [{"objectID": i}]) for i in range(max_requests)]
+            futures += [executor.submit(delete_objects, [i]) for i in range(max_requests)]
+            with condition:
+                assert condition.wait_for(lambda: len(running_requests) == max_requests, timeout=5)
+            # Give other threads a chance to (wrongly) send their request.
+            time.sleep(0.1)
+            with condition:
+                running_requests_count = len(running_requests)
+            release_requests.set()
+        for future in futures:
+            future.result()
+
+        # Then
+        assert running_requests_count == max_requests
+        assert mock_init_connection.return_value.save_objects.call_count == max_requests
+        assert mock_init_connection.return_value.delete_objects.call_count == max_requests
@@ -30,12 +30,12 @@ class ProcessEligibleOffersTest:
     @patch("pcapi.algolia.usecase.orchestrator.add_to_indexed_offers")
     @patch("pcapi.algolia.usecase.orchestrator.delete_objects")
     @patch("pcapi.algolia.usecase.orchestrator.add_objects")
-    @patch("pcapi.algolia.usecase.orchestrator.check_offer_exists")
+    @patch("pcapi.algolia.usecase.orchestrator.get_offers_details")
     @patch("pcapi.algolia.usecase.orchestrator.build_object", return_value={"fake": "test"})
     def test_should_add_objects_when_objects_are_eligible_and_not_already_indexed(
         self,
         mock_build_object,
-        mock_check_offer_exists,
+        mock_get_offers_details,
         mock_add_objects,
         mock_delete_objects,
         mock_add_to_indexed_offers,
@@ -59,7 +59,7 @@ class ProcessEligibleOffersTest:
         offer3 = create_offer_with_thing_product(venue=venue, is_active=False)
         stock3 = create_stock(booking_limit_datetime=TOMORROW, offer=offer3, quantity=10)
         repository.save(stock1, stock2, stock3)
-        mock_check_offer_exists.side_effect = [False, False, False]
+        mock_get_offers_details.return_value = {}
 
         # When
         process_eligible_offers(client=client, offer_ids=[offer1.id, offer2.id], from_provider_update=False)
@@ -109,7 +109,7 @@ class ProcessEligibleOffersTest:
     @pytest.mark.usefixtures("db_session")
     @patch("pcapi.algolia.usecase.orchestrator.add_offer_ids_in_error")
     @patch("pcapi.algolia.usecase.orchestrator.delete_indexed_offers")
-    @patch("pcapi.algolia.usecase.orchestrator.check_offer_exists")
+    @patch("pcapi.algolia.usecase.orchestrator.get_offers_details")
     @patch("pcapi.algolia.usecase.orchestrator.add_to_indexed_offers")
     @patch("pcapi.algolia.usecase.orchestrator.delete_objects")
     @patch("pcapi.algolia.usecase.orchestrator.add_objects")
@@ -120,7 +120,7 @@ class ProcessEligibleOffersTest:
         mock_add_objects,
         mock_delete_objects,
         mock_add_to_indexed_offers,
-        mock_check_offer_exists,
+        mock_get_offers_details,
         mock_delete_indexed_offers,
         mock_add_offer_ids_in_error,
         app,
@@ -139,7 +139,7 @@ class ProcessEligibleOffersTest:
         offer2 = create_offer_with_thing_product(venue=venue, is_active=True)
         stock2 = create_stock(booking_limit_datetime=TOMORROW, offer=offer2, quantity=0)
         repository.save(stock1, stock2)
-        mock_check_offer_exists.side_effect = [True, True]
+        mock_get_offers_details.return_value = {offer1.id: {"name": "Test Book"}, offer2.id: {"name": "Test Book"}}
 
         # When
         process_eligible_offers(client=client, offer_ids=[offer1.id, offer2.id], from_provider_update=False)
@@ -158,7 +158,7 @@ class ProcessEligibleOffersTest:
 
     @pytest.mark.usefixtures("db_session")
     @patch("pcapi.algolia.usecase.orchestrator.delete_indexed_offers")
-    @patch("pcapi.algolia.usecase.orchestrator.check_offer_exists")
+    @patch("pcapi.algolia.usecase.orchestrator.get_offers_details")
     @patch("pcapi.algolia.usecase.orchestrator.add_to_indexed_offers")
     @patch("pcapi.algolia.usecase.orchestrator.delete_objects")
     @patch("pcapi.algolia.usecase.orchestrator.add_objects")
@@ -169,7 +169,7 @@ class ProcessEligibleOffersTest:
         mock_add_objects,
         mock_delete_objects,
         mock_add_to_indexed_offers,
-        mock_check_offer_exists,
+        mock_get_offers_details,
         mock_delete_indexed_offers,
         app,
     ):
@@ -187,7 +187,7 @@ class ProcessEligibleOffersTest:
         offer2 = create_offer_with_thing_product(venue=venue, is_active=True)
         stock2 = create_stock(booking_limit_datetime=TOMORROW, offer=offer2, quantity=0)
         repository.save(stock1, stock2)
-        mock_check_offer_exists.side_effect = [False, False]
+        mock_get_offers_details.return_value = {}
 
         # When
         process_eligible_offers(client=client, offer_ids=[offer1.id, offer2.id], from_provider_update=False)
@@ -204,7 +204,7 @@ class ProcessEligibleOffersTest:
     @pytest.mark.usefixtures("db_session")
     @patch("pcapi.algolia.usecase.orchestrator.add_offer_ids_in_error")
     @patch("pcapi.algolia.usecase.orchestrator.delete_indexed_offers")
-    @patch("pcapi.algolia.usecase.orchestrator.check_offer_exists")
+    @patch("pcapi.algolia.usecase.orchestrator.get_offers_details")
     @patch("pcapi.algolia.usecase.orchestrator.add_to_indexed_offers")
     @patch("pcapi.algolia.usecase.orchestrator.delete_objects")
     @patch("pcapi.algolia.usecase.orchestrator.add_objects")
@@ -215,7 +215,7 @@ class ProcessEligibleOffersTest:
         mock_add_objects,
         mock_delete_objects,
         mock_add_to_indexed_offers,
-        mock_check_offer_exists,
+        mock_get_offers_details,
         mock_delete_indexed_offers,
         mock_add_offer_ids_in_error,
         app,
@@ -234,7 +234,7 @@ class ProcessEligibleOffersTest:
         offer2 = create_offer_with_thing_product(venue=venue, is_active=True)
         stock2 = create_stock(booking_limit_datetime=TOMORROW, offer=offer2, quantity=0)
         repository.save(stock1, stock2)
-        mock_check_offer_exists.side_effect = [True, True]
+        mock_get_offers_details.return_value = {offer1.id: {"name": "Test Book"}, offer2.id: {"name": "Test Book"}}
         mock_delete_objects.side_effect = [AlgoliaException]
 
         # When
@@ -252,8 +252,7 @@ class ProcessEligibleOffersTest:
         mock_pipeline.reset.assert_not_called()
 
     @patch("pcapi.algolia.usecase.orchestrator.add_to_indexed_offers")
-    @patch("pcapi.algolia.usecase.orchestrator.get_offer_details")
-    @patch("pcapi.algolia.usecase.orchestrator.check_offer_exists")
+    @patch("pcapi.algolia.usecase.orchestrator.get_offers_details")
     @patch("pcapi.algolia.usecase.orchestrator.delete_objects")
     @patch("pcapi.algolia.usecase.orchestrator.build_object")
     @patch("pcapi.algolia.usecase.orchestrator.add_objects")
@@ -263,8 +262,7 @@ class ProcessEligibleOffersTest:
         mock_add_objects,
         mock_build_object,
         mock_delete_objects,
-        mock_check_offer_exists,
-        mock_get_offer_details,
+        mock_get_offers_details,
         mock_add_to_indexed_offers,
         app,
     ):
@@ -290,14 +288,13 @@ class ProcessEligibleOffersTest:
             {"fake": "object"},
             {"fake": "object"},
         ]
-        mock_check_offer_exists.side_effect = [False, False, False]
+        mock_get_offers_details.return_value = {}
 
         # When
         process_eligible_offers(client=client, offer_ids=offer_ids, from_provider_update=True)
 
         # Then
-        assert mock_check_offer_exists.call_count == 3
-        assert mock_get_offer_details.call_count == 0
+        assert mock_get_offers_details.call_count == 1
         assert mock_add_to_indexed_offers.call_count == 3
         assert mock_add_to_indexed_offers.call_args_list == [
             call(
@@ -326,8 +323,7 @@ class ProcessEligibleOffersTest:
 
     @patch("pcapi.algolia.usecase.orchestrator.delete_indexed_offers")
     @patch("pcapi.algolia.usecase.orchestrator.add_to_indexed_offers")
-    @patch("pcapi.algolia.usecase.orchestrator.get_offer_details")
-    @patch("pcapi.algolia.usecase.orchestrator.check_offer_exists")
+    @patch("pcapi.algolia.usecase.orchestrator.get_offers_details")
     @patch("pcapi.algolia.usecase.orchestrator.delete_objects")
     @patch("pcapi.algolia.usecase.orchestrator.build_object")
     @patch("pcapi.algolia.usecase.orchestrator.add_objects")
@@ -337,8 +333,7 @@ class ProcessEligibleOffersTest:
         mock_add_objects,
         mock_build_object,
         mock_delete_objects,
-        mock_check_offer_exists,
-        mock_get_offer_details,
+        mock_get_offers_details,
         mock_add_to_indexed_offers,
         mock_delete_indexed_offers,
         app,
@@ -360,16 +355,19 @@ class ProcessEligibleOffersTest:
         stock3 = create_stock(booking_limit_datetime=TOMORROW, offer=offer3, quantity=1)
         repository.save(stock1, stock2, stock3)
         offer_ids = [offer1.id, offer2.id, offer3.id]
-        mock_check_offer_exists.side_effect = [True, True, True]
+        mock_get_offers_details.return_value = {
+            offer1.id: {"name": "super offre 1"},
+            offer2.id: {"name": "super offre 2"},
+            offer3.id: {"name": "super offre 3"},
+        }
 
         # When
         process_eligible_offers(client=client, offer_ids=offer_ids, from_provider_update=True)
 
         # Then
-        assert mock_check_offer_exists.call_count == 3
+        assert mock_get_offers_details.call_count == 1
         assert mock_build_object.call_count == 0
         assert mock_add_objects.call_count == 0
-        assert mock_get_offer_details.call_count == 0
         assert mock_add_to_indexed_offers.call_count == 0
         assert mock_delete_objects.call_count == 1
         assert mock_delete_objects.call_args_list == [call(object_ids=[offer1.id, offer2.id, offer3.id])]
@@ -381,11 +379,11 @@ class ProcessEligibleOffersTest:
         assert mock_pipeline.reset.call_count == 0
 
     @patch("pcapi.algolia.usecase.orchestrator.delete_indexed_offers")
-    @patch("pcapi.algolia.usecase.orchestrator.check_offer_exists")
+    @patch("pcapi.algolia.usecase.orchestrator.get_offers_details")
     @patch("pcapi.algolia.usecase.orchestrator.delete_objects")
     @pytest.mark.usefixtures("db_session")
     def test_should_not_delete_offers_that_are_not_already_indexed(
-        self, mock_delete_objects, mock_check_offer_exists, mock_delete_indexed_offers, app
+        self, mock_delete_objects, mock_get_offers_details, mock_delete_indexed_offers, app
     ):
         # Given
         client = MagicMock()
@@ -402,19 +400,18 @@ class ProcessEligibleOffersTest:
         stock2 = create_stock(booking_limit_datetime=TOMORROW, offer=offer2, quantity=1)
         repository.save(stock1, stock2)
         offer_ids = [offer1.id, offer2.id]
-        mock_check_offer_exists.side_effect = [False, False]
+        mock_get_offers_details.return_value = {}
 
         # When
         process_eligible_offers(client=client, offer_ids=offer_ids, from_provider_update=True)
 
         # Then
-        assert mock_check_offer_exists.call_count == 2
+        assert mock_get_offers_details.call_count == 1
         assert mock_delete_objects.call_count == 0
         assert mock_delete_indexed_offers.call_count == 0
 
     @patch("pcapi.algolia.usecase.orchestrator.add_to_indexed_offers")
-    @patch("pcapi.algolia.usecase.orchestrator.get_offer_details")
-    @patch("pcapi.algolia.usecase.orchestrator.check_offer_exists")
+    @patch("pcapi.algolia.usecase.orchestrator.get_offers_details")
     @patch("pcapi.algolia.usecase.orchestrator.delete_objects")
     @patch("pcapi.algolia.usecase.orchestrator.build_object")
     @patch("pcapi.algolia.usecase.orchestrator.add_objects")
@@ -424,8 +421,7 @@ class ProcessEligibleOffersTest:
         mock_add_objects,
         mock_build_object,
         mock_delete_objects,
-        mock_check_offer_exists,
-        mock_get_offer_details,
+        mock_get_offers_details,
         mock_add_to_indexed_offers,
         app,
     ):
@@ -445,15 +441,15 @@ class ProcessEligibleOffersTest:
         mock_build_object.side_effect = [
             {"fake": "object"},
         ]
-        mock_check_offer_exists.return_value = True
-        mock_get_offer_details.return_value = {"name": "une autre super offre", "dates": [], "prices": [11.0]}
+        mock_get_offers_details.return_value = {
+            offer1.id: {"name": "une autre super offre", "dates": [], "prices": [11.0]}
+        }
 
         # When
         process_eligible_offers(client=client, offer_ids=offer_ids, from_provider_update=True)
 
         # Then
-        assert mock_check_offer_exists.call_count == 1
-        assert mock_get_offer_details.call_count == 1
+        assert mock_get_offers_details.call_count == 1
         assert mock_add_to_indexed_offers.call_count == 1
         assert mock_add_to_indexed_offers.call_args_list == [
             call(
@@ -469,8 +465,7 @@ class ProcessEligibleOffersTest:
         assert mock_delete_objects.call_count == 0
 
     @patch("pcapi.algolia.usecase.orchestrator.add_to_indexed_offers")
-    @patch("pcapi.algolia.usecase.orchestrator.get_offer_details")
-    @patch("pcapi.algolia.usecase.orchestrator.check_offer_exists")
+    @patch("pcapi.algolia.usecase.orchestrator.get_offers_details")
     @patch("pcapi.algolia.usecase.orchestrator.delete_objects")
     @patch("pcapi.algolia.usecase.orchestrator.build_object")
     @patch("pcapi.algolia.usecase.orchestrator.add_objects")
@@ -480,8 +475,7 @@ class ProcessEligibleOffersTest:
         mock_add_objects,
         mock_build_object,
         mock_delete_objects,
-        mock_check_offer_exists,
-        mock_get_offer_details,
+        mock_get_offers_details,
         mock_add_to_indexed_offers,
         app,
     ):
@@ -501,15 +495,13 @@ class ProcessEligibleOffersTest:
         mock_build_object.side_effect = [
             {"fake": "object"},
         ]
-        mock_check_offer_exists.return_value = True
-        mock_get_offer_details.return_value = {"name": "super offre 1", "dates": [], "prices": [10.0]}
+        mock_get_offers_details.return_value = {offer1.id: {"name": "super offre 1", "dates": [], "prices": [10.0]}}
 
         # When
         process_eligible_offers(client=client, offer_ids=offer_ids, from_provider_update=True)
 
         # Then
-        assert mock_check_offer_exists.call_count == 1
-        assert mock_get_offer_details.call_count == 1
+        assert mock_get_offers_details.call_count == 1
         assert mock_add_to_indexed_offers.call_count == 0
         assert mock_add_objects.call_count == 0
         assert mock_pipeline.execute.call_count == 0
@@ -517,8 +509,7 @@ class ProcessEligibleOffersTest:
         assert mock_delete_objects.call_count == 0
 
     @patch("pcapi.algolia.usecase.orchestrator.add_to_indexed_offers")
-    @patch("pcapi.algolia.usecase.orchestrator.get_offer_details")
-    @patch("pcapi.algolia.usecase.orchestrator.check_offer_exists")
+    @patch("pcapi.algolia.usecase.orchestrator.get_offers_details")
     @patch("pcapi.algolia.usecase.orchestrator.delete_objects")
     @patch("pcapi.algolia.usecase.orchestrator.build_object")
     @patch("pcapi.algolia.usecase.orchestrator.add_objects")
@@ -529,8 +520,7 @@ class ProcessEligibleOffersTest:
         mock_add_objects,
         mock_build_object,
         mock_delete_objects,
-        mock_check_offer_exists,
-        mock_get_offer_details,
+        mock_get_offers_details,
         mock_add_to_indexed_offers,
         app,
     ):
@@ -557,15 +547,15 @@ class ProcessEligibleOffersTest:
         mock_build_object.side_effect = [
             {"fake": "object"},
         ]
-        mock_check_offer_exists.return_value = True
-        mock_get_offer_details.return_value = {"name": "super offre 1", "dates": [1515542400.0], "prices": [10.0]}
+        mock_get_offers_details.return_value = {
+            offer.id: {"name": "super offre 1", "dates": [1515542400.0], "prices": [10.0]}
+        }
 
         # When
         process_eligible_offers(client=client, offer_ids=offer_ids, from_provider_update=True)
 
         # Then
-        assert mock_check_offer_exists.call_count == 1
-        assert mock_get_offer_details.call_count == 1
+        assert mock_get_offers_details.call_count == 1
         assert mock_add_to_indexed_offers.call_count == 1
         assert mock_add_to_indexed_offers.call_args_list == [
             call(
@@ -586,12 +576,12 @@ class ProcessEligibleOffersTest:
     @patch("pcapi.algolia.usecase.orchestrator.add_to_indexed_offers")
     @patch("pcapi.algolia.usecase.orchestrator.delete_objects")
     @patch("pcapi.algolia.usecase.orchestrator.add_objects")
-    @patch("pcapi.algolia.usecase.orchestrator.check_offer_exists")
+    @patch("pcapi.algolia.usecase.orchestrator.get_offers_details")
     @patch("pcapi.algolia.usecase.orchestrator.build_object", return_value={"fake": "test"})
     def test_should_add_offer_ids_in_error_when_adding_objects_failed(
         self,
         mock_build_object,
-        mock_check_offer_exists,
+        mock_get_offers_details,
         mock_add_objects,
         mock_delete_objects,
         mock_add_to_indexed_offers,
@@ -613,7 +603,7 @@ class ProcessEligibleOffersTest:
         offer2 = create_offer_with_thing_product(venue=venue, is_active=True)
         stock2 = create_stock(booking_limit_datetime=TOMORROW, offer=offer2, quantity=10)
         repository.save(stock1, stock2)
-        mock_check_offer_exists.side_effect = [False, False]
+        mock_get_offers_details.return_value = {}
         mock_add_objects.side_effect = [AlgoliaException]
 
         # When
@@ -644,14 +634,14 @@ class ProcessEligibleOffersTest:
 
 class DeleteExpiredOffersTest:
     @patch("pcapi.algolia.usecase.orchestrator.delete_indexed_offers")
-    @patch("pcapi.algolia.usecase.orchestrator.check_offer_exists")
+    @patch("pcapi.algolia.usecase.orchestrator.get_offers_details")
     @patch("pcapi.algolia.usecase.orchestrator.delete_objects")
     def test_should_delete_expired_offers_from_algolia_when_at_least_one_offer_id_and_offers_were_indexed(
-        self, mock_delete_objects, mock_check_offer_exists, mock_delete_indexed_offers, app
+        self, mock_delete_objects, mock_get_offers_details, mock_delete_indexed_offers, app
     ):
         # Given
         client = MagicMock()
-        mock_check_offer_exists.side_effect = [True, True, True]
+        mock_get_offers_details.return_value = {1: {}, 2: {}, 3: {}}
 
         # When
         delete_expired_offers(client=client, offer_ids=[1, 2, 3])
@@ -678,14 +668,14 @@ class DeleteExpiredOffersTest:
         assert mock_delete_indexed_offers.call_count == 0
 
     @patch("pcapi.algolia.usecase.orchestrator.delete_indexed_offers")
-    @patch("pcapi.algolia.usecase.orchestrator.check_offer_exists")
+    @patch("pcapi.algolia.usecase.orchestrator.get_offers_details")
     @patch("pcapi.algolia.usecase.orchestrator.delete_objects")
     def test_should_not_delete_expired_offers_from_algolia_when_at_least_one_offer_id_but_offers_were_not_indexed(
-        self, mock_delete_objects, mock_check_offer_exists, mock_delete_indexed_offers, app
+        self, mock_delete_objects, mock_get_offers_details, mock_delete_indexed_offers, app
     ):
         # Given
         client = MagicMock()
-        mock_check_offer_exists.side_effect = [False, False, False]
+        mock_get_offers_details.return_value = {}
 
         # When
         delete_expired_offers(client=client, offer_ids=[])
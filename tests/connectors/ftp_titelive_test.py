@@ -0,0 +1,91 @@
+import ftplib
+from io import BytesIO
+from unittest.mock import MagicMock
+from unittest.mock import patch
+from zipfile import ZipFile
+
+import pytest
+
+from pcapi.connectors import ftp_titelive
+from pcapi.connectors.ftp_titelive import get_titelive_ftp_connection
+from pcapi.connectors.ftp_titelive import get_zip_file_from_ftp
+from pcapi.local_providers.titelive_things.titelive_things import get_lines_from_thing_file
+
+
+@pytest.fixture(autouse=True)
+def clear_connections():
+    ftp_titelive._connections.__dict__.clear()
+    yield
+    ftp_titelive._connections.__dict__.clear()
+
+
+def _fake_retrbinary(content: bytes):
+    def retrbinary(command, callback):  # pylint: disable=unused-argument
+        callback(content[:3])
+        callback(content[3:])
+
+    return retrbinary
+
+
+class GetTiteliveFtpConnectionTest:
+    @patch("pcapi.connectors.ftp_titelive.connect_to_titelive_ftp")
+    def test_reuses_logged_in_connection(self, mock_connect):
+        # When
+        first_connection = get_titelive_ftp_connection()
+        second_connection = get_titelive_ftp_connection()
+
+        # Then
+        assert first_connection is second_connection
+        mock_connect.assert_called_once()
+        first_connection.voidcmd.assert_called_once_with("NOOP")
+
+    @patch("pcapi.connectors.ftp_titelive.connect_to_titelive_ftp")
+    def test_reconnects_when_connection_has_been_lost(self, mock_connect):
+        # Given
+        lost_connection = MagicMock()
+        lost_connection.voidcmd.side_effect = ftplib.error_temp("421 Timeout")
+        new_connection = MagicMock()
+        mock_connect.side_effect = [lost_connection, new_connection]
+        get_titelive_ftp_connection()
+
+        # When
+        connection = get_titelive_ftp_connection()
+
+        # Then
+        assert connection is new_connection
+        lost_connection.close.assert_called_once()
+
+
+class GetZipFileFromFtpTest:
+    @patch("pcapi.connectors.ftp_titelive.connect_to_titelive_ftp")
+    def test_returns_zip_file_named_after_downloaded_file(self, mock_connect):
+        # Given
+        zip_content = BytesIO()
+        with ZipFile(zip_content, "w") as zip_file:
+            zip_file.writestr("9782370730541_1_75.jpg", b"thumb")
+        mock_connect.return_value.retrbinary.side_effect = _fake_retrbinary(zip_content.getvalue())
+
+        # When
+        zip_file = get_zip_file_from_ftp("livre3_11_20210210.zip", "tlivebook")
+
+        # Then
+        assert zip_file.filename == "livre3_11_20210210.zip"
+        assert zip_file.read("9782370730541_1_75.jpg") == b"thumb"
+        assert mock_connect.return_value.retrbinary.call_args[0][0] == "RETR tlivebook/livre3_11_20210210.zip"
+
+
+class GetLinesFromThingFileTest:
+    @patch("pcapi.connectors.ftp_titelive.connect_to_titelive_ftp")
+    def test_yields_decoded_lines_lazily(self, mock_connect):
+        # Given
+        content = "9782370730541~Livre été\n9782370730542~Autre livre\n".encode("iso-8859-1")
+        mock_connect.return_value.retrbinary.side_effect = _fake_retrbinary(content)
+
+        # When
+        lines = get_lines_from_thing_file("Quotidien30.tit")
+
+        # Then
+        mock_connect.assert_not_called()
+        assert next(lines) == "9782370730541~Livre été\n"
+        assert list(lines) == ["9782370730542~Autre livre\n"]
+        mock_connect.return_value.retrbinary.assert_called_once()
@@ -1,4 +1,5 @@
 from unittest.mock import MagicMock
+from unittest.mock import call
 from unittest.mock import patch
 
 import pytest
@@ -7,25 +8,34 @@ import redis
 from pcapi import settings
 from pcapi.connectors.redis import _add_venue_provider
 from pcapi.connectors.redis import add_offer_id
+from pcapi.connectors.redis import add_offer_ids
 from pcapi.connectors.redis import add_offer_ids_in_error
+from pcapi.connectors.redis import add_push_user_ids
 from pcapi.connectors.redis import add_to_indexed_offers
 from pcapi.connectors.redis import add_venue_id
 from pcapi.connectors.redis import add_venue_provider_currently_in_sync
 from pcapi.connectors.redis import check_offer_exists
+from pcapi.connectors.redis import count_offer_ids
 from pcapi.connectors.redis import delete_all_indexed_offers
 from pcapi.connectors.redis import delete_indexed_offers
-from pcapi.connectors.redis import delete_offer_ids
 from pcapi.connectors.redis import delete_offer_ids_in_error
 from pcapi.connectors.redis import delete_venue_ids
 from pcapi.connectors.redis import delete_venue_provider_currently_in_sync
 from pcapi.connectors.redis import delete_venue_providers
 from pcapi.connectors.redis import get_number_of_venue_providers_currently_in_sync
 from pcapi.connectors.redis import get_offer_details
-from pcapi.connectors.redis import get_offer_ids
 from pcapi.connectors.redis import get_offer_ids_in_error
+from pcapi.connectors.redis import get_offers_details
 from pcapi.connectors.redis import get_venue_ids
 from pcapi.connectors.redis import get_venue_providers
+from pcapi.connectors.redis import move_legacy_offer_ids
+from pcapi.connectors.redis import pop_offer_ids
+from pcapi.connectors.redis import pop_offer_ids_duplicates_count
+from pcapi.connectors.redis import pop_push_user_ids
+from pcapi.connectors.redis import publish_features_invalidation
 from pcapi.connectors.redis import send_venue_provider_data_to_redis
+from pcapi.connectors.redis import subscribe_to_features_invalidation
+from pcapi.core.testing import override_settings
 from pcapi.model_creators.generic_creators import create_offerer
 from pcapi.model_creators.generic_creators import create_provider
 from pcapi.model_creators.generic_creators import create_user
@@ -51,55 +61,209 @@ class RedisTest:
 
 
 class AddOfferIdTest:
-    def test_should_add_offer_id(self):
+    @patch("pcapi.connectors.redis.time.time", return_value=1620000000.0)
+    def test_should_add_offer_id(self, mock_time):
         # Given
         client = MagicMock()
-        client.rpush = MagicMock()
+        client.zadd = MagicMock(return_value=1)
+
+        # When
+        add_offer_id(client=client, offer_id=1)
+
+        # Then
+        client.zadd.assert_called_once_with("offer_ids_to_index", {1: 1620000000.0}, nx=True)
+        client.incr.assert_not_called()
+
+    def test_should_count_duplicate_when_offer_id_is_already_enqueued(self):
+        # Given
+        client = MagicMock()
+        client.zadd = MagicMock(return_value=0)
 
         # When
         add_offer_id(client=client, offer_id=1)
 
         # Then
-        client.rpush.assert_called_once_with("offer_ids", 1)
+        client.incr.assert_called_once_with("offer_ids_to_index_duplicates")
 
 
-class GetOfferIdsTest:
-    @patch("pcapi.settings.REDIS_OFFER_IDS_CHUNK_SIZE", return_value=1000)
-    def test_should_return_offer_ids_from_list(self, mock_redis_lrange_end):
+class AddOfferIdsTest:
+    @patch("pcapi.connectors.redis.time.time", return_value=1620000000.0)
+    def test_should_add_offer_ids_with_a_single_call(self, mock_time):
         # Given
         client = MagicMock()
-        client.lrange = MagicMock()
+        client.zadd = MagicMock(return_value=2)
 
         # When
-        get_offer_ids(client=client)
+        add_offer_ids(client=client, offer_ids=[1, 2])
 
         # Then
-        client.lrange.assert_called_once_with("offer_ids", 0, mock_redis_lrange_end)
+        client.zadd.assert_called_once_with("offer_ids_to_index", {1: 1620000000.0, 2: 1620000000.0}, nx=True)
+        client.incrby.assert_not_called()
 
-    def test_should_return_empty_array_when_exception(self):
+    def test_should_count_duplicates_when_offer_ids_are_already_enqueued(self):
         # Given
         client = MagicMock()
-        client.lrange = MagicMock()
-        client.lrange.side_effect = redis.exceptions.RedisError
+        client.zadd = MagicMock(return_value=1)
 
         # When
-        result = get_offer_ids(client=client)
+        add_offer_ids(client=client, offer_ids=[1, 2, 3])
 
         # Then
-        assert result == []
+        client.incrby.assert_called_once_with("offer_ids_to_index_duplicates", 2)
+
+    def test_should_not_call_redis_when_there_is_no_offer_id(self):
+        # Given
+        client = MagicMock()
+
+        # When
+        add_offer_ids(client=client, offer_ids=[])
+
+        # Then
+        client.zadd.assert_not_called()
 
 
-class DeleteOfferIdsTest:
-    def test_should_delete_given_range_of_offer_ids_from_redis(self):
+class AddPushUserIdsTest:
+    @patch("pcapi.connectors.redis.time.time", return_value=1620000000.0)
+    def test_should_add_user_ids_with_time_of_change(self, mock_time):
         # Given
         client = MagicMock()
-        client.ltrim = MagicMock()
 
         # When
-        delete_offer_ids(client=client)
+        add_push_user_ids(client=client, user_ids=[1, 2, 1])
+
+        # Then
+        client.zadd.assert_called_once_with("push_user_ids_to_update", {1: 1620000000.0, 2: 1620000000.0})
+
+    def test_should_not_call_redis_when_there_is_no_user_id(self):
+        # Given
+        client = MagicMock()
+
+        # When
+        add_push_user_ids(client=client, user_ids=[])
+
+        # Then
+        client.zadd.assert_not_called()
+
+
+class PopPushUserIdsTest:
+    def test_should_pop_user_ids_that_changed_before_given_time(self):
+        # Given
+        client = MagicMock()
+        client.zrangebyscore = MagicMock(return_value=["1", "2"])
+
+        # When
+        user_ids = pop_push_user_ids(client=client, changed_before=1620000000.0, count=2)
+
+        # Then
+        client.zrangebyscore.assert_called_once_with("push_user_ids_to_update", "-inf", 1620000000.0, start=0, num=2)
+        client.zrem.assert_called_once_with("push_user_ids_to_update", "1", "2")
+        assert user_ids == [1, 2]
+
+    def test_should_return_empty_list_when_exception(self):
+        # Given
+        client = MagicMock()
+        client.zrangebyscore = MagicMock(side_effect=redis.exceptions.RedisError)
+
+        # When
+        user_ids = pop_push_user_ids(client=client, changed_before=1620000000.0, count=2)
+
+        # Then
+        assert user_ids == []
+
+
+class PopOfferIdsTest:
+    @override_settings(REDIS_OFFER_IDS_CHUNK_SIZE=2)
+    def test_should_pop_offer_ids_in_enqueuing_order(self):
+        # Given
+        client = MagicMock()
+        client.zpopmin = MagicMock(return_value=[("1", 1620000000.0), ("2", 1620000001.0)])
+
+        # When
+        offer_ids = pop_offer_ids(client=client)
+
+        # Then
+        client.zpopmin.assert_called_once_with("offer_ids_to_index", 2)
+        assert offer_ids == ["1", "2"]
+
+    def test_should_return_empty_list_when_exception(self):
+        # Given
+        client = MagicMock()
+        client.zpopmin = MagicMock(side_effect=redis.exceptions.RedisError)
+
+        # When
+        offer_ids = pop_offer_ids(client=client)
+
+        # Then
+        assert offer_ids == []
+
+
+class MoveLegacyOfferIdsTest:
+    @override_settings(REDIS_OFFER_IDS_CHUNK_SIZE=2)
+    @patch("pcapi.connectors.redis.add_offer_ids")
+    def test_should_move_offer_ids_of_legacy_list_by_chunks(self, mocked_add_offer_ids):
+        # Given
+        client = MagicMock()
+        pipeline = client.pipeline.return_value
+        pipeline.execute.side_effect = [(["1", "2"], True), (["3"], True), ([], True)]
+
+        # When
+        moved = move_legacy_offer_ids(client=client)
+
+        # Then
+        assert moved == 3
+        pipeline.lrange.assert_called_with("offer_ids", 0, 1)
+        pipeline.ltrim.assert_called_with("offer_ids", 2, -1)
+        assert mocked_add_offer_ids.call_args_list == [call(client, ["1", "2"]), call(client, ["3"])]
+
+    def test_should_return_0_when_exception(self):
+        # Given
+        client = MagicMock()
+        client.pipeline.return_value.execute.side_effect = redis.exceptions.RedisError
+
+        # When
+        moved = move_legacy_offer_ids(client=client)
+
+        # Then
+        assert moved == 0
+
+
+class CountOfferIdsTest:
+    def test_should_return_queue_depth(self):
+        # Given
+        client = MagicMock()
+        client.zcard = MagicMock(return_value=12)
+
+        # When
+        count = count_offer_ids(client=client)
+
+        # Then
+        client.zcard.assert_called_once_with("offer_ids_to_index")
+        assert count == 12
+
+
+class PopOfferIdsDuplicatesCountTest:
+    def test_should_return_and_reset_duplicates_count(self):
+        # Given
+        client = MagicMock()
+        client.getset = MagicMock(return_value="5")
+
+        # When
+        count = pop_offer_ids_duplicates_count(client=client)
 
         # Then
-        client.ltrim.assert_called_once_with("offer_ids", 10000, -1)
+        client.getset.assert_called_once_with("offer_ids_to_index_duplicates", 0)
+        assert count == 5
+
+    def test_should_return_zero_when_counter_does_not_exist(self):
+        # Given
+        client = MagicMock()
+        client.getset = MagicMock(return_value=None)
+
+        # When
+        count = pop_offer_ids_duplicates_count(client=client)
+
+        # Then
+        assert count == 0
 
 
 class AddVenueIdTest:
@@ -357,6 +521,44 @@ class GetOfferDetailsTest:
         assert result == {}
 
 
+class GetOffersDetailsTest:
+    def test_should_return_details_of_indexed_offers_only(self):
+        # Given
+        client = MagicMock()
+        client.hmget = MagicMock()
+        client.hmget.return_value = ['{"name": "super offre 1"}', None, '{"name": "super offre 3"}']
+
+        # When
+        result = get_offers_details(client=client, offer_ids=[1, 2, 3])
+
+        # Then
+        client.hmget.assert_called_once_with("indexed_offers", [1, 2, 3])
+        assert result == {1: {"name": "super offre 1"}, 3: {"name": "super offre 3"}}
+
+    def test_should_not_call_redis_when_no_offer_ids(self):
+        # Given
+        client = MagicMock()
+
+        # When
+        result = get_offers_details(client=client, offer_ids=[])
+
+        # Then
+        client.hmget.assert_not_called()
+        assert result == {}
+
+    def test_should_return_empty_dict_when_exception(self):
+        # Given
+        client = MagicMock()
+        client.hmget = MagicMock()
+        client.hmget.side_effect = redis.exceptions.RedisError
+
+        # When
+        result = get_offers_details(client=client, offer_ids=[1, 2])
+
+        # Then
+        assert result == {}
+
+
 class DeleteAllIndexedOffersTest:
     def test_should_delete_all_indexed_offers(self):
         # Given
@@ -486,3 +688,43 @@ class DeleteOfferIdsInErrorTest:
 
         # Then
         client.ltrim.assert_called_once_with("offer_ids_in_error", 10000, -1)
+
+
+class PublishFeaturesInvalidationTest:
+    def test_should_publish_on_features_invalidation_channel(self):
+        # Given
+        client = MagicMock()
+
+        # When
+        publish_features_invalidation(client=client)
+
+        # Then
+        client.publish.assert_called_once_with("features_invalidation", 1)
+
+
+class SubscribeToFeaturesInvalidationTest:
+    @patch("pcapi.connectors.redis.redis.from_url")
+    def test_should_call_callback_on_each_message(self, mock_from_url):
+        # Given
+        pubsub = mock_from_url.return_value.pubsub.return_value
+        callback = MagicMock()
+
+        # When
+        subscribe_to_features_invalidation(callback)
+
+        # Then
+        pubsub.run_in_thread.assert_called_once_with(sleep_time=1, daemon=True)
+        handler = pubsub.subscribe.call_args.kwargs["features_invalidation"]
+        handler({"type": "message", "data": "1"})
+        callback.assert_called_once_with()
+
+    @patch("pcapi.connectors.redis.redis.from_url")
+    def test_should_not_fail_when_redis_is_unavailable(self, mock_from_url):
+        # Given
+        mock_from_url.return_value.pubsub.return_value.subscribe.side_effect = redis.exceptions.ConnectionError()
+
+        # When
+        thread = subscribe_to_features_invalidation(MagicMock())
+
+        # Then
+        assert thread is None
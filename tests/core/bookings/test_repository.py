@@ -8,9 +8,11 @@ import pytest
 from pytest import fixture
 
 import pcapi.core.bookings.factories as bookings_factories
+from pcapi.core.bookings.models import BookingCancellationReasons
 import pcapi.core.bookings.repository as booking_repository
 from pcapi.core.bookings.repository import find_by_pro_user_id
 import pcapi.core.offers.factories as offers_factories
+import pcapi.core.payments.factories as payments_factories
 import pcapi.core.users.factories as users_factories
 from pcapi.domain.booking_recap.booking_recap import BookBookingRecap
 from pcapi.domain.booking_recap.booking_recap import EventBookingRecap
@@ -28,6 +30,7 @@ from pcapi.model_creators.specific_creators import create_stock_from_offer
 from pcapi.model_creators.specific_creators import create_stock_with_event_offer
 from pcapi.model_creators.specific_creators import create_stock_with_thing_offer
 from pcapi.models import Booking
+from pcapi.models import db
 from pcapi.models.api_errors import ApiErrors
 from pcapi.models.api_errors import ResourceNotFoundError
 from pcapi.models.offer_type import ThingType
@@ -83,7 +86,7 @@ def test_find_not_cancelled_bookings_by_stock(app):
     assert set(all_not_cancelled_bookings) == {validated_booking, not_cancelled_booking}
 
 
-class FindPaymentEligibleBookingsForVenueTest:
+class FindBookingsEligibleForPaymentTest:
     @pytest.mark.usefixtures("db_session")
     def test_returns_used_past_event_and_thing_bookings_ordered_by_date_created(self, app: fixture):
         # Given
@@ -119,7 +122,7 @@ class FindPaymentEligibleBookingsForVenueTest:
         )
 
         # When
-        bookings = booking_repository.find_bookings_eligible_for_payment_for_venue(venue.id)
+        bookings = [row.Booking for row in booking_repository.find_bookings_eligible_for_payment(venue.id)]
 
         # Then
         assert len(bookings) == 2
@@ -127,6 +130,36 @@ class FindPaymentEligibleBookingsForVenueTest:
         assert bookings[1] == thing_booking
         assert future_event_booking not in bookings
 
+    @pytest.mark.usefixtures("db_session")
+    def test_returns_already_paid_bookings_once_and_first(self, app: fixture):
+        # Given
+        booking = bookings_factories.BookingFactory(isUsed=True, dateCreated=THREE_DAYS_AGO)
+        venue = booking.stock.offer.venue
+        paid_booking = bookings_factories.BookingFactory(
+            isUsed=True, dateCreated=TWO_DAYS_AGO, stock__offer__venue=venue
+        )
+        # e.g. a payment and its correction
+        payments_factories.PaymentFactory(booking=paid_booking)
+        payments_factories.PaymentFactory(booking=paid_booking)
+
+        # When
+        rows = booking_repository.find_bookings_eligible_for_payment(venue.id).all()
+
+        # Then
+        assert [(row.Booking, row.isAlreadyPaid) for row in rows] == [(paid_booking, True), (booking, False)]
+
+    @pytest.mark.usefixtures("db_session")
+    def test_find_venue_ids_with_bookings_eligible_for_payment(self, app: fixture):
+        # Given
+        used_booking = bookings_factories.BookingFactory(isUsed=True)
+        bookings_factories.BookingFactory(isUsed=False)
+
+        # When
+        venue_ids = booking_repository.find_venue_ids_with_bookings_eligible_for_payment()
+
+        # Then
+        assert venue_ids == [used_booking.stock.offer.venueId]
+
 
 class FindByTest:
     class ByTokenTest:
@@ -337,6 +370,36 @@ class FindAllNotUsedAndNotCancelledTest:
         assert bookings == [booking]
 
 
+class CancelBookingsAndUpdateStocksTest:
+    @pytest.mark.usefixtures("db_session")
+    def test_cancel_bookings_and_decrement_booked_quantity_of_their_stocks(self):
+        # Given
+        stock = offers_factories.StockFactory()
+        other_stock = offers_factories.StockFactory()
+        booking1 = bookings_factories.BookingFactory(stock=stock, quantity=2)
+        booking2 = bookings_factories.BookingFactory(stock=stock)
+        booking3 = bookings_factories.BookingFactory(stock=stock)
+        booking4 = bookings_factories.BookingFactory(stock=other_stock)
+        already_cancelled_booking = bookings_factories.BookingFactory(stock=other_stock, isCancelled=True)
+
+        # When
+        cancelled = booking_repository.cancel_bookings_and_update_stocks(
+            [booking1.id, booking2.id, booking4.id, already_cancelled_booking.id], BookingCancellationReasons.EXPIRED
+        )
+
+        # Then
+        assert cancelled == 3
+        db.session.expire_all()
+        assert booking1.isCancelled
+        assert booking1.cancellationReason == BookingCancellationReasons.EXPIRED
+        assert booking2.isCancelled
+        assert not booking3.isCancelled
+        assert booking4.isCancelled
+        assert already_cancelled_booking.cancellationReason is None
+        assert stock.dnBookedQuantity == 1
+        assert other_stock.dnBookedQuantity == 0
+
+
 class FindByTokenTest:
     @pytest.mark.usefixtures("db_session")
     def test_should_return_a_booking_when_valid_token_is_given(self, app: fixture):
@@ -986,6 +1049,67 @@ class FindByProUserIdTest:
         assert bookings_recap_paginated.bookings_recap[2].venue_name == venue_for_thing.publicName
 
 
+class FindByProUserIdWithCursorTest:
+    @pytest.mark.usefixtures("db_session")
+    def test_should_return_bookings_page_by_page_from_the_most_recent(self, app: fixture):
+        # Given
+        pro_user = users_factories.UserFactory()
+        stock = offers_factories.EventStockFactory()
+        offers_factories.UserOffererFactory(user=pro_user, offerer=stock.offer.venue.managingOfferer)
+        oldest_booking = bookings_factories.BookingFactory(stock=stock, dateCreated=datetime(2020, 1, 1))
+        duo_booking = bookings_factories.BookingFactory(stock=stock, dateCreated=datetime(2020, 1, 2), quantity=2)
+        most_recent_booking = bookings_factories.BookingFactory(stock=stock, dateCreated=datetime(2020, 1, 3))
+
+        # When
+        first_page = booking_repository.find_by_pro_user_id_with_cursor(user_id=pro_user.id, per_page_limit=2)
+        second_page = booking_repository.find_by_pro_user_id_with_cursor(
+            user_id=pro_user.id, cursor=first_page.next_cursor, per_page_limit=2
+        )
+
+        # Then
+        assert [booking_recap.booking_token for booking_recap in first_page.bookings_recap] == [
+            most_recent_booking.token,
+            duo_booking.token,
+            duo_booking.token,
+        ]
+        assert first_page.next_cursor == (datetime(2020, 1, 2), duo_booking.id)
+        assert [booking_recap.booking_token for booking_recap in second_page.bookings_recap] == [oldest_booking.token]
+        assert second_page.next_cursor is None
+
+    @pytest.mark.usefixtures("db_session")
+    def test_should_order_bookings_made_at_the_same_time_by_id(self, app: fixture):
+        # Given
+        pro_user = users_factories.UserFactory()
+        stock = offers_factories.ThingStockFactory()
+        offers_factories.UserOffererFactory(user=pro_user, offerer=stock.offer.venue.managingOfferer)
+        bookings = bookings_factories.BookingFactory.create_batch(3, stock=stock, dateCreated=datetime(2020, 1, 1))
+
+        # When
+        bookings_recap = list(booking_repository.iterate_by_pro_user_id(user_id=pro_user.id, batch_size=1))
+
+        # Then
+        expected_tokens = [booking.token for booking in sorted(bookings, key=lambda booking: -booking.id)]
+        assert [booking_recap.booking_token for booking_recap in bookings_recap] == expected_tokens
+
+    @pytest.mark.usefixtures("db_session")
+    def test_should_iterate_over_the_same_bookings_as_paginated_list(self, app: fixture):
+        # Given
+        pro_user = users_factories.UserFactory()
+        stock = offers_factories.EventStockFactory()
+        offers_factories.UserOffererFactory(user=pro_user, offerer=stock.offer.venue.managingOfferer)
+        for day in range(1, 6):
+            bookings_factories.BookingFactory(stock=stock, dateCreated=datetime(2020, 1, day), quantity=day % 2 + 1)
+
+        # When
+        bookings_recap = list(booking_repository.iterate_by_pro_user_id(user_id=pro_user.id, batch_size=2))
+
+        # Then
+        bookings_recap_paginated = find_by_pro_user_id(user_id=pro_user.id)
+        assert [booking_recap.booking_token for booking_recap in bookings_recap] == [
+            booking_recap.booking_token for booking_recap in bookings_recap_paginated.bookings_recap
+        ]
+
+
 class FindSoonToBeExpiredBookingsTest:
     @pytest.mark.usefixtures("db_session")
     def test_should_return_only_soon_to_be_expired_bookings(self, app: fixture):
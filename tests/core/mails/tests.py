@@ -53,6 +53,16 @@ class SendTest:
             assert posted.last_request.json() == expected
         assert successful
 
+    def test_send_many(self):
+        messages = [(["recipient1@example.com"], {"key": "value1"}), (["recipient2@example.com"], {"key": "value2"})]
+
+        results = mails.send_many(messages=messages)
+
+        assert results == [True, True]
+        emails = Email.query.order_by(Email.id).all()
+        assert [email.content["To"] for email in emails] == ["recipient1@example.com", "recipient2@example.com"]
+        assert {email.status for email in emails} == {EmailStatus.SENT}
+
 
 class MailingListFunctionsTest:
     @override_settings(EMAIL_BACKEND="pcapi.core.mails.backends.mailjet.MailjetBackend")
@@ -134,6 +144,32 @@ class MailjetBackendTest:
             result = backend.send_mail(recipients=self.recipients, data=self.data)
         assert not result.successful
 
+    def test_send_mails_in_batches(self):
+        backend = self._get_backend()
+        messages = [([f"recipient{i}@example.com"], copy.deepcopy(self.data)) for i in range(51)]
+        with requests_mock.Mocker() as mock:
+            posted = mock.post("https://api.eu.mailjet.com/v3/send")
+            results = backend.send_mails(messages)
+
+        assert posted.call_count == 2
+        first_batch = posted.request_history[0].json()["Messages"]
+        assert len(first_batch) == 50
+        assert first_batch[0] == dict(self.expected_sent_data, To="recipient0@example.com")
+        assert [message["To"] for message in posted.request_history[1].json()["Messages"]] == [
+            "recipient50@example.com"
+        ]
+        assert len(results) == 51
+        assert all(result.successful for result in results)
+
+    def test_send_mails_with_error_response(self):
+        backend = self._get_backend()
+        messages = [([f"recipient{i}@example.com"], copy.deepcopy(self.data)) for i in range(2)]
+        with requests_mock.Mocker() as mock:
+            mock.post("https://api.eu.mailjet.com/v3/send", status_code=400)
+            results = backend.send_mails(messages)
+
+        assert [result.successful for result in results] == [False, False]
+
     def test_create_contact(self):
         backend = self._get_backend()
         with requests_mock.Mocker() as mock:
@@ -204,6 +240,20 @@ class ToDevMailjetBackendTest:
         assert posted.last_request.json() == expected
         assert result.successful
 
+    @override_settings(WHITELISTED_EMAIL_RECIPIENTS=["whitelisted@example.com"])
+    def test_send_mails_overrides_recipients(self):
+        backend = self._get_backend()
+        messages = [
+            (self.recipients, copy.deepcopy(self.data)),
+            (["whitelisted@example.com"], copy.deepcopy(self.data)),
+        ]
+        with requests_mock.Mocker() as mock:
+            posted = mock.post("https://api.eu.mailjet.com/v3/send")
+            backend.send_mails(messages)
+
+        posted_messages = posted.last_request.json()["Messages"]
+        assert [message["To"] for message in posted_messages] == ["dev@example.com", "whitelisted@example.com"]
+
     @override_settings(WHITELISTED_EMAIL_RECIPIENTS=["false1@example.com", "real2@example.com"])
     def test_send_mail_if_any_recipient_is_whitelisted(self):
         backend = self._get_backend()
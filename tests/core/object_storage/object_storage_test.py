@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
 from unittest.mock import patch
 
 import pytest
@@ -5,9 +7,13 @@ import pytest
 from pcapi.core.object_storage import BACKENDS_MAPPING
 from pcapi.core.object_storage import _check_backend_setting
 from pcapi.core.object_storage import _check_backends_module_paths
+from pcapi.core.object_storage import _get_backend
 from pcapi.core.object_storage import build_thumb_path
 from pcapi.core.object_storage import delete_public_object
 from pcapi.core.object_storage import store_public_object
+from pcapi.core.object_storage import store_public_objects
+from pcapi.core.object_storage.backends.base import ThreadLocalClient
+from pcapi.core.object_storage.backends.ovh import OVHBackend
 from pcapi.core.offers.models import Mediation
 from pcapi.core.testing import override_settings
 from pcapi.models.product import Product
@@ -41,6 +47,53 @@ class StorePublicObjectTest:
         mock_gcp_store_public_object.assert_called_once_with("bucket", "object_id", b"mouette", "image/jpeg", None)
 
 
+class StorePublicObjectsTest:
+    @override_settings(OBJECT_STORAGE_PROVIDER="OVH,GCP")
+    @patch("pcapi.core.object_storage.backends.ovh.OVHBackend.store_public_object")
+    @patch("pcapi.core.object_storage.backends.gcp.GCPBackend.store_public_object")
+    def test_stores_each_object_in_each_backend(self, mock_gcp_store_public_object, mock_ovh_store_public_object):
+        store_public_objects("bucket", {"object_1": b"mouette", "object_2": b"goeland"}, "image/jpeg")
+
+        for mock_store_public_object in (mock_ovh_store_public_object, mock_gcp_store_public_object):
+            assert sorted(call.args for call in mock_store_public_object.call_args_list) == [
+                ("bucket", "object_1", b"mouette", "image/jpeg", None),
+                ("bucket", "object_2", b"goeland", "image/jpeg", None),
+            ]
+
+    @override_settings(OBJECT_STORAGE_PROVIDER="OVH")
+    @patch("pcapi.core.object_storage.backends.ovh.OVHBackend.store_public_object")
+    def test_raises_error_once_other_objects_are_stored(self, mock_ovh_store_public_object):
+        def fail_on_first_object(bucket, object_id, blob, content_type, symlink_path):  # pylint: disable=unused-argument
+            if object_id == "object_1":
+                raise ValueError()
+
+        mock_ovh_store_public_object.side_effect = fail_on_first_object
+
+        with pytest.raises(ValueError):
+            store_public_objects("bucket", {"object_1": b"mouette", "object_2": b"goeland"}, "image/jpeg")
+
+        assert mock_ovh_store_public_object.call_count == 2
+
+
+class BackendClientsTest:
+    def test_backends_are_instantiated_once(self):
+        backend_path = BACKENDS_MAPPING["OVH"]
+
+        assert _get_backend(backend_path) is _get_backend(backend_path)
+
+    def test_swift_connection_is_reused_in_a_thread(self):
+        mock_connection = MagicMock()
+        backend = OVHBackend()
+        with patch.object(OVHBackend, "_swift_connection", ThreadLocalClient(mock_connection)):
+            backend.store_public_object("bucket", "object_1", b"mouette", "image/jpeg")
+            backend.store_public_object("bucket", "object_2", b"goeland", "image/jpeg")
+            other_thread_connection = ThreadPoolExecutor(1).submit(backend.swift_con).result()
+
+        assert mock_connection.call_count == 2
+        assert other_thread_connection is mock_connection.return_value
+        assert mock_connection.return_value.put_object.call_count == 2
+
+
 class CheckBackendSettingTest:
     @override_settings(OBJECT_STORAGE_PROVIDER="")
     def test_empty_setting(self):
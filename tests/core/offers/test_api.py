@@ -955,8 +955,8 @@ class UpdateOfferTest:
 
 @pytest.mark.usefixtures("db_session")
 class UpdateOffersActiveStatusTest:
-    @mock.patch("pcapi.connectors.redis.add_offer_id")
-    def test_activate(self, mocked_add_offer_id):
+    @mock.patch("pcapi.connectors.redis.add_offer_ids")
+    def test_activate(self, mocked_add_offer_ids):
         offer1 = factories.OfferFactory(isActive=False)
         offer2 = factories.OfferFactory(isActive=False)
         offer3 = factories.OfferFactory(isActive=False)
@@ -969,14 +969,9 @@ class UpdateOffersActiveStatusTest:
         assert models.Offer.query.get(offer2.id).isActive
         assert not models.Offer.query.get(offer3.id).isActive
         assert not models.Offer.query.get(rejected_offer.id).isActive
-        assert mocked_add_offer_id.call_count == 2
-        mocked_add_offer_id.assert_has_calls(
-            [
-                mock.call(client=app.redis_client, offer_id=offer1.id),
-                mock.call(client=app.redis_client, offer_id=offer2.id),
-            ],
-            any_order=True,
-        )
+        mocked_add_offer_ids.assert_called_once()
+        assert mocked_add_offer_ids.call_args.kwargs["client"] == app.redis_client
+        assert set(mocked_add_offer_ids.call_args.kwargs["offer_ids"]) == {offer1.id, offer2.id}
 
     def test_deactivate(self):
         offer1 = factories.OfferFactory()
@@ -1029,8 +1024,8 @@ class OfferExpenseDomainsTest:
 
 @pytest.mark.usefixtures("db_session")
 class AddCriterionToOffersTest:
-    @mock.patch("pcapi.connectors.redis.add_offer_id")
-    def test_add_criteria(self, mocked_add_offer_id):
+    @mock.patch("pcapi.connectors.redis.add_offer_ids")
+    def test_add_criteria(self, mocked_add_offer_ids):
         # Given
         isbn = "2-221-00164-8"
         product1 = ProductFactory(extraData={"isbn": "2221001648"})
@@ -1053,16 +1048,11 @@ class AddCriterionToOffersTest:
         assert offer21.criteria == [criterion1, criterion2]
         assert not inactive_offer.criteria
         assert not unmatched_offer.criteria
-        # fmt: off
-        reindexed_offer_ids = {
-            mocked_add_offer_id.call_args_list[i][1]["offer_id"]
-            for i in range(mocked_add_offer_id.call_count)
-        }
-        # fmt: on
-        assert reindexed_offer_ids == {offer11.id, offer12.id, offer21.id}
+        mocked_add_offer_ids.assert_called_once()
+        assert set(mocked_add_offer_ids.call_args.kwargs["offer_ids"]) == {offer11.id, offer12.id, offer21.id}
 
-    @mock.patch("pcapi.connectors.redis.add_offer_id")
-    def test_add_criteria_when_no_offers_is_found(self, mocked_add_offer_id):
+    @mock.patch("pcapi.connectors.redis.add_offer_ids")
+    def test_add_criteria_when_no_offers_is_found(self, mocked_add_offer_ids):
         # Given
         isbn = "2-221-00164-8"
         OfferFactory(extraData={"isbn": "2221001647"})
@@ -1076,9 +1066,9 @@ class AddCriterionToOffersTest:
 
 
 class DeactivateInappropriateProductTest:
-    @mock.patch("pcapi.connectors.redis.add_offer_id")
+    @mock.patch("pcapi.connectors.redis.add_offer_ids")
     @pytest.mark.usefixtures("db_session")
-    def test_should_deactivate_product_with_inappropriate_content(self, mocked_add_offer_id):
+    def test_should_deactivate_product_with_inappropriate_content(self, mocked_add_offer_ids):
         # Given
         product1 = ThingProductFactory(extraData={"isbn": "isbn-de-test"})
         product2 = ThingProductFactory(extraData={"isbn": "isbn-de-test"})
@@ -1095,8 +1085,8 @@ class DeactivateInappropriateProductTest:
 
         assert not any(product.isGcuCompatible for product in products)
         assert not any(offer.isActive for offer in offers)
-        for o in offers:
-            mocked_add_offer_id.assert_any_call(client=app.redis_client, offer_id=o.id)
+        mocked_add_offer_ids.assert_called_once()
+        assert set(mocked_add_offer_ids.call_args.kwargs["offer_ids"]) == {o.id for o in offers}
 
 
 @pytest.mark.usefixtures("db_session")
@@ -1209,6 +1209,31 @@ class CheckStockConsistenceTest:
         stock_ids = set(check_stock_consistency())
         assert stock_ids == {stock2.id, stock4.id, stock6.id}
 
+    def test_only_check_stocks_modified_since_given_date(self):
+        # Given
+        last_check = datetime.utcnow() - timedelta(hours=1)
+        before_last_check = last_check - timedelta(days=1)
+        # inconsistent stocks modified before the last check
+        offers_factories.StockFactory(dnBookedQuantity=5, dateModified=before_last_check)
+        old_booking = bookings_factories.BookingFactory(
+            dateCreated=before_last_check, stock__dateModified=before_last_check
+        )
+        old_booking.stock.dnBookedQuantity = 5
+        # inconsistent stock with a booking created since the last check
+        new_booking = bookings_factories.BookingFactory(stock__dateModified=before_last_check)
+        new_booking.stock.dnBookedQuantity = 5
+        # inconsistent stock modified since the last check
+        modified_stock = offers_factories.StockFactory(dnBookedQuantity=5)
+        # inconsistent stock with a booking cancelled since the last check
+        cancelled_booking = bookings_factories.BookingFactory(
+            dateCreated=before_last_check, stock__dateModified=before_last_check, isCancelled=True
+        )
+        cancelled_booking.stock.dnBookedQuantity = 1
+        repository.save(old_booking.stock, new_booking.stock, cancelled_booking.stock)
+
+        stock_ids = set(check_stock_consistency(modified_since=last_check))
+        assert stock_ids == {new_booking.stock.id, modified_stock.id, cancelled_booking.stock.id}
+
 
 @pytest.mark.usefixtures("db_session")
 class TomorrowStockTest:
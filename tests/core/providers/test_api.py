@@ -56,8 +56,8 @@ class SynchronizeStocksTest:
     @pytest.mark.usefixtures("db_session")
     @freeze_time("2020-10-15 09:00:00")
     @override_features(SYNCHRONIZE_ALGOLIA=True)
-    @mock.patch("pcapi.connectors.redis.add_offer_id")
-    def test_execution(self, mocked_add_offer_id):
+    @mock.patch("pcapi.connectors.redis.add_offer_ids")
+    def test_execution(self, mocked_add_offer_ids):
         # Given
         spec = [
             {"ref": "3010000101789", "available": 6},
@@ -133,17 +133,17 @@ class SynchronizeStocksTest:
         assert created_offer.lastProviderId == provider.id
 
         # Test it adds offer in redis
-        assert mocked_add_offer_id.call_count == 5
-        mocked_add_offer_id.assert_has_calls(
-            [
-                mock.call(client=app.redis_client, offer_id=offer.id),
-                mock.call(client=app.redis_client, offer_id=stock_with_booking.offer.id),
-                mock.call(client=app.redis_client, offer_id=created_offer.id),
-                mock.call(client=app.redis_client, offer_id=second_created_offer.id),
-                mock.call(client=app.redis_client, offer_id=stock.offer.id),
-            ],
-            any_order=True,
-        )
+        reindexed_offer_ids = set()
+        for call in mocked_add_offer_ids.call_args_list:
+            assert call.kwargs["client"] == app.redis_client
+            reindexed_offer_ids.update(call.kwargs["offer_ids"])
+        assert reindexed_offer_ids == {
+            offer.id,
+            stock_with_booking.offer.id,
+            created_offer.id,
+            second_created_offer.id,
+            stock.offer.id,
+        }
 
     def test_build_new_offers_from_stock_details(self, db_session):
         # Given
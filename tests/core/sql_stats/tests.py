@@ -0,0 +1,90 @@
+import logging
+
+import pytest
+import sqlalchemy
+
+from pcapi.core import sql_stats
+from pcapi.core.testing import override_settings
+
+
+@pytest.fixture(name="engine")
+def engine_fixture():
+    sql_stats.install_sql_stats()
+    engine = sqlalchemy.create_engine("sqlite://")
+    engine.execute("CREATE TABLE item (id INTEGER PRIMARY KEY)")
+    yield engine
+    engine.dispose()
+
+
+class GetFingerprintTest:
+    def test_normalize_whitespace(self):
+        statement = "SELECT item.id \nFROM item \nWHERE item.id = %(id_1)s"
+
+        assert sql_stats.get_fingerprint(statement) == "SELECT item.id FROM item WHERE item.id = %(id)s"
+
+    def test_normalize_in_clauses(self):
+        short = sql_stats.get_fingerprint("SELECT 1 FROM item WHERE item.id IN (%(id_1)s, %(id_2)s)")
+        long = sql_stats.get_fingerprint("SELECT 1 FROM item WHERE item.id IN (%(id_1)s, %(id_2)s, %(id_3)s)")
+
+        assert short == long == "SELECT 1 FROM item WHERE item.id IN (%(id)s, ...)"
+
+
+class RecordQueriesTest:
+    def test_record_queries(self, engine):
+        with sql_stats.record_queries() as stats:
+            for item_id in range(3):
+                engine.execute("SELECT * FROM item WHERE id = ?", item_id)
+            engine.execute("SELECT count(*) FROM item")
+
+        engine.execute("SELECT count(*) FROM item")  # not recorded
+
+        assert stats.count == 4
+        assert stats.duration > 0
+        assert stats.get_repeated_statements() == [("SELECT * FROM item WHERE id = ?", 3)]
+        extra = stats.as_log_extra()
+        assert extra["sqlQueries"] == 4
+        assert extra["sqlRepeatedStatements"] == [{"statement": "SELECT * FROM item WHERE id = ?", "count": 3}]
+
+    def test_nested_recording(self, engine):
+        with sql_stats.record_queries() as outer_stats:
+            engine.execute("SELECT count(*) FROM item")
+            with sql_stats.record_queries() as inner_stats:
+                engine.execute("SELECT count(*) FROM item")
+
+        assert outer_stats.count == 2
+        assert inner_stats.count == 1
+
+
+class WarnIfThresholdsExceededTest:
+    @override_settings(SQL_QUERIES_WARNING_THRESHOLD=2, SQL_REPEATED_QUERIES_WARNING_THRESHOLD=0)
+    def test_warn_about_too_many_queries(self, engine, caplog):
+        with sql_stats.record_queries() as stats:
+            for _ in range(3):
+                engine.execute("SELECT count(*) FROM item")
+
+        with caplog.at_level(logging.WARNING):
+            sql_stats.warn_if_thresholds_exceeded(stats, "some job")
+
+        assert [record.getMessage() for record in caplog.records] == ["Too many SQL queries (3) in some job"]
+
+    @override_settings(SQL_QUERIES_WARNING_THRESHOLD=0, SQL_REPEATED_QUERIES_WARNING_THRESHOLD=2)
+    def test_warn_about_repeated_queries(self, engine, caplog):
+        with sql_stats.record_queries() as stats:
+            for item_id in range(3):
+                engine.execute("SELECT * FROM item WHERE id = ?", item_id)
+
+        with caplog.at_level(logging.WARNING):
+            sql_stats.warn_if_thresholds_exceeded(stats, "some job")
+
+        assert [record.getMessage() for record in caplog.records] == ["Same SQL query repeated 3 times in some job"]
+
+    @override_settings(SQL_QUERIES_WARNING_THRESHOLD=0, SQL_REPEATED_QUERIES_WARNING_THRESHOLD=0)
+    def test_thresholds_are_disabled_by_default(self, engine, caplog):
+        with sql_stats.record_queries() as stats:
+            for _ in range(3):
+                engine.execute("SELECT count(*) FROM item")
+
+        with caplog.at_level(logging.WARNING):
+            sql_stats.warn_if_thresholds_exceeded(stats, "some job")
+
+        assert caplog.records == []
@@ -604,6 +604,32 @@ class DomainsCreditTest:
             physical=None,
         )
 
+    def test_get_domains_credit_with_duo_and_empty_url_bookings(self):
+        user = users_factories.UserFactory(deposit__version=1)
+
+        # duo booking in digital domain
+        booking_factories.BookingFactory(
+            user=user,
+            amount=30,
+            quantity=2,
+            stock__offer__type=str(ThingType.JEUX_VIDEO),
+            stock__offer__url="http://on.line",
+        )
+
+        # booking in physical domain, an empty url is not digital
+        booking_factories.BookingFactory(
+            user=user,
+            amount=40,
+            stock__offer__type=str(ThingType.JEUX),
+            stock__offer__url="",
+        )
+
+        assert get_domains_credit(user) == DomainsCredit(
+            all=Credit(initial=Decimal(500), remaining=Decimal(400)),
+            digital=Credit(initial=Decimal(200), remaining=Decimal(140)),
+            physical=Credit(initial=Decimal(200), remaining=Decimal(160)),
+        )
+
     def test_get_domains_credit_deposit_expired(self):
         user = users_factories.UserFactory(deposit__version=2)
         booking_factories.BookingFactory(
@@ -2,7 +2,6 @@ from datetime import datetime
 from decimal import Decimal
 import uuid
 
-from freezegun import freeze_time
 import pytest
 
 from pcapi.core.offerers.models import Offerer
@@ -10,12 +9,9 @@ from pcapi.domain.payments import UnmatchedPayments
 from pcapi.domain.payments import apply_banishment
 from pcapi.domain.payments import create_all_payments_details
 from pcapi.domain.payments import create_payment_details
-from pcapi.domain.payments import create_payment_for_booking
-from pcapi.domain.payments import filter_out_already_paid_for_bookings
-from pcapi.domain.payments import filter_out_bookings_without_cost
+from pcapi.domain.payments import create_payment_values_for_booking
 from pcapi.domain.payments import group_payments_by_status
 from pcapi.domain.payments import keep_only_not_processable_payments
-from pcapi.domain.payments import keep_only_pending_payments
 from pcapi.domain.payments import make_transaction_label
 from pcapi.domain.reimbursement import BookingReimbursement
 from pcapi.domain.reimbursement import ReimbursementRules
@@ -30,13 +26,11 @@ from pcapi.model_creators.specific_creators import create_offer_with_thing_produ
 from pcapi.models import Booking
 from pcapi.models import Offer
 from pcapi.models import Venue
-from pcapi.models.payment import Payment
 from pcapi.models.payment_status import TransactionStatus
 from pcapi.utils.human_ids import humanize
 
 
-@freeze_time("2018-10-15 09:21:34")
-def test_create_payment_for_booking_with_common_information(app):
+def test_create_payment_values_for_booking_with_common_information(app):
     # given
     user = create_user()
     stock = create_stock(price=10, quantity=5)
@@ -49,19 +43,19 @@ def test_create_payment_for_booking_with_common_information(app):
     booking_reimbursement = BookingReimbursement(booking, ReimbursementRules.PHYSICAL_OFFERS, Decimal(10))
 
     # when
-    payment = create_payment_for_booking(booking_reimbursement)
+    payment_values = create_payment_values_for_booking(booking_reimbursement, "some transaction label")
 
     # then
-    assert payment.booking == booking
-    assert payment.amount == Decimal(10)
-    assert payment.reimbursementRule == ReimbursementRules.PHYSICAL_OFFERS.value.description
-    assert payment.reimbursementRate == ReimbursementRules.PHYSICAL_OFFERS.value.rate
-    assert payment.comment is None
-    assert payment.author == "batch"
-    assert payment.transactionLabel == "pass Culture Pro - remboursement 2nde quinzaine 10-2018"
+    assert payment_values["bookingId"] == booking.id
+    assert payment_values["amount"] == Decimal(10)
+    assert payment_values["reimbursementRule"] == ReimbursementRules.PHYSICAL_OFFERS.value.description
+    assert payment_values["reimbursementRate"] == ReimbursementRules.PHYSICAL_OFFERS.value.rate
+    assert "comment" not in payment_values
+    assert payment_values["author"] == "batch"
+    assert payment_values["transactionLabel"] == "some transaction label"
 
 
-def test_create_payment_for_booking_when_iban_is_on_venue_should_take_payment_info_from_venue(app):
+def test_create_payment_values_for_booking_when_iban_is_on_venue_should_take_payment_info_from_venue(app):
     # given
     user = create_user()
     stock = create_stock(price=10, quantity=5)
@@ -81,14 +75,14 @@ def test_create_payment_for_booking_when_iban_is_on_venue_should_take_payment_in
     booking_reimbursement = BookingReimbursement(booking, ReimbursementRules.PHYSICAL_OFFERS, Decimal(10))
 
     # when
-    payment = create_payment_for_booking(booking_reimbursement)
+    payment_values = create_payment_values_for_booking(booking_reimbursement, "some transaction label")
 
     # then
-    assert payment.iban == "KD98765RFGHZ788"
-    assert payment.bic == "LOKIJU76"
+    assert payment_values["iban"] == "KD98765RFGHZ788"
+    assert payment_values["bic"] == "LOKIJU76"
 
 
-def test_create_payment_for_booking_when_no_iban_on_venue_should_take_payment_info_from_offerer(app):
+def test_create_payment_values_for_booking_when_no_iban_on_venue_should_take_payment_info_from_offerer(app):
     # given
     user = create_user()
     stock = create_stock(price=10, quantity=5)
@@ -105,14 +99,14 @@ def test_create_payment_for_booking_when_no_iban_on_venue_should_take_payment_in
     booking_reimbursement = BookingReimbursement(booking, ReimbursementRules.PHYSICAL_OFFERS, Decimal(10))
 
     # when
-    payment = create_payment_for_booking(booking_reimbursement)
+    payment_values = create_payment_values_for_booking(booking_reimbursement, "some transaction label")
 
     # then
-    assert payment.iban == "CF13QSDFGH456789"
-    assert payment.bic == "QSDFGH8Z555"
+    assert payment_values["iban"] == "CF13QSDFGH456789"
+    assert payment_values["bic"] == "QSDFGH8Z555"
 
 
-def test_create_payment_for_booking_takes_recipient_name_and_siren_from_offerer(app):
+def test_create_payment_values_for_booking_takes_recipient_name_and_siren_from_offerer(app):
     # given
     user = create_user()
     stock = create_stock(price=10, quantity=5)
@@ -129,170 +123,11 @@ def test_create_payment_for_booking_takes_recipient_name_and_siren_from_offerer(
     booking_reimbursement = BookingReimbursement(booking, ReimbursementRules.PHYSICAL_OFFERS, Decimal(10))
 
     # when
-    payment = create_payment_for_booking(booking_reimbursement)
+    payment_values = create_payment_values_for_booking(booking_reimbursement, "some transaction label")
 
     # then
-    assert payment.recipientName == "Test Offerer"
-    assert payment.recipientSiren == "123456789"
-
-
-def test_create_payment_for_booking_with_not_processable_status_when_no_bank_information_linked_to_venue_or_offerer():
-    # given
-    user = create_user()
-    stock = create_stock(price=10, quantity=5)
-    booking = create_booking(user=user, quantity=1, stock=stock)
-    booking.stock.offer = Offer()
-    booking.stock.offer.venue = Venue()
-    booking.stock.offer.venue.managingOfferer = create_offerer(name="Test Offerer")
-    booking_reimbursement = BookingReimbursement(booking, ReimbursementRules.PHYSICAL_OFFERS, Decimal(10))
-
-    # when
-    payment = create_payment_for_booking(booking_reimbursement)
-
-    # then
-    assert len(payment.statuses) == 1
-    assert payment.statuses[0].status == TransactionStatus.NOT_PROCESSABLE
-    assert payment.statuses[0].detail == "IBAN et BIC manquants sur l'offreur"
-
-
-@freeze_time("2018-10-15 09:21:34")
-def test_create_payment_for_booking_with_pending_status(app):
-    # given
-    user = create_user()
-    stock = create_stock(price=10, quantity=5)
-    booking = create_booking(user=user, quantity=1, stock=stock)
-    booking.stock.offer = Offer()
-    booking.stock.offer.venue = Venue()
-    offerer = create_offerer()
-    booking.stock.offer.venue.managingOfferer = offerer
-    create_bank_information(bic="QSDFGH8Z555", iban="CF13QSDFGH456789", offerer=offerer)
-    booking_reimbursement = BookingReimbursement(booking, ReimbursementRules.PHYSICAL_OFFERS, Decimal(10))
-
-    # when
-    payment = create_payment_for_booking(booking_reimbursement)
-
-    # then
-    assert len(payment.statuses) == 1
-    assert payment.statuses[0].status == TransactionStatus.PENDING
-    assert payment.statuses[0].detail is None
-    assert payment.statuses[0].date == datetime(2018, 10, 15, 9, 21, 34)
-
-
-class FilterOutAlreadyPaidForBookingsTest:
-    def test_it_returns_reimbursements_on_bookings_with_no_existing_payments(self):
-        # Given
-        booking_paid = Booking()
-        booking_paid.payments = [Payment()]
-        booking_reimbursement1 = BookingReimbursement(booking_paid, ReimbursementRules.PHYSICAL_OFFERS, Decimal(10))
-        booking_not_paid = Booking()
-        booking_reimbursement2 = BookingReimbursement(booking_not_paid, ReimbursementRules.PHYSICAL_OFFERS, Decimal(10))
-        booking_reimbursements = [booking_reimbursement1, booking_reimbursement2]
-
-        # When
-        bookings_not_paid = filter_out_already_paid_for_bookings(booking_reimbursements)
-
-        # Then
-        assert len(bookings_not_paid) == 1
-        assert not bookings_not_paid[0].booking.payments
-
-    def test_it_returns_an_empty_list_if_everything_has_been_reimbursed(self):
-        # Given
-        booking_paid1 = Booking()
-        booking_paid1.payments = [Payment()]
-        booking_reimbursement1 = BookingReimbursement(booking_paid1, ReimbursementRules.PHYSICAL_OFFERS, Decimal(10))
-
-        booking_paid2 = Booking()
-        booking_paid2.payments = [Payment()]
-        booking_reimbursement2 = BookingReimbursement(booking_paid2, ReimbursementRules.PHYSICAL_OFFERS, Decimal(10))
-
-        # When
-        bookings_not_paid = filter_out_already_paid_for_bookings([booking_reimbursement1, booking_reimbursement2])
-
-        # Then
-        assert bookings_not_paid == []
-
-    def test_it_returns_an_empty_list_if_an_empty_list_is_given(self):
-        # When
-        bookings_not_paid = filter_out_already_paid_for_bookings([])
-
-        # Then
-        assert bookings_not_paid == []
-
-
-class FilterOutBookingsWithoutCost:
-    def test_it_returns_reimbursements_on_bookings_with_reimbursed_value_greater_than_zero(self):
-        # given
-        reimbursement1 = BookingReimbursement(Booking(), ReimbursementRules.PHYSICAL_OFFERS, Decimal(10))
-        reimbursement2 = BookingReimbursement(Booking(), ReimbursementRules.PHYSICAL_OFFERS, Decimal(0))
-
-        # when
-        bookings_reimbursements_with_cost = filter_out_bookings_without_cost([reimbursement1, reimbursement2])
-
-        # then
-        assert len(bookings_reimbursements_with_cost) == 1
-        assert bookings_reimbursements_with_cost[0].reimbursed_amount > Decimal(0)
-
-    def test_it_returns_an_empty_list_if_everything_has_a_cost(self):
-        # given
-        reimbursement1 = BookingReimbursement(Booking(), ReimbursementRules.PHYSICAL_OFFERS, Decimal(0))
-        reimbursement2 = BookingReimbursement(Booking(), ReimbursementRules.PHYSICAL_OFFERS, Decimal(0))
-
-        # when
-        bookings_reimbursements_with_cost = filter_out_bookings_without_cost([reimbursement1, reimbursement2])
-
-        # then
-        assert bookings_reimbursements_with_cost == []
-
-    def test_it_returns_an_empty_list_if_an_empty_list_is_given(self):
-        # when
-        bookings_reimbursements_with_cost = filter_out_bookings_without_cost([])
-
-        # then
-        assert bookings_reimbursements_with_cost == []
-
-
-class KeepOnlyPendingPaymentsTest:
-    def test_it_returns_only_payments_with_current_status_as_pending(self):
-        # given
-        user = create_user()
-        booking = create_booking(user=user)
-        offerer = create_offerer()
-        payments = [
-            create_payment(booking, offerer, 30, status=TransactionStatus.PENDING),
-            create_payment(booking, offerer, 30, status=TransactionStatus.NOT_PROCESSABLE),
-            create_payment(booking, offerer, 30, status=TransactionStatus.ERROR),
-        ]
-
-        # when
-        pending_payments = keep_only_pending_payments(payments)
-
-        # then
-        assert len(pending_payments) == 1
-        assert pending_payments[0].currentStatus.status == TransactionStatus.PENDING
-
-    def test_it_returns_an_empty_list_if_everything_has_no_pending_payment(self):
-        # given
-        user = create_user()
-        booking = create_booking(user=user)
-        offerer = create_offerer()
-        payments = [
-            create_payment(booking, offerer, 30, status=TransactionStatus.SENT),
-            create_payment(booking, offerer, 30, status=TransactionStatus.SENT),
-            create_payment(booking, offerer, 30, status=TransactionStatus.ERROR),
-        ]
-
-        # when
-        pending_payments = keep_only_pending_payments(payments)
-
-        # then
-        assert pending_payments == []
-
-    def test_it_returns_an_empty_list_if_an_empty_list_is_given(self):
-        # when
-        pending_payments = keep_only_pending_payments([])
-
-        # then
-        assert pending_payments == []
+    assert payment_values["recipientName"] == "Test Offerer"
+    assert payment_values["recipientSiren"] == "123456789"
 
 
 class KeepOnlyNotProcessablePaymentsTest:
@@ -1,6 +1,7 @@
 from datetime import datetime
 from datetime import timedelta
 from decimal import Decimal
+import random
 
 import pytest
 
@@ -8,10 +9,16 @@ import pcapi.core.bookings.factories as bookings_factories
 import pcapi.core.offers.factories as offers_factories
 import pcapi.core.users.factories as users_factories
 from pcapi.domain.reimbursement import RULES
+from pcapi.domain.reimbursement import ReimbursableBookings
 from pcapi.domain.reimbursement import ReimbursementRule
 from pcapi.domain.reimbursement import ReimbursementRules
 from pcapi.domain.reimbursement import find_all_booking_reimbursements
+from pcapi.domain.reimbursement import find_all_reimbursements
 from pcapi.models import Booking
+from pcapi.models import EventType
+from pcapi.models import Offer
+from pcapi.models import Product
+from pcapi.models import Stock
 from pcapi.models import ThingType
 from pcapi.repository import repository
 
@@ -450,6 +457,9 @@ class ReimbursementRuleIsActiveTest:
         def is_relevant(self, booking, **kwargs):
             return True
 
+        def are_relevant(self, bookings, cumulative_values):
+            return [True] * len(bookings)
+
     booking = Booking()
 
     def test_is_active_if_valid_from_is_none_and_valid_until_is_none(self):
@@ -713,6 +723,83 @@ class FindAllBookingsReimbursementsTest:
         assert_degressive_reimbursement(booking_reimbursements[2], booking3, 27000)
 
 
+def build_random_bookings(count, seed):
+    # Bookings are not saved: reimbursement rules only read them.
+    generator = random.Random(seed)
+    offer_types = [
+        str(ThingType.LIVRE_EDITION),
+        str(ThingType.CINEMA_CARD),
+        str(ThingType.AUDIOVISUEL),
+        str(ThingType.JEUX_VIDEO),
+        str(EventType.SPECTACLE_VIVANT),
+    ]
+    bookings = []
+    for _ in range(count):
+        offer_type = generator.choice(offer_types)
+        offer_url = generator.choice([None, "", "http://example.com/offer"])
+        product_url = generator.choice([offer_url, None, "http://example.com/product"])
+        offer = Offer(type=offer_type, url=offer_url, product=Product(type=offer_type, url=product_url))
+        bookings.append(
+            Booking(
+                stock=Stock(price=Decimal(generator.randint(0, 300000)) / 100, offer=offer),
+                amount=Decimal(generator.randint(0, 300000)) / 100,
+                quantity=generator.choice([1, 2]),
+                dateCreated=datetime(generator.choice([2020, 2021]), 6, 1),
+            )
+        )
+    return bookings
+
+
+class FindAllReimbursementsTest:
+    @pytest.mark.parametrize("seed", range(5))
+    def test_elects_same_rules_and_amounts_as_booking_by_booking_evaluation(self, seed):
+        # given
+        bookings = build_random_bookings(400, seed)
+        expected_reimbursements = find_all_booking_reimbursements(bookings, RULES)
+
+        # when
+        reimbursements = find_all_reimbursements(ReimbursableBookings.from_bookings(bookings), RULES, {})
+
+        # then
+        assert [(r.rule, r.amount) for r in reimbursements] == [
+            (r.reimbursement, r.reimbursed_amount) for r in expected_reimbursements
+        ]
+
+    def test_carries_cumulative_value_over_successive_calls(self):
+        # given
+        bookings = build_random_bookings(400, seed=42)
+        expected_reimbursements = find_all_booking_reimbursements(bookings, RULES)
+
+        # when
+        cumulative_bookings_value_by_year = {}
+        reimbursements = []
+        for start in range(0, len(bookings), 75):
+            chunk = ReimbursableBookings.from_bookings(bookings[start : start + 75])
+            reimbursements += find_all_reimbursements(chunk, RULES, cumulative_bookings_value_by_year)
+
+        # then
+        assert [(r.rule, r.amount) for r in reimbursements] == [
+            (r.reimbursement, r.reimbursed_amount) for r in expected_reimbursements
+        ]
+        assert cumulative_bookings_value_by_year[2020] > 150000
+        assert cumulative_bookings_value_by_year[2021] > 150000
+
+    def test_evaluates_given_rules_only(self):
+        # given
+        bookings = build_random_bookings(50, seed=0)
+        rules = [ReimbursementRules.DIGITAL_THINGS, ReimbursementRules.PHYSICAL_OFFERS]
+        expected_reimbursements = find_all_booking_reimbursements(bookings, rules)
+
+        # when
+        reimbursements = find_all_reimbursements(ReimbursableBookings.from_bookings(bookings), rules, {})
+
+        # then
+        assert {r.rule for r in reimbursements} <= set(rules)
+        assert [(r.rule, r.amount) for r in reimbursements] == [
+            (r.reimbursement, r.reimbursed_amount) for r in expected_reimbursements
+        ]
+
+
 def assert_total_reimbursement(booking_reimbursement, booking):
     assert booking_reimbursement.booking == booking
     assert booking_reimbursement.reimbursement == ReimbursementRules.PHYSICAL_OFFERS
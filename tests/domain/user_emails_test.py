@@ -23,8 +23,8 @@ from pcapi.domain.user_emails import send_batch_cancellation_emails_to_users
 from pcapi.domain.user_emails import send_beneficiary_booking_cancellation_email
 from pcapi.domain.user_emails import send_booking_confirmation_email_to_beneficiary
 from pcapi.domain.user_emails import send_booking_recap_emails
-from pcapi.domain.user_emails import send_expired_bookings_recap_email_to_beneficiary
 from pcapi.domain.user_emails import send_expired_bookings_recap_email_to_offerer
+from pcapi.domain.user_emails import send_expired_bookings_recap_emails_to_beneficiaries
 from pcapi.domain.user_emails import send_newly_eligible_user_email
 from pcapi.domain.user_emails import send_offer_validation_status_update_email
 from pcapi.domain.user_emails import send_offerer_bookings_recap_email_after_offerer_cancellation
@@ -34,7 +34,7 @@ from pcapi.domain.user_emails import send_rejection_email_to_beneficiary_pre_sub
 from pcapi.domain.user_emails import send_reset_password_email_to_native_app_user
 from pcapi.domain.user_emails import send_reset_password_email_to_pro
 from pcapi.domain.user_emails import send_reset_password_email_to_user
-from pcapi.domain.user_emails import send_soon_to_be_expired_bookings_recap_email_to_beneficiary
+from pcapi.domain.user_emails import send_soon_to_be_expired_bookings_recap_emails_to_beneficiaries
 from pcapi.domain.user_emails import send_user_driven_cancellation_email_to_offerer
 from pcapi.domain.user_emails import send_validation_confirmation_email_to_pro
 from pcapi.domain.user_emails import send_warning_to_beneficiary_after_pro_booking_cancellation
@@ -450,7 +450,7 @@ class SendRejectionEmailToBeneficiaryPreSubscriptionTest:
 
 
 @pytest.mark.usefixtures("db_session")
-class SendExpiredBookingsRecapEmailToBeneficiaryTest:
+class SendExpiredBookingsRecapEmailsToBeneficiariesTest:
     @pytest.mark.usefixtures("db_session")
     def test_should_send_email_to_beneficiary_when_expired_bookings_cancelled(self, app):
         amnesiac_user = users_factories.UserFactory(email="dory@example.com")
@@ -460,10 +460,12 @@ class SendExpiredBookingsRecapEmailToBeneficiaryTest:
         expired_today_cd_booking = BookingFactory(
             user=amnesiac_user,
         )
-        send_expired_bookings_recap_email_to_beneficiary(
-            amnesiac_user, [expired_today_cd_booking, expired_today_dvd_booking]
+        results = send_expired_bookings_recap_emails_to_beneficiaries(
+            [(amnesiac_user, [expired_today_cd_booking, expired_today_dvd_booking])]
         )
 
+        assert results == [True]
+        assert len(mails_testing.outbox) == 1
         assert mails_testing.outbox[0].sent_data["Mj-TemplateID"] == 1951103
 
 
@@ -481,7 +483,7 @@ class SendExpiredBookingsRecapEmailToOffererTest:
 
 
 @pytest.mark.usefixtures("db_session")
-class SendSoonToBeExpiredBookingsRecapEmailToBeneficiaryTest:
+class SendSoonToBeExpiredBookingsRecapEmailsToBeneficiariesTest:
     @patch(
         "pcapi.domain.user_emails.build_soon_to_be_expired_bookings_recap_email_data_for_beneficiary",
         return_value={"MJ-TemplateID": 12345},
@@ -513,14 +515,15 @@ class SendSoonToBeExpiredBookingsRecapEmailToBeneficiaryTest:
         )
 
         # when
-        send_soon_to_be_expired_bookings_recap_email_to_beneficiary(
-            user, [soon_to_be_expired_cd_booking, soon_to_be_expired_dvd_booking]
+        results = send_soon_to_be_expired_bookings_recap_emails_to_beneficiaries(
+            [(user, [soon_to_be_expired_cd_booking, soon_to_be_expired_dvd_booking])]
         )
 
         # then
         build_soon_to_be_expired_bookings_recap_email_data_for_beneficiary.assert_called_once_with(
             user, [soon_to_be_expired_cd_booking, soon_to_be_expired_dvd_booking]
         )
+        assert results == [True]
         assert mails_testing.outbox[0].sent_data["MJ-TemplateID"] == 12345
 
 
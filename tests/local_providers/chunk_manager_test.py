@@ -1,6 +1,8 @@
 import pytest
 from sqlalchemy import Sequence
 
+from pcapi.core import sql_stats
+from pcapi.local_providers.chunk_manager import prefetch_existing_pc_objs
 from pcapi.local_providers.chunk_manager import save_chunks
 from pcapi.model_creators.generic_creators import create_offerer
 from pcapi.model_creators.generic_creators import create_stock
@@ -8,6 +10,7 @@ from pcapi.model_creators.generic_creators import create_venue
 from pcapi.model_creators.specific_creators import create_offer_with_thing_product
 from pcapi.model_creators.specific_creators import create_product_with_thing_type
 from pcapi.models import Offer
+from pcapi.models import Product
 from pcapi.models import Stock
 from pcapi.models.db import db
 from pcapi.repository import repository
@@ -127,3 +130,108 @@ class SaveChunksTest:
         assert len(offers) == 2
         assert any(offer.isDuo for offer in offers)
         assert Stock.query.count() == 1
+
+    @pytest.mark.usefixtures("db_session")
+    def test_save_chunks_update_loads_expired_objects_at_once(self, app):
+        # Given
+        offerer = create_offerer()
+        venue = create_venue(offerer)
+        product = create_product_with_thing_type()
+        offer1 = create_offer_with_thing_product(venue, product=product, id_at_providers="1%12345678912345")
+        offer2 = create_offer_with_thing_product(venue, product=product, id_at_providers="2%12345678912345")
+        repository.save(venue, product, offer1, offer2)
+
+        # `repository.save()` has committed, hence expired, both offers.
+        offer1.isDuo = True
+        offer2.isDuo = True
+        chunk_to_update = {
+            "1|Offer": offer1,
+            "2|Offer": offer2,
+        }
+
+        # When
+        with sql_stats.record_queries() as stats:
+            save_chunks({}, chunk_to_update)
+
+        # Then
+        selects = [fingerprint for fingerprint in stats.fingerprints if fingerprint.startswith("SELECT")]
+        assert len(selects) == 1
+        assert stats.fingerprints[selects[0]] == 1
+        assert Offer.query.filter_by(isDuo=True).count() == 2
+
+    @pytest.mark.usefixtures("db_session")
+    def test_save_chunks_insert_sets_ids_of_inserted_objects(self, app):
+        # Given
+        product = create_product_with_thing_type(id_at_providers="9780199536986")
+        chunk_to_insert = {"9780199536986|Product": product}
+
+        # When
+        save_chunks(chunk_to_insert, {})
+
+        # Then
+        assert product.id == Product.query.one().id
+
+    @pytest.mark.usefixtures("db_session")
+    def test_save_chunks_insert_updates_object_created_in_the_meantime(self, app):
+        # Given
+        existing_product = create_product_with_thing_type(thing_name="Old name", id_at_providers="9780199536986")
+        repository.save(existing_product)
+        product = create_product_with_thing_type(thing_name="New name", id_at_providers="9780199536986")
+        chunk_to_insert = {"9780199536986|Product": product}
+
+        # When
+        save_chunks(chunk_to_insert, {})
+
+        # Then
+        product = Product.query.one()
+        assert product.id == existing_product.id
+        assert product.name == "New name"
+
+    @pytest.mark.usefixtures("db_session")
+    def test_save_chunks_insert_fixes_stocks_of_offer_created_in_the_meantime(self, app):
+        # Given
+        offerer = create_offerer()
+        venue = create_venue(offerer)
+        product = create_product_with_thing_type()
+        existing_offer = create_offer_with_thing_product(venue, product=product, id_at_providers="1%12345678912345")
+        repository.save(venue, product, existing_offer)
+
+        offer = create_offer_with_thing_product(venue, product=product, id_at_providers="1%12345678912345")
+        offer.venueId = venue.id
+        offer_id = db.session.execute(Sequence("offer_id_seq"))
+        offer.id = offer_id
+        stock = create_stock(offer=offer)
+        stock.idAtProviders = "1%12345678912345@1"
+        stock.offerId = offer_id
+        chunk_to_insert = {
+            "1%12345678912345|Offer": offer,
+            "1%12345678912345@1|Stock": stock,
+        }
+        db.session.expunge(offer)
+        db.session.expunge(stock)
+
+        # When
+        save_chunks(chunk_to_insert, {})
+
+        # Then
+        assert offer.id == existing_offer.id
+        assert stock.offerId == existing_offer.id
+        assert Offer.query.count() == 1
+        assert Stock.query.one().offerId == existing_offer.id
+
+
+class PrefetchExistingPcObjsTest:
+    @pytest.mark.usefixtures("db_session")
+    def test_returns_existing_objects_and_none_for_missing_ones(self, app):
+        # Given
+        product = create_product_with_thing_type(id_at_providers="9780199536986")
+        repository.save(product)
+
+        # When
+        prefetched_objects = prefetch_existing_pc_objs({Product: {"9780199536986", "9780199536987"}})
+
+        # Then
+        assert prefetched_objects == {
+            "9780199536986|Product": product,
+            "9780199536987|Product": None,
+        }
@@ -6,6 +6,7 @@ import pytest
 import pcapi.core.offerers.factories as offerers_factories
 import pcapi.core.offers.factories as offers_factories
 from pcapi.local_providers.local_provider import _save_same_thumb_from_thumb_count_to_index
+from pcapi.local_providers.thumb_pipeline import ThumbPipeline
 from pcapi.model_creators.provider_creators import create_providable_info
 from pcapi.models import ApiErrors
 from pcapi.models import LocalProviderEvent
@@ -87,6 +88,33 @@ class UpdateObjectsTest:
         assert product.type == str(ThingType.LIVRE_EDITION)
         assert product.dateModifiedAtLastProvider == providable_info.date_modified_at_provider
 
+    @patch("tests.local_providers.provider_test_utils.TestLocalProvider.__next__")
+    def test_looks_up_existing_objects_of_providable_infos_in_one_query(self, next_function):
+        # Given
+        provider = offerers_factories.ProviderFactory(localClass="TestLocalProvider")
+        providable_info1 = create_providable_info(id_at_providers="1", date_modified=datetime(2018, 1, 1))
+        providable_info2 = create_providable_info(id_at_providers="2", date_modified=datetime(2018, 1, 1))
+        offers_factories.ThingProductFactory(
+            dateModifiedAtLastProvider=datetime(2000, 1, 1),
+            lastProvider=provider,
+            idAtProviders="1",
+            name="Old product name",
+        )
+        local_provider = provider_test_utils.TestLocalProvider()
+        next_function.side_effect = [[providable_info1, providable_info2]]
+
+        # When
+        with patch("pcapi.local_providers.chunk_manager.get_existing_object") as get_existing_object:
+            local_provider.updateObjects()
+
+        # Then
+        get_existing_object.assert_not_called()
+        products = Product.query.order_by(Product.idAtProviders).all()
+        assert [(product.idAtProviders, product.name) for product in products] == [
+            ("1", "New Product"),
+            ("2", "New Product"),
+        ]
+
     @patch("tests.local_providers.provider_test_utils.TestLocalProvider.__next__")
     def test_does_not_update_existing_object_when_date_is_older_than_last_modified_date(self, next_function):
         # Given
@@ -296,6 +324,36 @@ class HandleThumbTest:
         assert local_provider.createdThumbs == 4
         assert product.thumbCount == 4
 
+    @patch("pcapi.local_providers.thumb_pipeline.store_thumb")
+    def test_only_counts_thumbs_stored_before_first_failure_when_stored_in_pipeline(self, mock_store_thumb):
+        # Given
+        provider = offerers_factories.ProviderFactory(localClass="TestLocalProviderWithThumbIndexAt4")
+        providable_info = create_providable_info()
+        product = offers_factories.ThingProductFactory(
+            idAtProviders=providable_info.id_at_providers,
+            lastProvider=provider,
+        )
+        local_provider = provider_test_utils.TestLocalProviderWithThumbIndexAt4()
+        local_provider.thumb_pipeline = ThumbPipeline(processes=1, upload_threads=1, max_pending=1)
+
+        def store_thumb(thumb_storage_id, image_as_bytes):  # pylint: disable=unused-argument
+            if thumb_storage_id.endswith("_2"):
+                raise Exception("storage is down")
+
+        mock_store_thumb.side_effect = store_thumb
+
+        # When
+        local_provider._handle_thumb(product)
+        local_provider._wait_for_thumbs()
+        local_provider.thumb_pipeline.close()
+        repository.save(product)
+
+        # Then
+        assert local_provider.erroredThumbs == 1
+        assert local_provider.createdThumbs == 3
+        assert mock_store_thumb.call_count == 4
+        assert product.thumbCount == 2
+
 
 @pytest.mark.usefixtures("db_session")
 class SaveThumbFromThumbCountToIndexTest:
@@ -319,6 +377,32 @@ class SaveThumbFromThumbCountToIndexTest:
         # Then
         assert product.thumbCount == 4
 
+    @patch("pcapi.core.object_storage.store_public_object")
+    @patch("pcapi.connectors.thumb_storage.standardize_image", return_value=b"standardized")
+    def test_should_convert_image_once_when_adding_several_thumbs(
+        self, mock_standardize_image, mock_store_public_object
+    ):
+        # Given
+        provider = offerers_factories.ProviderFactory(localClass="TestLocalProviderWithThumb")
+        providable_info = create_providable_info()
+        product = offers_factories.ThingProductFactory(
+            idAtProviders=providable_info.id_at_providers,
+            lastProvider=provider,
+            thumbCount=1,
+        )
+        local_provider = provider_test_utils.TestLocalProviderWithThumb()
+        thumb = local_provider.get_object_thumb()
+
+        # When
+        _save_same_thumb_from_thumb_count_to_index(product, 4, thumb)
+
+        # Then
+        mock_standardize_image.assert_called_once_with(thumb)
+        assert sorted(call.args[1] for call in mock_store_public_object.call_args_list) == [
+            product.get_thumb_storage_id(index) for index in (1, 2, 3)
+        ]
+        assert product.thumbCount == 4
+
     def test_should_only_replace_image_at_specific_thumb_index_when_thumbCount_is_superior_to_thumbIndex(self):
         provider = offerers_factories.ProviderFactory(localClass="TestLocalProviderWithThumb")
         providable_info = create_providable_info()
@@ -76,8 +76,8 @@ class ProviderAPICronTest:
     @pytest.mark.usefixtures("db_session")
     @freeze_time("2020-10-15 09:00:00")
     @override_features(SYNCHRONIZE_ALGOLIA=True)
-    @mock.patch("pcapi.connectors.redis.add_offer_id")
-    def test_execution(self, mocked_add_offer_id):
+    @mock.patch("pcapi.connectors.redis.add_offer_ids")
+    def test_execution(self, mocked_add_offer_ids):
         # Given
         provider = offerers_factories.APIProviderFactory(apiUrl="https://provider_url", authToken="fake_token")
         venue_provider = offerers_factories.VenueProviderFactory(
@@ -158,17 +158,17 @@ class ProviderAPICronTest:
         assert created_offer.lastProviderId == provider.id
 
         # Test it adds offer in redis
-        assert mocked_add_offer_id.call_count == 5
-        mocked_add_offer_id.assert_has_calls(
-            [
-                mock.call(client=app.redis_client, offer_id=offer.id),
-                mock.call(client=app.redis_client, offer_id=stock_with_booking.offer.id),
-                mock.call(client=app.redis_client, offer_id=created_offer.id),
-                mock.call(client=app.redis_client, offer_id=second_created_offer.id),
-                mock.call(client=app.redis_client, offer_id=stock.offer.id),
-            ],
-            any_order=True,
-        )
+        reindexed_offer_ids = set()
+        for call in mocked_add_offer_ids.call_args_list:
+            assert call.kwargs["client"] == app.redis_client
+            reindexed_offer_ids.update(call.kwargs["offer_ids"])
+        assert reindexed_offer_ids == {
+            offer.id,
+            stock_with_booking.offer.id,
+            created_offer.id,
+            second_created_offer.id,
+            stock.offer.id,
+        }
 
         # Ensure next synchronisation is done with modifiedSince parameter
         with requests_mock.Mocker() as request_mock:
@@ -227,3 +227,40 @@ class ProviderAPICronTest:
                     "stocks_provider_reference": "3010000108123@siret",
                 },
             ]
+
+    class PrefetchBatchesTest:
+        def test_yields_batches_in_order(self):
+            # Given
+            batches = iter([[1, 2], [3], [4, 5]])
+
+            # When
+            result = list(synchronize_provider_api._prefetch_batches(batches, max_prefetched_batches=1))
+
+            # Then
+            assert result == [[1, 2], [3], [4, 5]]
+
+        def test_reraises_exception_raised_while_fetching(self):
+            # Given
+            def batches():
+                yield [1]
+                raise ValueError("provider is down")
+
+            prefetched_batches = synchronize_provider_api._prefetch_batches(batches(), max_prefetched_batches=1)
+
+            # When
+            first_batch = next(prefetched_batches)
+
+            # Then
+            assert first_batch == [1]
+            with pytest.raises(ValueError):
+                next(prefetched_batches)
+
+        def test_fetches_in_current_thread_when_prefetch_is_disabled(self):
+            # Given
+            batches = iter([[1], [2]])
+
+            # When
+            result = list(synchronize_provider_api._prefetch_batches(batches, max_prefetched_batches=0))
+
+            # Then
+            assert result == [[1], [2]]
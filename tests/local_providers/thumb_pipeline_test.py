@@ -0,0 +1,86 @@
+from pathlib import Path
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+
+from pcapi.local_providers.thumb_pipeline import ThumbPipeline
+
+import tests
+
+
+IMAGES_DIR = Path(tests.__path__[0]) / "files"
+
+
+@pytest.fixture(name="thumb_pipeline")
+def thumb_pipeline_fixture():
+    thumb_pipeline = ThumbPipeline(processes=1, upload_threads=2, max_pending=2)
+    yield thumb_pipeline
+    thumb_pipeline.close()
+
+
+def _create_object_with_thumb():
+    pc_object = MagicMock()
+    pc_object.get_thumb_storage_id.side_effect = lambda index: f"products/AE_{index}"
+    return pc_object
+
+
+class ThumbPipelineTest:
+    @patch("pcapi.local_providers.thumb_pipeline.store_thumb")
+    def test_converts_image_once_and_stores_it_at_each_index(self, mock_store_thumb, thumb_pipeline):
+        # Given
+        image = (IMAGES_DIR / "mouette_full_size.jpg").read_bytes()
+        pc_object = _create_object_with_thumb()
+
+        # When
+        thumb_pipeline.submit(pc_object, image, range(0, 3), is_new_thumb=True)
+        failures = thumb_pipeline.wait()
+
+        # Then
+        assert failures == []
+        stored_ids = sorted(call.args[0] for call in mock_store_thumb.call_args_list)
+        assert stored_ids == ["products/AE_0", "products/AE_1", "products/AE_2"]
+        stored_image = mock_store_thumb.call_args_list[0].args[1]
+        assert stored_image.startswith(b"\xff\xd8")  # JPEG
+        assert thumb_pipeline.stats["converted"] == 1
+        assert thumb_pipeline.stats["uploaded"] == 3
+
+    @patch("pcapi.local_providers.thumb_pipeline.store_thumb")
+    def test_reports_failed_uploads(self, mock_store_thumb, thumb_pipeline):
+        # Given
+        image = (IMAGES_DIR / "mouette_full_size.jpg").read_bytes()
+        pc_object = _create_object_with_thumb()
+        error = Exception("storage is down")
+
+        def store_thumb(thumb_storage_id, image_as_bytes):  # pylint: disable=unused-argument
+            if thumb_storage_id == "products/AE_1":
+                raise error
+
+        mock_store_thumb.side_effect = store_thumb
+
+        # When
+        thumb_pipeline.submit(pc_object, image, [0, 1], is_new_thumb=False)
+        failures = thumb_pipeline.wait()
+
+        # Then
+        assert len(failures) == 1
+        assert failures[0].pc_object is pc_object
+        assert failures[0].index == 1
+        assert not failures[0].is_new_thumb
+        assert failures[0].error is error
+        assert thumb_pipeline.stats["uploaded"] == 1
+        assert thumb_pipeline.wait() == []
+
+    @patch("pcapi.local_providers.thumb_pipeline.store_thumb")
+    def test_reports_images_that_cannot_be_converted(self, mock_store_thumb, thumb_pipeline):
+        # Given
+        pc_object = _create_object_with_thumb()
+
+        # When
+        thumb_pipeline.submit(pc_object, b"not an image", range(2, 4), is_new_thumb=True)
+        failures = thumb_pipeline.wait()
+
+        # Then
+        assert [(failure.index, failure.is_new_thumb) for failure in failures] == [(2, True)]
+        mock_store_thumb.assert_not_called()
+        assert thumb_pipeline.stats["failed"] == 1
@@ -64,9 +64,9 @@ class TiteliveStocksTest:
         @pytest.mark.usefixtures("db_session")
         @override_features(ENABLE_WHOLE_VENUE_PROVIDER_ALGOLIA_INDEXATION=False)
         @patch("pcapi.local_providers.titelive_stocks.titelive_stocks.TiteLiveStocks.get_provider_stock_information")
-        @patch("pcapi.connectors.redis.add_offer_id")
+        @patch("pcapi.connectors.redis.add_offer_ids")
         def test_titelive_stock_provider_create_1_stock_and_1_offer_with_wanted_attributes(
-            self, mock_add_offer_id, stub_get_stocks_information, app
+            self, mock_add_offer_ids, stub_get_stocks_information, app
         ):
             # Given
             stub_get_stocks_information.return_value = iter(
@@ -101,7 +101,7 @@ class TiteliveStocksTest:
             assert stock.quantity == 10
             assert stock.bookingLimitDatetime is None
 
-            mock_add_offer_id.assert_called_once_with(client=app.redis_client, offer_id=offer.id)
+            mock_add_offer_ids.assert_called_once_with(client=app.redis_client, offer_ids={offer.id})
 
         @pytest.mark.usefixtures("db_session")
         @patch("pcapi.local_providers.titelive_stocks.titelive_stocks.TiteLiveStocks.get_provider_stock_information")
@@ -246,9 +246,9 @@ class TiteliveStocksTest:
         @pytest.mark.usefixtures("db_session")
         @override_features(ENABLE_WHOLE_VENUE_PROVIDER_ALGOLIA_INDEXATION=False)
         @patch("pcapi.local_providers.titelive_stocks.titelive_stocks.TiteLiveStocks.get_provider_stock_information")
-        @patch("pcapi.connectors.redis.add_offer_id")
+        @patch("pcapi.connectors.redis.add_offer_ids")
         def test_titelive_stock_provider_create_1_stock_and_update_1_existing_offer(
-            self, mock_add_offer_id, stub_get_stocks_information, app
+            self, mock_add_offer_ids, stub_get_stocks_information, app
         ):
             # Given
             stub_get_stocks_information.return_value = iter(
@@ -277,7 +277,7 @@ class TiteliveStocksTest:
             assert Stock.query.count() == 1
             assert Offer.query.count() == 1
 
-            mock_add_offer_id.assert_called_once_with(client=app.redis_client, offer_id=offer.id)
+            mock_add_offer_ids.assert_called_once_with(client=app.redis_client, offer_ids={offer.id})
 
         @pytest.mark.usefixtures("db_session")
         @patch("pcapi.local_providers.titelive_stocks.titelive_stocks.TiteLiveStocks.get_provider_stock_information")
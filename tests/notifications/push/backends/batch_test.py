@@ -3,6 +3,7 @@ import requests_mock
 from pcapi.notifications.push.backends.batch import BatchBackend
 from pcapi.notifications.push.transactional_notifications import TransactionalNotificationData
 from pcapi.notifications.push.transactional_notifications import TransactionalNotificationMessage
+from pcapi.notifications.push.user_attributes_updates import UserUpdateData
 
 
 class BatchPushNotificationClientTest:
@@ -16,6 +17,30 @@ class BatchPushNotificationClientTest:
             assert ios_post.last_request.json() == {"overwrite": False, "values": {"attri": "but"}}
             assert android_post.last_request.json() == {"overwrite": False, "values": {"attri": "but"}}
 
+    def test_update_users_attributes(self):
+        users_data = [UserUpdateData(user_id="1", attributes={"attri": "but"})]
+        with requests_mock.Mocker() as mock:
+            android_post = mock.post("https://api.example.com/1.0/fake_android_api_key/data/users/")
+            ios_post = mock.post("https://api.example.com/1.0/fake_ios_api_key/data/users/")
+
+            updated = BatchBackend().update_users_attributes(users_data)
+
+            assert updated
+            expected_payload = [{"id": "1", "update": {"overwrite": False, "values": {"attri": "but"}}}]
+            assert ios_post.last_request.json() == expected_payload
+            assert android_post.last_request.json() == expected_payload
+
+    def test_update_users_attributes_reports_errors(self):
+        users_data = [UserUpdateData(user_id="1", attributes={"attri": "but"})]
+        with requests_mock.Mocker() as mock:
+            mock.post("https://api.example.com/1.0/fake_android_api_key/data/users/", status_code=500)
+            ios_post = mock.post("https://api.example.com/1.0/fake_ios_api_key/data/users/")
+
+            updated = BatchBackend().update_users_attributes(users_data)
+
+            assert not updated
+            assert ios_post.called
+
     def test_send_transactional_notification(self):
         with requests_mock.Mocker() as mock:
             android_post = mock.post("https://api.example.com/1.1/fake_android_api_key/transactional/send")
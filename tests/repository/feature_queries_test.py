@@ -1,10 +1,15 @@
+from unittest import mock
+
 import flask
 import pytest
 
 from pcapi.core.testing import assert_num_queries
+from pcapi.core.testing import override_settings
+from pcapi.models import db
 from pcapi.models.api_errors import ResourceNotFoundError
 from pcapi.models.feature import Feature
 from pcapi.models.feature import FeatureToggle
+from pcapi.repository import feature_queries
 from pcapi.repository import repository
 from pcapi.repository.feature_queries import is_active
 
@@ -50,7 +55,7 @@ class FeatureToggleTest:
         repository.save(feature)
         context = flask._request_ctx_stack.pop()
 
-        # we don't cache yet outside the scope of a request so it'll be 3 DB queries
+        # the process-wide cache is disabled in tests so it'll be 3 DB queries
         try:
             with assert_num_queries(3):
                 is_active(FeatureToggle.WEBAPP_SIGNUP)
@@ -58,3 +63,96 @@ class FeatureToggleTest:
                 is_active(FeatureToggle.WEBAPP_SIGNUP)
         finally:
             flask._request_ctx_stack.push(context)
+
+
+@pytest.mark.usefixtures("db_session")
+@override_settings(FEATURES_CACHE_TTL=60, FEATURES_CACHE_REDIS_INVALIDATION=False)
+class ProcessWideFeatureCacheTest:
+    def setup_method(self):
+        feature_queries.invalidate_cache()
+
+    def teardown_method(self):
+        feature_queries.invalidate_cache()
+
+    def test_is_active_query_count_outside_request_context(self, app):
+        context = flask._request_ctx_stack.pop()
+
+        # a single DB query loads all features
+        try:
+            with assert_num_queries(1):
+                is_active(FeatureToggle.WEBAPP_SIGNUP)
+                is_active(FeatureToggle.WEBAPP_SIGNUP)
+                is_active(FeatureToggle.QR_CODE)
+        finally:
+            flask._request_ctx_stack.push(context)
+
+    def test_cache_is_invalidated_when_feature_is_updated(self):
+        feature = Feature.query.filter_by(name=FeatureToggle.WEBAPP_SIGNUP.name).first()
+        feature.isActive = True
+        repository.save(feature)
+        assert is_active(FeatureToggle.WEBAPP_SIGNUP)
+
+        feature.isActive = False
+        repository.save(feature)
+
+        assert not is_active(FeatureToggle.WEBAPP_SIGNUP)
+
+    @override_settings(FEATURES_CACHE_REDIS_INVALIDATION=True)
+    @mock.patch("pcapi.repository.feature_queries.redis.publish_features_invalidation")
+    def test_invalidation_is_published_on_commit_only(self, mocked_publish, app):
+        feature = Feature.query.filter_by(name=FeatureToggle.WEBAPP_SIGNUP.name).first()
+        feature.isActive = not feature.isActive
+
+        db.session.flush()
+        assert not mocked_publish.called
+
+        db.session.commit()
+        mocked_publish.assert_called_once_with(client=app.redis_client)
+
+    @override_settings(FEATURES_CACHE_REDIS_INVALIDATION=True)
+    @mock.patch("pcapi.repository.feature_queries.redis.subscribe_to_features_invalidation")
+    def test_listens_to_invalidations_only_when_enabled(self, mocked_subscribe, app):
+        context = flask._request_ctx_stack.pop()
+
+        try:
+            is_active(FeatureToggle.WEBAPP_SIGNUP)
+            assert not mocked_subscribe.called
+
+            with mock.patch("pcapi.repository.feature_queries._invalidation_listener_enabled", True):
+                feature_queries.invalidate_cache()
+                is_active(FeatureToggle.WEBAPP_SIGNUP)
+        finally:
+            flask._request_ctx_stack.push(context)
+            feature_queries._invalidation_listener_pid = None
+
+        mocked_subscribe.assert_called_once_with(feature_queries.invalidate_cache)
+
+    @mock.patch("pcapi.repository.feature_queries.time.monotonic")
+    def test_cache_expires(self, mocked_monotonic, app):
+        context = flask._request_ctx_stack.pop()
+
+        try:
+            with assert_num_queries(2):
+                mocked_monotonic.return_value = 1000
+                is_active(FeatureToggle.WEBAPP_SIGNUP)
+                mocked_monotonic.return_value = 1059
+                is_active(FeatureToggle.WEBAPP_SIGNUP)
+                mocked_monotonic.return_value = 1061
+                is_active(FeatureToggle.WEBAPP_SIGNUP)
+        finally:
+            flask._request_ctx_stack.push(context)
+
+    def test_cache_stats(self, app):
+        stats_before = feature_queries.get_cache_stats()
+        context = flask._request_ctx_stack.pop()
+
+        try:
+            is_active(FeatureToggle.WEBAPP_SIGNUP)
+            is_active(FeatureToggle.WEBAPP_SIGNUP)
+            is_active(FeatureToggle.QR_CODE)
+        finally:
+            flask._request_ctx_stack.push(context)
+
+        stats = feature_queries.get_cache_stats()
+        assert stats["misses"] - stats_before["misses"] == 1
+        assert stats["hits"] - stats_before["hits"] == 2
@@ -3,7 +3,9 @@ from datetime import datetime
 import pytest
 from sqlalchemy import func
 
+from pcapi.algolia.infrastructure.builder import build_object
 import pcapi.core.offers.factories as offers_factories
+from pcapi.core.testing import assert_num_queries
 from pcapi.model_creators.generic_creators import create_booking
 from pcapi.model_creators.generic_creators import create_offerer
 from pcapi.model_creators.generic_creators import create_provider
@@ -18,10 +20,12 @@ from pcapi.model_creators.specific_creators import create_stock_from_event_occur
 from pcapi.model_creators.specific_creators import create_stock_from_offer
 from pcapi.models import Offer
 from pcapi.models import Stock
+from pcapi.models.db import db
 from pcapi.repository import repository
 from pcapi.repository.offer_queries import _build_bookings_quantity_subquery
 from pcapi.repository.offer_queries import get_offers_by_ids
 from pcapi.repository.offer_queries import get_offers_by_venue_id
+from pcapi.repository.offer_queries import get_offers_for_indexing
 from pcapi.repository.offer_queries import get_paginated_active_offer_ids
 from pcapi.repository.offer_queries import get_paginated_offer_ids_by_venue_id
 from pcapi.repository.offer_queries import get_paginated_offer_ids_by_venue_id_and_last_provider_id
@@ -216,6 +220,29 @@ class GetOffersByIdsTest:
         assert offer2 in offers
 
 
+class GetOffersForIndexingTest:
+    @pytest.mark.usefixtures("db_session")
+    def test_should_return_offers_with_everything_needed_to_build_algolia_objects(self, app):
+        # Given
+        stock1 = offers_factories.EventStockFactory()
+        stock2 = offers_factories.ThingStockFactory()
+        offers_factories.MediationFactory(offer=stock2.offer)
+        offers_factories.OfferCriterionFactory(offer=stock1.offer)
+        offer_ids = [0, stock1.offer.id, stock2.offer.id]
+        db.session.expire_all()
+
+        # When
+        n_queries = 1  # select offers, venues, offerers and products
+        n_queries += 3  # select stocks, criteria and mediations
+        with assert_num_queries(n_queries):
+            offers = get_offers_for_indexing(offer_ids)
+            objects = [build_object(offer) for offer in offers if offer.isBookable]
+
+        # Then
+        assert {offer.id for offer in offers} == {stock1.offer.id, stock2.offer.id}
+        assert len(objects) == 2
+
+
 class GetPaginatedActiveOfferIdsTest:
     @pytest.mark.usefixtures("db_session")
     def test_should_return_two_offer_ids_from_first_page_when_limit_is_two_and_two_active_offers(self, app):
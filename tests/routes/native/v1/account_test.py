@@ -12,6 +12,7 @@ import pytest
 from pcapi.core.bookings.factories import BookingFactory
 import pcapi.core.mails.testing as mails_testing
 from pcapi.core.testing import override_features
+from pcapi.core.testing import override_settings
 from pcapi.core.users import factories as users_factories
 from pcapi.core.users.api import create_phone_validation_token
 from pcapi.core.users.models import Token
@@ -21,6 +22,9 @@ from pcapi.core.users.models import VOID_PUBLIC_NAME
 from pcapi.core.users.repository import get_id_check_token
 from pcapi.notifications.push import testing as push_testing
 from pcapi.notifications.sms import testing as sms_testing
+from pcapi.repository import repository
+from pcapi.repository.user_queries import find_user_by_email
+from pcapi.routes.native import security
 from pcapi.routes.native.v1.serialization import account as account_serializers
 
 from tests.conftest import TestClient
@@ -249,6 +253,42 @@ class AccountTest:
         assert not response.json["isBeneficiary"]
 
 
+@override_settings(JWT_USER_IDS_CACHE_TTL=60)
+class AuthenticatedUserCacheTest:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        security._cached_user_ids.clear()
+        yield
+        security._cached_user_ids.clear()
+
+    @patch("pcapi.routes.native.security.find_user_by_email", wraps=find_user_by_email)
+    def test_fetch_user_by_email_once(self, mocked_find_user_by_email, app):
+        _user, test_client = create_user_and_test_client(app)
+
+        assert test_client.get("/native/v1/me").status_code == 200
+        assert test_client.get("/native/v1/me").status_code == 200
+
+        mocked_find_user_by_email.assert_called_once()
+
+    def test_suspended_user_is_forbidden(self, app):
+        user, test_client = create_user_and_test_client(app)
+        assert test_client.get("/native/v1/me").status_code == 200
+
+        user.isActive = False
+        repository.save(user)
+
+        assert test_client.get("/native/v1/me").status_code == 403
+
+    def test_token_of_previous_email_is_forbidden(self, app):
+        user, test_client = create_user_and_test_client(app)
+        assert test_client.get("/native/v1/me").status_code == 200
+
+        user.email = "new@example.com"
+        repository.save(user)
+
+        assert test_client.get("/native/v1/me").status_code == 403
+
+
 class AccountCreationTest:
     identifier = "email@example.com"
 
@@ -7,6 +7,7 @@ import pytest
 import pcapi.core.bookings.factories as bookings_factories
 import pcapi.core.offers.factories as offers_factories
 import pcapi.core.users.factories as users_factories
+from pcapi.domain.booking_recap.bookings_recap_paginated import BookingsRecapCursor
 from pcapi.utils.date import format_into_timezoned_date
 from pcapi.utils.human_ids import humanize
 
@@ -28,6 +29,22 @@ class GetAllBookingsTest:
         TestClient(app.test_client()).with_auth(user.email).get("/bookings/pro")
         find_by_pro_user_id.assert_called_once_with(user_id=user.id, page=1)
 
+    @pytest.mark.usefixtures("db_session")
+    @patch("pcapi.core.bookings.repository.find_by_pro_user_id_with_cursor")
+    def test_call_repository_with_user_and_cursor(self, find_by_pro_user_id_with_cursor, app):
+        user = users_factories.UserFactory()
+        TestClient(app.test_client()).with_auth(user.email).get("/bookings/pro?cursor=2020-04-03T12:00:00_AE")
+        find_by_pro_user_id_with_cursor.assert_called_once_with(
+            user_id=user.id, cursor=BookingsRecapCursor(booking_date=datetime(2020, 4, 3, 12, 0, 0), booking_id=1)
+        )
+
+    @pytest.mark.usefixtures("db_session")
+    @patch("pcapi.core.bookings.repository.find_by_pro_user_id_with_cursor")
+    def test_call_repository_without_cursor_for_first_page(self, find_by_pro_user_id_with_cursor, app):
+        user = users_factories.UserFactory()
+        TestClient(app.test_client()).with_auth(user.email).get("/bookings/pro?cursor=")
+        find_by_pro_user_id_with_cursor.assert_called_once_with(user_id=user.id, cursor=None)
+
 
 @pytest.mark.usefixtures("db_session")
 class GetTest:
@@ -98,6 +115,46 @@ class GetTest:
             assert response.json["pages"] == 1
             assert response.json["total"] == 1
 
+        def when_using_cursor(self, app):
+            booking = bookings_factories.BookingFactory(token="ABCDEF")
+            pro_user = users_factories.UserFactory(email="pro@example.com")
+            offers_factories.UserOffererFactory(user=pro_user, offerer=booking.stock.offer.venue.managingOfferer)
+
+            client = TestClient(app.test_client()).with_auth(pro_user.email)
+            response = client.get("/bookings/pro?cursor=")
+
+            assert response.status_code == 200
+            assert [booking_recap["booking_token"] for booking_recap in response.json["bookings_recap"]] == [None]
+            assert response.json["next_cursor"] is None
+
+        def when_exporting_bookings_as_csv(self, app):
+            booking = bookings_factories.BookingFactory(token="ABCDEF", isUsed=True, user__email="ron@example.com")
+            pro_user = users_factories.UserFactory(email="pro@example.com")
+            offers_factories.UserOffererFactory(user=pro_user, offerer=booking.stock.offer.venue.managingOfferer)
+
+            client = TestClient(app.test_client()).with_auth(pro_user.email)
+            response = client.get("/bookings/pro/csv")
+
+            assert response.status_code == 200
+            assert response.headers["Content-type"] == "text/csv; charset=utf-8;"
+            lines = response.data.decode("utf-8-sig").splitlines()
+            assert len(lines) == 2
+            assert '"ron@example.com"' in lines[1]
+            assert '"ABCDEF"' in lines[1]
+
+        def when_exporting_bookings_as_json(self, app):
+            stock = offers_factories.ThingStockFactory()
+            bookings_factories.BookingFactory.create_batch(2, stock=stock, isUsed=True)
+            bookings_factories.BookingFactory(isUsed=True)
+            pro_user = users_factories.UserFactory(email="pro@example.com")
+            offers_factories.UserOffererFactory(user=pro_user, offerer=stock.offer.venue.managingOfferer)
+
+            client = TestClient(app.test_client()).with_auth(pro_user.email)
+            response = client.get("/bookings/pro/json")
+
+            assert response.status_code == 200
+            assert len(response.json) == 2
+
     class Returns400Test:
         def when_page_number_is_not_a_number(self, app):
             user = users_factories.UserFactory()
@@ -108,6 +165,15 @@ class GetTest:
             assert response.status_code == 400
             assert response.json["global"] == ["L'argument 'page' not-a-number n'est pas valide"]
 
+        def when_cursor_is_not_valid(self, app):
+            user = users_factories.UserFactory()
+
+            client = TestClient(app.test_client()).with_auth(user.email)
+            response = client.get("/bookings/pro?cursor=not-a-cursor")
+
+            assert response.status_code == 400
+            assert response.json["global"] == ["L'argument 'cursor' not-a-cursor n'est pas valide"]
+
     class Returns401Test:
         def when_user_is_admin(self, app):
             user = users_factories.UserFactory(isAdmin=True)
@@ -1,9 +1,16 @@
 from datetime import datetime
 from datetime import timedelta
+import json
 
+import pytest
 from pytest import fixture
 
+from pcapi.domain.booking_recap.bookings_recap_paginated import BookingsRecapCursor
 from pcapi.domain.booking_recap.bookings_recap_paginated import BookingsRecapPaginated
+from pcapi.routes.serialization.bookings_recap_serialize import deserialize_bookings_recap_cursor
+from pcapi.routes.serialization.bookings_recap_serialize import generate_bookings_recap_csv
+from pcapi.routes.serialization.bookings_recap_serialize import generate_bookings_recap_json
+from pcapi.routes.serialization.bookings_recap_serialize import serialize_bookings_recap_cursor
 from pcapi.routes.serialization.bookings_recap_serialize import serialize_bookings_recap_paginated
 from pcapi.utils.date import format_into_timezoned_date
 from pcapi.utils.human_ids import humanize
@@ -406,3 +413,60 @@ class SerializeBookingRecapHistoryTest:
             },
         ]
         assert results["bookings_recap"][0]["booking_status_history"] == expected_booking_recap_history
+
+
+class BookingsRecapCursorTest:
+    def test_should_deserialize_serialized_cursor(self):
+        cursor = BookingsRecapCursor(booking_date=datetime(2020, 1, 1, 10, 0, 0, 123456), booking_id=1234)
+
+        assert deserialize_bookings_recap_cursor(serialize_bookings_recap_cursor(cursor)) == cursor
+
+    @pytest.mark.parametrize("cursor", ["", "2020-01-01", "not-a-date_A9", "2020-01-01T10:00:00_!!"])
+    def test_should_not_deserialize_invalid_cursor(self, cursor):
+        with pytest.raises(ValueError):
+            deserialize_bookings_recap_cursor(cursor)
+
+
+class GenerateBookingsRecapExportTest:
+    def test_should_generate_json_list(self, app: fixture):
+        # Given
+        bookings_recap = [
+            create_domain_thing_booking_recap(booking_token="FOND"),
+            create_domain_event_booking_recap(booking_token="EVENT"),
+        ]
+
+        # When
+        bookings_recap_json = "".join(generate_bookings_recap_json(bookings_recap))
+
+        # Then
+        results = json.loads(bookings_recap_json)
+        assert [result["booking_token"] for result in results] == ["FOND", "EVENT"]
+        assert [result["stock"]["type"] for result in results] == ["thing", "event"]
+
+    def test_should_generate_empty_json_list(self, app: fixture):
+        assert "".join(generate_bookings_recap_json([])) == "[]"
+
+    def test_should_generate_csv_line_by_line(self):
+        # Given
+        booking_recap = create_domain_thing_booking_recap(
+            offer_name="Fondation",
+            offer_isbn="9787605639121",
+            beneficiary_firstname="Hari",
+            beneficiary_lastname="Seldon",
+            beneficiary_email="hari.seldon@example.com",
+            booking_date=datetime(2020, 1, 1, 10, 0, 0),
+            booking_token="FOND",
+            booking_is_used=True,
+            booking_amount=18,
+            venue_name="Librairie Kléber",
+        )
+
+        # When
+        lines = list(generate_bookings_recap_csv([booking_recap]))
+
+        # Then
+        assert lines[0].startswith('"Lieu";"Nom de l\'offre";')
+        assert lines[1] == (
+            '"Librairie Kléber";"Fondation";"";"9787605639121";"Seldon Hari";"hari.seldon@example.com";'
+            '"2020-01-01T10:00:00";"FOND";18;"validated"\r\n'
+        )
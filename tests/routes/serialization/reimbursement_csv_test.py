@@ -18,6 +18,8 @@ from pcapi.repository.reimbursement_queries import find_all_offerer_payments
 from pcapi.routes.serialization.reimbursement_csv_serialize import ReimbursementDetails
 from pcapi.routes.serialization.reimbursement_csv_serialize import find_all_offerer_reimbursement_details
 from pcapi.routes.serialization.reimbursement_csv_serialize import generate_reimbursement_details_csv
+from pcapi.routes.serialization.reimbursement_csv_serialize import generate_reimbursement_details_csv_lines
+from pcapi.routes.serialization.reimbursement_csv_serialize import iterate_offerer_reimbursement_details
 from pcapi.scripts.payment.batch_steps import generate_new_payments
 
 
@@ -48,6 +50,23 @@ class FindReimbursementDetailsTest:
         # Then
         assert len(reimbursement_details) == 2
 
+    @pytest.mark.usefixtures("db_session")
+    def test_iterate_offerer_reimbursement_details(self, app):
+        # Given
+        stock = offers_factories.StockFactory(price=10)
+        offers_factories.BankInformationFactory(venue=stock.offer.venue)
+        bookings_factories.BookingFactory.create_batch(3, stock=stock, isUsed=True)
+        generate_new_payments()
+        offerer_id = stock.offer.venue.managingOffererId
+
+        # When
+        reimbursement_details = iterate_offerer_reimbursement_details(offerer_id)
+
+        # Then
+        assert [details.as_csv_row() for details in reimbursement_details] == [
+            details.as_csv_row() for details in find_all_offerer_reimbursement_details(offerer_id)
+        ]
+
 
 @freeze_time("2019-07-10")
 class ReimbursementDetailsCSVTest:
@@ -90,6 +109,19 @@ class ReimbursementDetailsCSVTest:
             == f'"2019";"Juillet : remboursement 1ère quinzaine";"{venue.name}";"{venue.siret}";"1 boulevard Poissonnière";"{bank_informations.iban}";"{venue.name}";"Mon titre ; un peu ""spécial""";"Doux";"Jeanne";"0E2722";"";10.00;"Remboursement initié"'
         )
 
+    def test_generate_payment_details_csv_line_by_line(self):
+        # given
+        reimbursement_detail = ReimbursementDetails()
+        reimbursement_detail.as_csv_row = lambda: ["2019", "Juillet", 10]
+
+        # when
+        lines = list(generate_reimbursement_details_csv_lines([reimbursement_detail, reimbursement_detail]))
+
+        # then
+        assert len(lines) == 3
+        assert lines[0].startswith('"Année";"Virement";')
+        assert lines[1] == lines[2] == '"2019";"Juillet";10\r\n'
+
 
 class AsCsvRowTest:
     @pytest.mark.usefixtures("db_session")
@@ -1,9 +1,11 @@
 from datetime import datetime
+import threading
 from unittest import mock
 
 from freezegun import freeze_time
 import redis
 
+from pcapi.connectors.redis import add_offer_id
 from pcapi.core.testing import override_settings
 from pcapi.scripts.algolia_indexing.indexing import _process_venue_provider
 from pcapi.scripts.algolia_indexing.indexing import batch_deleting_expired_offers_in_algolia
@@ -18,6 +20,8 @@ from pcapi.scripts.algolia_indexing.indexing import legacy_batch_indexing_offers
 # FIXME (dbaty, 2021-04-28): the lack of Redis in tests makes these
 # tests painful to write and read.
 @override_settings(REDIS_OFFER_IDS_CHUNK_SIZE=3)
+@mock.patch("pcapi.scripts.algolia_indexing.indexing.pop_offer_ids_duplicates_count", lambda client: 0)
+@mock.patch("pcapi.scripts.algolia_indexing.indexing.move_legacy_offer_ids", lambda client: 0)
 @mock.patch("pcapi.scripts.algolia_indexing.indexing.process_eligible_offers")
 class BatchIndexingOffersInAlgoliaByOfferTest:
     def test_cron_behaviour(self, mocked_process_eligible_offers):
@@ -32,12 +36,12 @@ class BatchIndexingOffersInAlgoliaByOfferTest:
                     break
             return popped
 
-        def fake_len(self, queue_name):
+        def fake_count(client):
             return len(queue)
 
         redis_client = redis.Redis()
         with mock.patch("pcapi.scripts.algolia_indexing.indexing.pop_offer_ids", fake_pop):
-            with mock.patch("redis.Redis.llen", fake_len):
+            with mock.patch("pcapi.scripts.algolia_indexing.indexing.count_offer_ids", fake_count):
                 batch_indexing_offers_in_algolia_by_offer(redis_client)
 
         # First run pops and indexes 1, 2, 3. Second run pops and
@@ -69,12 +73,12 @@ class BatchIndexingOffersInAlgoliaByOfferTest:
                     break
             return popped
 
-        def fake_len(self, queue_name):
+        def fake_count(client):
             return len(queue)
 
         redis_client = redis.Redis()
         with mock.patch("pcapi.scripts.algolia_indexing.indexing.pop_offer_ids", fake_pop):
-            with mock.patch("redis.Redis.llen", fake_len):
+            with mock.patch("pcapi.scripts.algolia_indexing.indexing.count_offer_ids", fake_count):
                 batch_indexing_offers_in_algolia_by_offer(redis_client, stop_only_when_empty=True)
 
         # First run pops and indexes 1, 2, 3. Second run pops and
@@ -99,46 +103,126 @@ class BatchIndexingOffersInAlgoliaByOfferTest:
         ]
         assert queue == []
 
+    @override_settings(ALGOLIA_INDEXING_WORKERS_COUNT=2)
+    def test_concurrent_workers_behaviour(self, mocked_process_eligible_offers, app):
+        queue = list(range(1, 9))  # 8 items: 1..8
+        lock = threading.Lock()
+
+        def fake_pop(client):
+            popped = []
+            with lock:
+                for i in range(3):  # overriden REDIS_OFFER_IDS_CHUNK_SIZE
+                    try:
+                        popped.append(queue.pop(0))
+                    except IndexError:  # queue is empty
+                        break
+            return popped
+
+        def fake_count(client):
+            return len(queue)
+
+        redis_client = redis.Redis()
+        with mock.patch("pcapi.scripts.algolia_indexing.indexing.pop_offer_ids", fake_pop):
+            with mock.patch("pcapi.scripts.algolia_indexing.indexing.count_offer_ids", fake_count):
+                batch_indexing_offers_in_algolia_by_offer(redis_client, stop_only_when_empty=True)
+
+        # Chunks are popped by both workers, in an unpredictable
+        # order, but each offer is processed exactly once.
+        processed_offer_ids = [
+            offer_id for call in mocked_process_eligible_offers.call_args_list for offer_id in call.kwargs["offer_ids"]
+        ]
+        assert sorted(processed_offer_ids) == list(range(1, 9))
+        assert queue == []
+
+
+class FakeOfferIdsQueueClient:
+    """Enough of a Redis client to enqueue and pop offer ids."""
+
+    def __init__(self):
+        self.sorted_set = {}
+
+    def zadd(self, name, mapping, nx=False):  # pylint: disable=unused-argument
+        added = 0
+        for member, score in mapping.items():
+            if member not in self.sorted_set:
+                added += 1
+            elif nx:
+                continue
+            self.sorted_set[member] = score
+        return added
+
+    def zpopmin(self, name, count):  # pylint: disable=unused-argument
+        popped = sorted(self.sorted_set.items(), key=lambda item: item[1])[:count]
+        for member, _score in popped:
+            del self.sorted_set[member]
+        return popped
+
+    def incr(self, name):
+        pass
+
 
+@override_settings(REDIS_OFFER_IDS_CHUNK_SIZE=3)
+@mock.patch("pcapi.scripts.algolia_indexing.indexing.process_eligible_offers")
 class LegacyBatchIndexingOffersInAlgoliaByOfferTest:
-    @mock.patch("pcapi.scripts.algolia_indexing.indexing.process_eligible_offers")
-    @mock.patch("pcapi.scripts.algolia_indexing.indexing.delete_offer_ids")
-    @mock.patch("pcapi.scripts.algolia_indexing.indexing.get_offer_ids")
+    @mock.patch("pcapi.scripts.algolia_indexing.indexing.move_legacy_offer_ids", return_value=0)
     def test_should_index_offers_when_at_least_one_offer_id(
-        self, mock_get_offer_ids, mock_delete_offer_ids, mock_process_eligible_offers
+        self, mock_move_legacy_offer_ids, mock_process_eligible_offers
     ):
         # Given
-        client = mock.MagicMock()
-        mock_get_offer_ids.return_value = [1]
+        client = FakeOfferIdsQueueClient()
+        for offer_id in (1, 2, 3, 4):
+            add_offer_id(client, offer_id)
 
         # When
         legacy_batch_indexing_offers_in_algolia_by_offer(client=client)
 
         # Then
-        mock_get_offer_ids.assert_called_once()
-        mock_delete_offer_ids.assert_called_once()
+        mock_move_legacy_offer_ids.assert_called_once_with(client=client)
         assert mock_process_eligible_offers.call_args_list == [
-            mock.call(client=client, offer_ids=[1], from_provider_update=False)
+            mock.call(client=client, offer_ids=[1, 2, 3], from_provider_update=False)
         ]
+        assert list(client.sorted_set) == [4]
 
-    @mock.patch("pcapi.scripts.algolia_indexing.indexing.process_eligible_offers")
-    @mock.patch("pcapi.scripts.algolia_indexing.indexing.delete_offer_ids")
-    @mock.patch("pcapi.scripts.algolia_indexing.indexing.get_offer_ids")
+    @mock.patch("pcapi.scripts.algolia_indexing.indexing.move_legacy_offer_ids", return_value=0)
     def test_should_not_trigger_indexing_when_no_offer_id(
-        self, mock_get_offer_ids, mock_delete_offer_ids, mock_process_eligible_offers
+        self, mock_move_legacy_offer_ids, mock_process_eligible_offers
     ):
         # Given
-        client = mock.MagicMock()
-        mock_get_offer_ids.return_value = []
+        client = FakeOfferIdsQueueClient()
 
         # When
         legacy_batch_indexing_offers_in_algolia_by_offer(client=client)
 
         # Then
-        mock_get_offer_ids.assert_called_once()
-        mock_delete_offer_ids.assert_not_called()
         mock_process_eligible_offers.assert_not_called()
 
+    @mock.patch("pcapi.scripts.algolia_indexing.indexing.move_legacy_offer_ids", return_value=0)
+    def test_should_keep_offer_enqueued_again_while_being_indexed(
+        self, mock_move_legacy_offer_ids, mock_process_eligible_offers
+    ):
+        # Given
+        client = FakeOfferIdsQueueClient()
+        add_offer_id(client, 1)
+        add_offer_id(client, 2)
+
+        def process_eligible_offers(client, offer_ids, from_provider_update):  # pylint: disable=unused-argument
+            # The offer is updated while its previous update is indexed.
+            if mock_process_eligible_offers.call_count == 1:
+                add_offer_id(client, 1)
+
+        mock_process_eligible_offers.side_effect = process_eligible_offers
+
+        # When
+        legacy_batch_indexing_offers_in_algolia_by_offer(client=client)
+        legacy_batch_indexing_offers_in_algolia_by_offer(client=client)
+
+        # Then
+        assert mock_process_eligible_offers.call_args_list == [
+            mock.call(client=client, offer_ids=[1, 2], from_provider_update=False),
+            mock.call(client=client, offer_ids=[1], from_provider_update=False),
+        ]
+        assert client.sorted_set == {}
+
 
 class BatchIndexingOffersInAlgoliaByVenueProviderTest:
     @mock.patch("pcapi.settings.ALGOLIA_OFFERS_BY_VENUE_PROVIDER_CHUNK_SIZE", 3)
@@ -1,7 +1,19 @@
+from datetime import datetime
+from datetime import timedelta
+
 import pytest
 
+from pcapi.core.bookings.factories import BookingFactory
+from pcapi.core.testing import assert_num_queries
 from pcapi.core.users.factories import UserFactory
+from pcapi.models import User
+from pcapi.models import db
+from pcapi.models.offer_type import EventType
 import pcapi.notifications.push.testing as push_testing
+from pcapi.notifications.push.user_attributes_updates import UserUpdateData
+from pcapi.notifications.push.user_attributes_updates import get_user_attributes
+from pcapi.notifications.push.user_attributes_updates import get_user_booking_attributes
+from pcapi.scripts.batch_update_users_attributes import format_users
 from pcapi.scripts.batch_update_users_attributes import get_users_chunks
 from pcapi.scripts.batch_update_users_attributes import run
 
@@ -33,3 +45,34 @@ def test_run(app):
     run(4)
 
     assert len(push_testing.requests) == 2
+
+
+@pytest.mark.usefixtures("db_session")
+def test_format_users(app):
+    """
+    Test that users are formatted like the push notification jobs do, with a
+    constant number of queries.
+    """
+    user = UserFactory(deposit__version=1)
+    BookingFactory(user=user, amount=50, stock__offer__type=str(EventType.CINEMA))
+    BookingFactory(user=user, amount=20, stock__offer__type=str(EventType.CINEMA), isCancelled=True)
+    expired_deposit_user = UserFactory(deposit__expirationDate=datetime.now() - timedelta(days=1))
+    BookingFactory(user=expired_deposit_user)
+    user_without_booking = UserFactory()
+    pro = UserFactory(isBeneficiary=False)
+    users = [user, expired_deposit_user, user_without_booking, pro]
+    expected_users_data = [
+        UserUpdateData(
+            user_id=str(formatted_user.id),
+            attributes={**get_user_attributes(formatted_user), **get_user_booking_attributes(formatted_user)},
+        )
+        for formatted_user in users
+    ]
+
+    user_ids = [user.id for user in users]
+    db.session.expire_all()
+    users = User.query.filter(User.id.in_(user_ids)).order_by(User.id).all()
+    with assert_num_queries(2):
+        users_data = format_users(users)
+
+    assert users_data == expected_users_data
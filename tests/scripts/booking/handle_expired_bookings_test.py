@@ -8,6 +8,7 @@ from pcapi.core.bookings.factories import BookingFactory
 from pcapi.core.bookings.models import BookingCancellationReasons
 from pcapi.core.offers.factories import ProductFactory
 from pcapi.core.testing import assert_num_queries
+from pcapi.core.testing import override_settings
 from pcapi.core.users.factories import UserFactory
 from pcapi.models import offer_type
 from pcapi.repository import repository
@@ -118,11 +119,8 @@ class CancelExpiredBookingsTest:
         n_queries = (
             1  # select count
             + 1  # select initial booking ids
-            + 1  # select associated stocks
             + 1  # release savepoint/COMMIT
-            + 4 * 3  # update, release savepoint/COMMIT, select next ids
-            + 1  # recompute denormalized booking quantity in stock
-            + 1  # commit previous computation
+            + 4 * 4  # lock stocks, update bookings and stocks, release savepoint/COMMIT, select next ids
         )
 
         with assert_num_queries(n_queries):
@@ -131,7 +129,7 @@ class CancelExpiredBookingsTest:
 
 @pytest.mark.usefixtures("db_session")
 class NotifyUsersOfExpiredBookingsTest:
-    @mock.patch("pcapi.scripts.booking.handle_expired_bookings.send_expired_bookings_recap_email_to_beneficiary")
+    @mock.patch("pcapi.workers.user_emails_job.send_expired_bookings_recap_emails_to_beneficiaries")
     def should_notify_of_todays_expired_bookings(self, mocked_send_email_recap, app) -> None:
         now = datetime.utcnow()
         yesterday = now - timedelta(days=1)
@@ -163,15 +161,31 @@ class NotifyUsersOfExpiredBookingsTest:
 
         handle_expired_bookings.notify_users_of_expired_bookings()
 
-        assert mocked_send_email_recap.call_count == 2
-        assert mocked_send_email_recap.call_args_list[0][0] == (
-            expired_today_dvd_booking.user,
-            [expired_today_dvd_booking],
+        mocked_send_email_recap.assert_called_once_with(
+            [
+                (expired_today_dvd_booking.user, [expired_today_dvd_booking]),
+                (expired_today_cd_booking.user, [expired_today_cd_booking]),
+            ]
         )
-        assert mocked_send_email_recap.call_args_list[1][0] == (
-            expired_today_cd_booking.user,
-            [expired_today_cd_booking],
+
+    @mock.patch("pcapi.workers.user_emails_job.send_expired_bookings_recap_emails_to_beneficiaries")
+    @override_settings(BULK_EMAILS_BATCH_SIZE=1)
+    def should_notify_users_by_batches(self, mocked_send_email_recap, app) -> None:
+        user = UserFactory()
+        first_booking = BookingFactory(
+            user=user, isCancelled=True, cancellationReason=BookingCancellationReasons.EXPIRED
+        )
+        second_booking = BookingFactory(
+            user=user, isCancelled=True, cancellationReason=BookingCancellationReasons.EXPIRED
         )
+        other_user_booking = BookingFactory(isCancelled=True, cancellationReason=BookingCancellationReasons.EXPIRED)
+
+        handle_expired_bookings.notify_users_of_expired_bookings()
+
+        assert [call.args[0] for call in mocked_send_email_recap.call_args_list] == [
+            [(user, [first_booking, second_booking])],
+            [(other_user_booking.user, [other_user_booking])],
+        ]
 
 
 @pytest.mark.usefixtures("db_session")
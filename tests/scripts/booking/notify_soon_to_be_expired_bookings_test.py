@@ -13,9 +13,7 @@ from pcapi.scripts.booking.notify_soon_to_be_expired_bookings import notify_user
 
 @pytest.mark.usefixtures("db_session")
 class NotifyUsersOfSoonToBeExpiredBookingsTest:
-    @mock.patch(
-        "pcapi.scripts.booking.notify_soon_to_be_expired_bookings.send_soon_to_be_expired_bookings_recap_email_to_beneficiary"
-    )
+    @mock.patch("pcapi.workers.user_emails_job.send_soon_to_be_expired_bookings_recap_emails_to_beneficiaries")
     def should_call_email_service_for_bookings_which_will_expire_in_7_days(self, mocked_email_recap, app) -> None:
         # Given
         now = date.today()
@@ -40,4 +38,6 @@ class NotifyUsersOfSoonToBeExpiredBookingsTest:
         notify_users_of_soon_to_be_expired_bookings()
 
         # Then
-        mocked_email_recap.assert_called_once_with(expire_in_7_days_dvd_booking.user, [expire_in_7_days_dvd_booking])
+        mocked_email_recap.assert_called_once_with(
+            [(expire_in_7_days_dvd_booking.user, [expire_in_7_days_dvd_booking])]
+        )
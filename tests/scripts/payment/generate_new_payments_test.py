@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 import pytest
 
 import pcapi.core.users.factories as users_factories
@@ -10,6 +12,8 @@ from pcapi.model_creators.specific_creators import create_offer_with_thing_produ
 from pcapi.model_creators.specific_creators import create_stock_from_offer
 from pcapi.models import ThingType
 from pcapi.models.payment import Payment
+from pcapi.models.payment_status import PaymentStatus
+from pcapi.models.payment_status import TransactionStatus
 from pcapi.repository import repository
 from pcapi.scripts.payment.batch_steps import generate_new_payments
 
@@ -71,6 +75,41 @@ class GenerateNewPaymentsTest:
         assert len(pending) == 2
         assert len(not_processable) == 1
 
+    @pytest.mark.usefixtures("db_session")
+    @patch("pcapi.scripts.payment.batch_steps.PAYMENTS_BATCH_SIZE", 2)
+    def test_inserts_payments_and_their_status_by_batches(self, app):
+        # Given
+        offerer1 = create_offerer(siren="123456789")
+        offerer2 = create_offerer(siren="987654321")
+        repository.save(offerer1)
+        bank_information = create_bank_information(
+            bic="BDFEFR2LCCB", iban="FR7630006000011234567890189", offerer=offerer1
+        )
+        venue1 = create_venue(offerer1, siret="12345678912345")
+        venue2 = create_venue(offerer2, siret="98765432154321")
+        paying_stock1 = create_stock_from_offer(create_offer_with_thing_product(venue1), price=10)
+        paying_stock2 = create_stock_from_offer(create_offer_with_thing_product(venue2), price=20)
+        user = users_factories.UserFactory()
+        bookings = [create_booking(user=user, stock=paying_stock1, venue=venue1, is_used=True) for _ in range(3)]
+        bookings.append(create_booking(user=user, stock=paying_stock2, venue=venue2, is_used=True))
+        repository.save(*bookings, bank_information)
+
+        # When
+        pending, not_processable = generate_new_payments()
+
+        # Then
+        assert Payment.query.count() == 4
+        assert PaymentStatus.query.count() == 4
+        assert {payment.booking for payment in pending} == set(bookings[:3])
+        assert all(payment.iban == "FR7630006000011234567890189" for payment in pending)
+        assert all(payment.currentStatus.status == TransactionStatus.PENDING for payment in pending)
+        assert len(not_processable) == 1
+        assert not_processable[0].booking == bookings[3]
+        assert not_processable[0].amount == 20
+        assert not_processable[0].recipientSiren == "987654321"
+        assert not_processable[0].currentStatus.status == TransactionStatus.NOT_PROCESSABLE
+        assert not_processable[0].currentStatus.detail == "IBAN et BIC manquants sur l'offreur"
+
     @pytest.mark.usefixtures("db_session")
     def test_reimburses_offerer_if_he_has_more_than_20000_euros_in_bookings_on_several_venues(self, app):
         # Given
@@ -74,6 +74,30 @@ class UpdateBookingUsedTest:
         assert not booking.isUsed
         assert booking.dateUsed is None
 
+    @freeze_time("2019-10-13")
+    @pytest.mark.usefixtures("db_session")
+    def test_update_bookings_by_batches_and_return_their_ids(self):
+        # Given
+        past_stock = offers_factories.EventStockFactory(beginningDatetime=datetime(2019, 10, 9, 10, 20, 0))
+        future_stock = offers_factories.EventStockFactory(beginningDatetime=datetime(2019, 10, 20))
+        booking1 = bookings_factories.BookingFactory(stock=past_stock)
+        bookings_factories.BookingFactory(stock=future_stock)
+        bookings_factories.BookingFactory(stock=past_stock, isCancelled=True)
+        booking2 = bookings_factories.BookingFactory(stock=past_stock)
+
+        # When
+        updated_booking_ids = update_booking_used_after_stock_occurrence(batch_size=1)
+
+        # Then
+        assert updated_booking_ids == [booking1.id, booking2.id]
+        used_bookings = Booking.query.filter_by(isUsed=True).order_by(Booking.id).all()
+        assert used_bookings == [booking1, booking2]
+        assert {booking.dateUsed for booking in used_bookings} == {datetime(2019, 10, 13)}
+
+    @pytest.mark.usefixtures("db_session")
+    def test_return_no_ids_when_there_is_no_booking(self):
+        assert update_booking_used_after_stock_occurrence() == []
+
     @pytest.mark.usefixtures("db_session")
     @override_features(UPDATE_BOOKING_USED=False)
     def test_raise_if_feature_flag_is_deactivated(self):
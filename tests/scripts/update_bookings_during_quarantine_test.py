@@ -1,14 +1,11 @@
 from datetime import datetime
 from datetime import timedelta
 
-from _decimal import Decimal
 import pytest
 
-from pcapi.domain.payments import create_payment_for_booking
-from pcapi.domain.reimbursement import BookingReimbursement
-from pcapi.domain.reimbursement import ReimbursementRules
 from pcapi.model_creators.generic_creators import create_booking
 from pcapi.model_creators.generic_creators import create_offerer
+from pcapi.model_creators.generic_creators import create_payment
 from pcapi.model_creators.generic_creators import create_stock
 from pcapi.model_creators.generic_creators import create_user
 from pcapi.model_creators.generic_creators import create_venue
@@ -69,8 +66,7 @@ class UpdateBookingDuringQuarantineTest:
         stock = create_stock(beginning_datetime=datetime(2019, 3, 12, 00, 00, 00), offer=offer, price=0)
         date_used = datetime(2019, 3, 12, 00, 00, 00)
         booking = create_booking(user=user, stock=stock, token="QSDFG", is_used=True, date_used=date_used)
-        booking_reimbursement = BookingReimbursement(booking, ReimbursementRules.PHYSICAL_OFFERS, Decimal(10))
-        payment = create_payment_for_booking(booking_reimbursement)
+        payment = create_payment(booking, offerer, amount=10)
         repository.save(booking, payment)
 
         # When
@@ -0,0 +1,33 @@
+import codecs
+
+from pcapi.utils.csv_export import generate_csv_lines
+from pcapi.utils.csv_export import stream_csv_response
+
+
+class GenerateCsvLinesTest:
+    def test_yield_one_line_per_row(self):
+        # Given
+        rows = [["Nom", "Montant"], ["Offre; spéciale", 12.5]]
+
+        # When
+        lines = list(generate_csv_lines(rows))
+
+        # Then
+        assert lines == ['"Nom";"Montant"\r\n', '"Offre; spéciale";12.5\r\n']
+
+
+class StreamCsvResponseTest:
+    def test_stream_lines_with_a_single_bom(self, app):
+        # Given
+        lines = iter(['"Nom"\r\n', '"Offre"\r\n'])
+
+        # When
+        with app.test_request_context():
+            response = stream_csv_response(lines, "export.csv")
+            content = response.get_data()
+
+        # Then
+        assert content == codecs.BOM_UTF8 + '"Nom"\r\n"Offre"\r\n'.encode("utf-8")
+        assert content.count(codecs.BOM_UTF8) == 1
+        assert response.headers["Content-type"] == "text/csv; charset=utf-8;"
+        assert response.headers["Content-Disposition"] == "attachment; filename=export.csv"
@@ -1,8 +1,12 @@
 from unittest.mock import Mock
+from unittest.mock import call
 
 import pytest
 from requests import RequestException
+import requests_mock
 
+from pcapi.core.testing import override_settings
+from pcapi.utils import requests
 from pcapi.utils.requests import _wrapper
 
 
@@ -34,3 +38,45 @@ class RequestWrapperTest:
         # when
         with pytest.raises(RequestException):
             _wrapper(mocked_request_function, "GET", "https://example.net")
+
+    @override_settings(HTTP_TIMEOUTS_BY_HOST={"example.net": 3})
+    def test_use_timeout_of_host(self):
+        # given
+        mocked_request_function = Mock()
+
+        # when
+        _wrapper(mocked_request_function, "GET", "https://example.net/path")
+        _wrapper(mocked_request_function, "GET", "https://example.com/path")
+
+        # then
+        assert mocked_request_function.call_args_list == [
+            call(method="GET", url="https://example.net/path", timeout=3),
+            call(method="GET", url="https://example.com/path", timeout=10),
+        ]
+
+
+@pytest.fixture(name="pooled_sessions")
+def pooled_sessions_fixture():
+    requests._reset_pooled_sessions()
+    yield requests._pooled_sessions
+    requests._reset_pooled_sessions()
+
+
+class PooledSessionsTest:
+    def test_reuse_session_of_host(self, pooled_sessions):
+        with requests_mock.Mocker() as mock:
+            mock.get("https://example.net/one", json={})
+            mock.post("https://example.net/two", json={})
+            mock.get("https://example.com/three", json={})
+
+            requests.get("https://example.net/one")
+            requests.post("https://example.net/two")
+            requests.get("https://example.com/three")
+
+        assert set(pooled_sessions) == {"https://example.net", "https://example.com"}
+
+    @override_settings(HTTP_POOL_MAXSIZE=3)
+    def test_get_pool_stats(self, pooled_sessions):  # pylint: disable=unused-argument
+        session = requests._get_pooled_session("https://example.net/path")
+
+        assert requests._get_pool_stats(session, "https://example.net/path") == {"poolSize": 3, "poolInUse": 0}
@@ -0,0 +1,101 @@
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+import requests_mock
+
+from pcapi.core.bookings.factories import BookingFactory
+from pcapi.core.testing import override_features
+from pcapi.core.testing import override_settings
+from pcapi.core.users.factories import UserFactory
+import pcapi.notifications.push.testing as push_testing
+from pcapi.workers.push_notification_job import schedule_user_attributes_update
+from pcapi.workers.push_notification_job import update_debounced_users_attributes
+
+
+@pytest.mark.usefixtures("db_session")
+class ScheduleUserAttributesUpdateTest:
+    @override_features(DEBOUNCE_PUSH_USER_ATTRIBUTES_UPDATES=False)
+    def test_update_user_attributes_right_away(self, app):
+        # Given
+        user = UserFactory()
+
+        # When
+        schedule_user_attributes_update(user.id)
+
+        # Then
+        assert len(push_testing.requests) == 1
+        assert push_testing.requests[0]["user_id"] == user.id
+
+    @override_features(DEBOUNCE_PUSH_USER_ATTRIBUTES_UPDATES=True)
+    @patch("pcapi.workers.push_notification_job.redis.add_push_user_ids")
+    def test_debounce_user_attributes_update(self, mocked_add_push_user_ids, app):
+        # Given
+        user = UserFactory()
+
+        # When
+        schedule_user_attributes_update(user.id)
+
+        # Then
+        assert push_testing.requests == []
+        mocked_add_push_user_ids.assert_called_once_with(client=app.redis_client, user_ids=[user.id])
+
+
+@pytest.mark.usefixtures("db_session")
+class UpdateDebouncedUsersAttributesTest:
+    @override_settings(PUSH_USER_ATTRIBUTES_BATCH_SIZE=2)
+    @patch("pcapi.workers.push_notification_job.redis.pop_push_user_ids")
+    def test_update_users_attributes_by_batches(self, mocked_pop_push_user_ids, app):
+        # Given
+        users = UserFactory.create_batch(3)
+        BookingFactory(user=users[0])
+        mocked_pop_push_user_ids.side_effect = [[users[0].id, users[1].id], [users[2].id], []]
+
+        # When
+        update_debounced_users_attributes(MagicMock())
+
+        # Then
+        assert [[user_data.user_id for user_data in batch] for batch in push_testing.requests] == [
+            [str(users[0].id), str(users[1].id)],
+            [str(users[2].id)],
+        ]
+        assert "date(u.last_booking_date)" in push_testing.requests[0][0].attributes
+        assert mocked_pop_push_user_ids.call_args[0][2] == 2
+
+    @patch("pcapi.workers.push_notification_job.redis.add_push_user_ids")
+    @patch("pcapi.workers.push_notification_job.update_users_attributes", side_effect=Exception("Batch is down"))
+    @patch("pcapi.workers.push_notification_job.redis.pop_push_user_ids")
+    def test_enqueue_users_again_on_error(
+        self, mocked_pop_push_user_ids, mocked_update_users_attributes, mocked_add_push_user_ids, app
+    ):
+        # Given
+        user = UserFactory()
+        mocked_pop_push_user_ids.side_effect = [[user.id], []]
+        client = MagicMock()
+
+        # When
+        update_debounced_users_attributes(client)
+
+        # Then
+        mocked_update_users_attributes.assert_called_once()
+        mocked_add_push_user_ids.assert_called_once_with(client, [user.id])
+
+    @override_settings(PUSH_NOTIFICATION_BACKEND="pcapi.notifications.push.backends.batch.BatchBackend")
+    @patch("pcapi.workers.push_notification_job.redis.add_push_user_ids")
+    @patch("pcapi.workers.push_notification_job.redis.pop_push_user_ids")
+    def test_enqueue_users_again_when_batch_responds_with_an_error(
+        self, mocked_pop_push_user_ids, mocked_add_push_user_ids, app
+    ):
+        # Given
+        user = UserFactory()
+        mocked_pop_push_user_ids.side_effect = [[user.id], []]
+        client = MagicMock()
+
+        # When
+        with requests_mock.Mocker() as mock:
+            mock.post("https://api.example.com/1.0/fake_android_api_key/data/users/", status_code=500)
+            mock.post("https://api.example.com/1.0/fake_ios_api_key/data/users/")
+            update_debounced_users_attributes(client)
+
+        # Then
+        mocked_add_push_user_ids.assert_called_once_with(client, [user.id])